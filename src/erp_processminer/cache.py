@@ -0,0 +1,214 @@
+"""
+Provides a content-addressed cache for analysis results.
+
+Dashboards and repeated CLI runs often recompute the same DFG, Petri net or
+conformance result for a log that has not changed. A :class:`ResultCache`
+stores results under a key derived from the log's content (its
+fingerprint), the algorithm name, its parameters and the library version,
+so a changed log, a different parameter or an upgrade never returns a stale
+result. Results are kept in an in-process memo and, optionally, in an
+on-disk store whose total size is bounded by evicting the least recently
+used entries.
+
+Analyses opt in through their ``cache`` parameter::
+
+    cache = ResultCache('.pm_cache')
+    dfg, starts, ends = discover_dfg(log, cache=cache)
+
+Where a log is maintained incrementally, its :class:`LogFingerprint` can be
+passed instead of the log when calling :meth:`ResultCache.get_or_compute`
+directly, which avoids rehashing unchanged cases.
+
+Cached results are shared between callers and must be treated as read-only.
+"""
+
+import hashlib
+import os
+import pickle
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Callable
+
+from erp_processminer import __version__
+from erp_processminer.eventlog.structures import EventLog
+from erp_processminer.eventlog.columnar import ColumnarLog
+from erp_processminer.eventlog.compressed import VariantLog
+from erp_processminer.eventlog.fingerprint import LogFingerprint
+from erp_processminer.models.petri_net import PetriNet
+
+Fingerprinted = EventLog | ColumnarLog | VariantLog | LogFingerprint
+
+def log_fingerprint(log: Fingerprinted) -> str:
+    """
+    Computes the digest of a log's cases, activities and timestamps (see
+    :class:`LogFingerprint`). Event attributes do not enter the digest.
+
+    The digest of an EventLog is memoized on the log and recomputed when
+    its traces list is replaced or the number of traces or events changes;
+    after editing traces or events in place, call
+    :meth:`EventLog.invalidate_index`.
+
+    :param log: The log, or an existing fingerprint of it.
+    :return: A hexadecimal digest.
+    """
+    if isinstance(log, LogFingerprint):
+        return log.hexdigest()
+    if not isinstance(log, EventLog):
+        return LogFingerprint.from_log(log).hexdigest()
+    key = (id(log.traces), len(log.traces), sum(map(len, log.traces)))
+    if log._fingerprint is None or log._fingerprint_key != key:
+        log._fingerprint = LogFingerprint.from_log(log).hexdigest()
+        log._fingerprint_key = key
+    return log._fingerprint
+
+def _token(value: Any) -> str:
+    """Returns a stable textual form of a parameter value."""
+    if isinstance(value, PetriNet):
+        return repr((sorted(map(repr, value.places)), sorted(map(repr, value.transitions)),
+                     sorted(map(repr, value.arcs))))
+    if isinstance(value, dict):
+        return repr(sorted((str(k), _token(v)) for k, v in value.items()))
+    return repr(value)
+
+class ResultCache:
+    """
+    A two-level result cache: an in-process LRU memo in front of an optional
+    on-disk store of pickled results.
+
+    :ivar directory: The on-disk store, or None for a memory-only cache.
+    :ivar max_bytes: The size bound of the on-disk store.
+    :ivar memo_size: The number of results kept in the in-process memo.
+    :ivar hits: The number of lookups answered from the cache.
+    :ivar misses: The number of lookups that had to compute the result.
+    """
+
+    def __init__(self, directory: str | Path | None = None,
+                 max_bytes: int = 256 * 1024 * 1024, memo_size: int = 64):
+        self.directory = None if directory is None else Path(directory)
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.memo_size = memo_size
+        self._memo: OrderedDict[str, Any] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(log: Fingerprinted, algorithm: str,
+            params: Dict[str, Any] | None = None) -> str:
+        """
+        Computes the cache key of a result.
+
+        :param log: The analysed log, or its fingerprint.
+        :param algorithm: The name of the algorithm.
+        :param params: The parameters of the algorithm.
+        :return: A hexadecimal key.
+        """
+        digest = hashlib.blake2b(digest_size=20)
+        for part in (log_fingerprint(log), algorithm, _token(params or {}), __version__):
+            digest.update(part.encode())
+            digest.update(b'\x00')
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f'{key}.pkl'
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Looks up a result, first in the memo and then on disk.
+
+        :param key: The cache key.
+        :param default: The value returned on a miss.
+        :return: The cached result, or `default`.
+        """
+        if key in self._memo:
+            self._memo.move_to_end(key)
+            return self._memo[key]
+        if self.directory is not None:
+            path = self._path(key)
+            try:
+                with open(path, 'rb') as f:
+                    value = pickle.load(f)
+            except (OSError, pickle.UnpicklingError, EOFError):
+                return default
+            os.utime(path)  # Marks the entry as recently used
+            self._remember(key, value)
+            return value
+        return default
+
+    def put(self, key: str, value: Any):
+        """
+        Stores a result in the memo and on disk, evicting the least recently
+        used disk entries if the store grows beyond `max_bytes`.
+
+        :param key: The cache key.
+        :param value: The result (must be picklable for the disk store).
+        """
+        self._remember(key, value)
+        if self.directory is None:
+            return
+        path = self._path(key)
+        temporary = path.with_suffix('.tmp')
+        with open(temporary, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, path)
+        self._evict()
+
+    def _remember(self, key: str, value: Any):
+        self._memo[key] = value
+        self._memo.move_to_end(key)
+        while len(self._memo) > self.memo_size:
+            self._memo.popitem(last=False)
+
+    def _evict(self):
+        entries = []
+        for path in self.directory.glob('*.pkl'):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def get_or_compute(self, log: Fingerprinted, algorithm: str,
+                       params: Dict[str, Any], compute: Callable[[], Any]) -> Any:
+        """
+        Returns the cached result of an analysis, computing and storing it on
+        a miss.
+
+        :param log: The analysed log, or its fingerprint.
+        :param algorithm: The name of the algorithm.
+        :param params: The parameters of the algorithm.
+        :param compute: Computes the result without the cache.
+        :return: The result.
+        """
+        key = self.key(log, algorithm, params)
+        missing = object()
+        value = self.get(key, missing)
+        if value is not missing:
+            self.hits += 1
+            return value
+        self.misses += 1
+        value = compute()
+        self.put(key, value)
+        return value
+
+    def clear(self):
+        """Removes all entries from the memo and the disk store."""
+        self._memo.clear()
+        if self.directory is not None:
+            for path in self.directory.glob('*.pkl'):
+                path.unlink(missing_ok=True)
+
+    def __len__(self) -> int:
+        if self.directory is None:
+            return len(self._memo)
+        return sum(1 for _ in self.directory.glob('*.pkl'))
+
+    def __repr__(self) -> str:
+        return f"ResultCache(directory={self.directory}, hits={self.hits}, misses={self.misses})"
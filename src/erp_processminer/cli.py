@@ -4,9 +4,15 @@ Defines the command-line interface for the erp-processminer package.
 
 import argparse
 import json
+from pathlib import Path
+import pandas as pd
 from erp_processminer.io_erp.loaders import load_multiple_erp_data
 from erp_processminer.io_erp.mappings import apply_mapping
-from erp_processminer.eventlog.serialization import export_log_to_csv
+from erp_processminer.io_erp.deduplication import EventDeduplicator
+from erp_processminer.io_erp.incremental import Watermarks, append_events
+from erp_processminer.eventlog.serialization import (
+    export_log_to_csv, import_log_from_csv, log_to_dataframe
+)
 from erp_processminer.discovery.directly_follows import discover_dfg
 from erp_processminer.visualization.graphs import visualize_dfg
 
@@ -30,6 +36,23 @@ def main():
     parser_etl.add_argument(
         "-o", "--output", default="log.csv", help="Path to the output event log CSV file."
     )
+    parser_etl.add_argument(
+        "--dedup-keys", nargs='+', default=None,
+        help="Drop duplicate events identified by these columns "
+             "(e.g. case_id activity timestamp DOC_NUMBER)."
+    )
+    parser_etl.add_argument(
+        "--fingerprints", default=None,
+        help="Path to a .npy fingerprint file shared by incremental runs "
+             "(requires --dedup-keys and --watermarks)."
+    )
+    parser_etl.add_argument(
+        "--watermarks", default=None,
+        help="Path to a JSON file of per-table watermarks. Enables incremental mode: only "
+             "rows above the watermarks are mapped and appended to the existing output, "
+             "which is a CSV file or, for any other path, a binary columnar log directory "
+             "or partitioned log dataset."
+    )
 
     # --- discover command ---
     parser_discover = subparsers.add_parser(
@@ -47,6 +70,10 @@ def main():
     )
 
     args = parser.parse_args()
+    if args.command == "erp-to-log" and args.fingerprints and not args.watermarks:
+        # A full export replaces the output, while saved fingerprints would
+        # keep suppressing the events it no longer contains
+        parser.error("--fingerprints requires --watermarks, i.e. a run that appends to the output.")
 
     if args.command == "erp-to-log":
         run_erp_to_log(args)
@@ -62,16 +89,58 @@ def run_erp_to_log(args):
     print(f"Loading data from {len(args.in_files)} files...")
     dataframes = load_multiple_erp_data(args.in_files)
     
+    deduplicator = None
+    if args.dedup_keys:
+        if args.fingerprints:
+            deduplicator = EventDeduplicator.load(args.fingerprints, args.dedup_keys)
+        else:
+            deduplicator = EventDeduplicator(args.dedup_keys)
+
+    watermarks = Watermarks.load(args.watermarks) if args.watermarks else None
+
     print("Applying mapping to create event log...")
-    event_log = apply_mapping(dataframes, config)
-    
-    print(f"Exporting event log to {args.output}...")
-    export_log_to_csv(event_log, args.output)
+    event_log = apply_mapping(dataframes, config, deduplicator=deduplicator, watermarks=watermarks)
+
+    if deduplicator is not None:
+        print(f"Dropped {deduplicator.dropped} duplicate events.")
+
+    if watermarks is None:
+        print(f"Exporting event log to {args.output}...")
+        export_log_to_csv(event_log, args.output)
+    else:
+        print(f"Appending {sum(len(t) for t in event_log)} new events to {args.output}...")
+        if args.output.endswith('.csv'):
+            append_log_to_csv(event_log, args.output)
+        else:
+            append_events(args.output, event_log)
+        # State is saved only once the events are written
+        watermarks.save(args.watermarks)
+        if deduplicator is not None and args.fingerprints:
+            deduplicator.save(args.fingerprints)
     print("Done.")
 
+def append_log_to_csv(event_log, file_path):
+    """
+    Appends events to an event log CSV file, in place. The file must already
+    have all columns of the new events, since adding a column would mean
+    rewriting the whole file.
+    """
+    path = Path(file_path)
+    if not path.exists():
+        export_log_to_csv(event_log, path)
+        return
+    header = pd.read_csv(path, nrows=0).columns
+    df = log_to_dataframe(event_log)
+    new_cols = [col for col in df.columns if col not in set(header)]
+    if new_cols:
+        raise ValueError(
+            f"Cannot append to '{path}': the new events have columns {new_cols} that the "
+            f"file lacks. Re-export the log in full, or use a binary log directory as output."
+        )
+    df.reindex(columns=header).to_csv(path, mode='a', header=False, index=False)
+
 def run_discover(args):
     """Executes the discover command."""
-    from erp_processminer.eventlog.serialization import import_log_from_csv
     from erp_processminer.discovery.heuristics_miner import discover_petri_net_with_heuristics
     from erp_processminer.visualization.graphs import visualize_petri_net
 
@@ -0,0 +1,216 @@
+"""
+Declarative (Declare-style) constraint checking.
+
+Constraints such as "every goods receipt is eventually followed by an invoice"
+or "no payment without a prior approval" are evaluated on the columnar log.
+Per-activity statistics (occurrence counts and first/last positions per case)
+are computed once and shared by all constraints that mention the activity, so
+every constraint costs a handful of vectorized operations over the cases.
+"""
+
+from dataclasses import dataclass
+from typing import List, Dict, Tuple
+import numpy as np
+
+from erp_processminer.eventlog.structures import EventLog
+from erp_processminer.eventlog.columnar import ColumnarLog
+
+UNARY_TEMPLATES = {'existence', 'absence', 'exactly', 'init', 'end'}
+BINARY_TEMPLATES = {
+    'responded_existence', 'co_existence', 'not_co_existence',
+    'response', 'precedence', 'succession', 'not_succession',
+    'alternate_response', 'alternate_precedence',
+    'chain_response', 'chain_precedence', 'chain_succession',
+    'not_chain_succession',
+}
+
+@dataclass(frozen=True)
+class DeclareConstraint:
+    """
+    A Declare constraint instance.
+
+    Unary templates take one activity and use `n` as their cardinality:
+    ``existence`` (at least n), ``absence`` (fewer than n, so n=1 forbids
+    the activity), ``exactly`` (exactly n), ``init`` and ``end``. Binary
+    templates take two activities (a, b), e.g. ``response`` (every a is
+    eventually followed by b) or ``precedence`` (b only after an a).
+    """
+    template: str
+    activities: Tuple[str, ...]
+    n: int = 1
+
+    def __post_init__(self):
+        if self.template in UNARY_TEMPLATES:
+            expected = 1
+        elif self.template in BINARY_TEMPLATES:
+            expected = 2
+        else:
+            raise ValueError(f"Unknown Declare template '{self.template}'.")
+        if len(self.activities) != expected:
+            raise ValueError(
+                f"Template '{self.template}' expects {expected} activities, "
+                f"got {len(self.activities)}."
+            )
+
+    def __str__(self) -> str:
+        args = ", ".join(self.activities)
+        if self.template in ('existence', 'absence', 'exactly'):
+            args += f", {self.n}"
+        return f"{self.template}({args})"
+
+class _ActivityStats:
+    """Per-case occurrence counts and first/last positions of one activity."""
+
+    def __init__(self, events: np.ndarray, case_index: np.ndarray,
+                 positions: np.ndarray, n_cases: int):
+        self.events = events
+        cases = case_index[events]
+        self.count = np.bincount(cases, minlength=n_cases)
+        self.first = np.full(n_cases, np.iinfo(np.int64).max, dtype=np.int64)
+        self.last = np.full(n_cases, -1, dtype=np.int64)
+        if events.size:
+            # `events` is ascending, so each case forms a contiguous run
+            starts = np.flatnonzero(np.r_[True, cases[1:] != cases[:-1]])
+            ends = np.r_[starts[1:] - 1, events.size - 1]
+            self.first[cases[starts]] = positions[events[starts]]
+            self.last[cases[ends]] = positions[events[ends]]
+
+class _DeclareContext:
+    """Shared per-log arrays and lazily computed per-activity statistics."""
+
+    def __init__(self, log: ColumnarLog):
+        self.log = log
+        self.n_cases = log.n_cases
+        self.case_index = log.case_index()
+        self.positions = np.arange(log.n_events) - log.case_offsets[self.case_index]
+        self.lengths = log.trace_lengths()
+
+        codes = log.activities
+        self.order = np.argsort(codes, kind='stable')
+        self.bounds = np.searchsorted(codes[self.order], np.arange(len(log.activity_names) + 1))
+
+        # Activity code of the next/previous event in the same case, or -1
+        self.next_code = np.full(log.n_events, -1, dtype=np.int64)
+        self.prev_code = np.full(log.n_events, -1, dtype=np.int64)
+        if log.n_events > 1:
+            same_case = self.case_index[1:] == self.case_index[:-1]
+            self.next_code[:-1] = np.where(same_case, codes[1:], -1)
+            self.prev_code[1:] = np.where(same_case, codes[:-1], -1)
+
+        self._codes = {name: i for i, name in enumerate(log.activity_names)}
+        self._stats: Dict[str, _ActivityStats] = {}
+
+    def code(self, activity: str) -> int:
+        return self._codes.get(activity, -2)
+
+    def stats(self, activity: str) -> _ActivityStats:
+        stats = self._stats.get(activity)
+        if stats is None:
+            code = self._codes.get(activity)
+            if code is None:
+                events = np.empty(0, dtype=np.int64)
+            else:
+                events = self.order[self.bounds[code]:self.bounds[code + 1]]
+            stats = _ActivityStats(events, self.case_index, self.positions, self.n_cases)
+            self._stats[activity] = stats
+        return stats
+
+    def cases_of(self, events: np.ndarray) -> np.ndarray:
+        mask = np.zeros(self.n_cases, dtype=bool)
+        mask[self.case_index[events]] = True
+        return mask
+
+    def alternate(self, a: str, b: str, reverse: bool) -> np.ndarray:
+        """
+        Violations of alternate response (or precedence if `reverse`): an a
+        whose next (previous) event among the a's and b's of its case is not
+        a b.
+        """
+        sa, sb = self.stats(a), self.stats(b)
+        events = np.sort(np.concatenate([sa.events, sb.events]))
+        if reverse:
+            events = events[::-1]
+        is_a = self.log.activities[events] == self.code(a)
+        cases = self.case_index[events]
+        follower_is_b = np.zeros(events.size, dtype=bool)
+        if events.size > 1:
+            follower_is_b[:-1] = ~is_a[1:] & (cases[1:] == cases[:-1])
+        return self.cases_of(events[is_a & ~follower_is_b])
+
+def _violations(ctx: _DeclareContext, constraint: DeclareConstraint) -> np.ndarray:
+    """Returns a boolean mask of the cases violating a constraint."""
+    template = constraint.template
+    if template in UNARY_TEMPLATES:
+        (a,) = constraint.activities
+        sa = ctx.stats(a)
+        if template == 'existence':
+            return sa.count < constraint.n
+        if template == 'absence':
+            return sa.count >= constraint.n
+        if template == 'exactly':
+            return sa.count != constraint.n
+        if template == 'init':
+            return sa.first != 0
+        # end
+        return (sa.last != ctx.lengths - 1) | (ctx.lengths == 0)
+
+    a, b = constraint.activities
+    sa, sb = ctx.stats(a), ctx.stats(b)
+    if template == 'responded_existence':
+        return (sa.count > 0) & (sb.count == 0)
+    if template == 'co_existence':
+        return (sa.count > 0) != (sb.count > 0)
+    if template == 'not_co_existence':
+        return (sa.count > 0) & (sb.count > 0)
+    if template == 'response':
+        return (sa.count > 0) & (sb.last < sa.last)
+    if template == 'precedence':
+        return (sb.count > 0) & (sa.first > sb.first)
+    if template == 'succession':
+        return ((sa.count > 0) & (sb.last < sa.last)) | ((sb.count > 0) & (sa.first > sb.first))
+    if template == 'not_succession':
+        return sa.first < sb.last
+    if template == 'alternate_response':
+        return ctx.alternate(a, b, reverse=False)
+    if template == 'alternate_precedence':
+        return ctx.alternate(b, a, reverse=True)
+
+    code_a, code_b = ctx.code(a), ctx.code(b)
+    chain_response = ctx.cases_of(sa.events[ctx.next_code[sa.events] != code_b])
+    chain_precedence = ctx.cases_of(sb.events[ctx.prev_code[sb.events] != code_a])
+    if template == 'chain_response':
+        return chain_response
+    if template == 'chain_precedence':
+        return chain_precedence
+    if template == 'chain_succession':
+        return chain_response | chain_precedence
+    # not_chain_succession
+    return ctx.cases_of(sa.events[ctx.next_code[sa.events] == code_b])
+
+def check_declare_constraints(
+    log: EventLog | ColumnarLog,
+    constraints: List[DeclareConstraint],
+) -> Dict[DeclareConstraint, Dict]:
+    """
+    Checks a set of Declare constraints against an event log.
+
+    All constraints are evaluated on a single columnar encoding of the log.
+    Statistics for an activity are computed the first time a constraint
+    mentions it and reused by every other constraint.
+
+    :param log: The event log, in object or columnar form.
+    :param constraints: The constraints to check.
+    :return: A dictionary mapping each constraint to its number of
+             violating cases ('violations') and their IDs ('case_ids').
+    """
+    columnar = log if isinstance(log, ColumnarLog) else ColumnarLog.from_event_log(log)
+    ctx = _DeclareContext(columnar)
+
+    results = {}
+    for constraint in constraints:
+        mask = _violations(ctx, constraint)
+        results[constraint] = {
+            'violations': int(mask.sum()),
+            'case_ids': columnar.case_ids[mask].tolist(),
+        }
+    return results
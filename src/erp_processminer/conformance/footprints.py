@@ -0,0 +1,214 @@
+"""
+Footprint and behavioral-profile conformance checking.
+
+A footprint classifies every ordered pair of activities as causality (->),
+reverse causality (<-), parallelism (||) or choice (#) based on the
+directly-follows relation. A behavioral profile does the same on the
+transitive closure of that relation (strict order, interleaving,
+exclusiveness). Comparing the matrices of a log and a model is far cheaper
+than replay or alignments and is meant as a quick triage step.
+"""
+
+from dataclasses import dataclass
+from typing import List, Dict, Tuple, Iterable
+import numpy as np
+
+from erp_processminer.eventlog.structures import EventLog
+from erp_processminer.models.df_graph import DFG
+from erp_processminer.models.petri_net import PetriNet, CompiledPetriNet
+
+CHOICE = 0
+CAUSALITY = 1
+REVERSE_CAUSALITY = 2
+PARALLEL = 3
+
+RELATION_SYMBOLS = {CHOICE: '#', CAUSALITY: '->', REVERSE_CAUSALITY: '<-', PARALLEL: '||'}
+
+@dataclass
+class Footprint:
+    """
+    A footprint matrix over a fixed activity order. ``relations[i, j]`` holds
+    one of CHOICE, CAUSALITY, REVERSE_CAUSALITY or PARALLEL.
+    """
+    activities: List[str]
+    relations: np.ndarray
+
+    def relation(self, source: str, target: str) -> str:
+        """Returns the relation symbol between two activities."""
+        index = {a: i for i, a in enumerate(self.activities)}
+        return RELATION_SYMBOLS[int(self.relations[index[source], index[target]])]
+
+    def reindex(self, activities: List[str]) -> "Footprint":
+        """
+        Returns the footprint over another activity order. Activities unknown
+        to this footprint are in a choice relation with everything.
+        """
+        n = len(activities)
+        relations = np.full((n, n), CHOICE, dtype=np.int8)
+        own = {a: i for i, a in enumerate(self.activities)}
+        positions = np.array([i for i, a in enumerate(activities) if a in own], dtype=np.intp)
+        source = np.array([own[activities[i]] for i in positions], dtype=np.intp)
+        if positions.size:
+            relations[np.ix_(positions, positions)] = self.relations[np.ix_(source, source)]
+        return Footprint(list(activities), relations)
+
+def _relations_from_adjacency(adjacency: np.ndarray) -> np.ndarray:
+    """Classifies all pairs of a boolean follows-relation matrix at once."""
+    relations = np.full(adjacency.shape, CHOICE, dtype=np.int8)
+    transposed = adjacency.T
+    relations[adjacency & ~transposed] = CAUSALITY
+    relations[~adjacency & transposed] = REVERSE_CAUSALITY
+    relations[adjacency & transposed] = PARALLEL
+    return relations
+
+def _transitive_closure(adjacency: np.ndarray) -> np.ndarray:
+    """Computes the transitive closure of a boolean matrix (Warshall)."""
+    closure = adjacency.copy()
+    for k in range(closure.shape[0]):
+        closure |= np.outer(closure[:, k], closure[k, :])
+    return closure
+
+def _build_footprint(
+    activities: List[str], edges: Iterable[Tuple[str, str]], mode: str
+) -> Footprint:
+    if mode not in ('footprint', 'profile'):
+        raise ValueError(f"Unknown mode '{mode}'. Use 'footprint' or 'profile'.")
+
+    index = {a: i for i, a in enumerate(activities)}
+    adjacency = np.zeros((len(activities), len(activities)), dtype=bool)
+    pairs = np.array([(index[u], index[v]) for u, v in edges], dtype=np.intp).reshape(-1, 2)
+    adjacency[pairs[:, 0], pairs[:, 1]] = True
+
+    if mode == 'profile':
+        adjacency = _transitive_closure(adjacency)
+    return Footprint(list(activities), _relations_from_adjacency(adjacency))
+
+def footprint_from_dfg(dfg: DFG, mode: str = 'footprint') -> Footprint:
+    """
+    Computes the footprint of a Directly-Follows Graph.
+
+    :param dfg: The DFG, e.g. discovered from a log.
+    :param mode: 'footprint' for directly-follows relations or 'profile' for
+                 a behavioral profile on the transitive closure.
+    :return: The Footprint.
+    """
+    activities = sorted(dfg.get_activities())
+    return _build_footprint(activities, dfg.graph.edges(), mode)
+
+def footprint_from_log(log: EventLog, mode: str = 'footprint') -> Footprint:
+    """
+    Computes the footprint of an event log via its directly-follows pairs.
+
+    :param log: The event log.
+    :param mode: 'footprint' or 'profile', see :func:`footprint_from_dfg`.
+    :return: The Footprint.
+    """
+    activities = set()
+    edges = set()
+    for trace in log:
+        names = [event.activity for event in trace]
+        activities.update(names)
+        edges.update(zip(names, names[1:]))
+    return _build_footprint(sorted(activities), edges, mode)
+
+def footprint_from_petri_net(
+    net: PetriNet | CompiledPetriNet,
+    mode: str = 'footprint',
+    max_states: int = 100000,
+) -> Footprint:
+    """
+    Computes the footprint of a Petri net by exploring its state space.
+
+    Two visible transitions are in a directly-follows relation if the second
+    can fire after the first with only silent transitions in between. The
+    exploration stops after `max_states` states, so the footprint of
+    unbounded or very large nets is an under-approximation.
+
+    :param net: The Petri net, plain or compiled.
+    :param mode: 'footprint' or 'profile', see :func:`footprint_from_dfg`.
+    :param max_states: The maximum number of states to explore.
+    :return: The Footprint.
+    """
+    compiled = net if isinstance(net, CompiledPetriNet) else net.compile()
+    labels = [t.label for t in compiled.transitions]
+    activities = sorted({label for label in labels if label is not None})
+
+    edges = set()
+    # A state is a marking plus the last visible label fired to reach it
+    start = (compiled.initial_marking, None)
+    seen = {start}
+    frontier = [start]
+    while frontier and len(seen) < max_states:
+        marking, last = frontier.pop()
+        for t in compiled.enabled_transitions(marking):
+            label = labels[t]
+            if label is not None and last is not None:
+                edges.add((last, label))
+            successor = (compiled.fire(marking, t), label if label is not None else last)
+            if successor not in seen:
+                seen.add(successor)
+                frontier.append(successor)
+
+    return _build_footprint(activities, edges, mode)
+
+def compare_footprints(
+    log_footprint: Footprint, model_footprint: Footprint
+) -> Tuple[float, List[Dict]]:
+    """
+    Compares two footprints cell by cell.
+
+    The score is the share of activity pairs, among those related in at least
+    one footprint, whose relation agrees. Each unordered pair is reported
+    once, oriented as (row, column) in the upper triangle.
+
+    :param log_footprint: The footprint of the event log.
+    :param model_footprint: The footprint of the reference model.
+    :return: A tuple with the score in [0, 1] and a list of deviations.
+    """
+    activities = sorted(set(log_footprint.activities) | set(model_footprint.activities))
+    log_rel = log_footprint.reindex(activities).relations
+    model_rel = model_footprint.reindex(activities).relations
+
+    upper = np.triu(np.ones(log_rel.shape, dtype=bool))
+    related = upper & ((log_rel != CHOICE) | (model_rel != CHOICE))
+    mismatched = related & (log_rel != model_rel)
+
+    total = int(related.sum())
+    score = 1.0 - int(mismatched.sum()) / total if total > 0 else 1.0
+
+    deviations = [
+        {
+            'source': activities[i],
+            'target': activities[j],
+            'log_relation': RELATION_SYMBOLS[int(log_rel[i, j])],
+            'model_relation': RELATION_SYMBOLS[int(model_rel[i, j])],
+        }
+        for i, j in zip(*np.nonzero(mismatched))
+    ]
+    return score, deviations
+
+def check_footprint_conformance(
+    log: EventLog | DFG,
+    model: PetriNet | CompiledPetriNet | DFG,
+    mode: str = 'footprint',
+) -> Tuple[float, List[Dict]]:
+    """
+    Compares the footprint of a log (or its DFG) with that of a reference
+    Petri net or DFG.
+
+    :param log: The event log or a DFG discovered from it.
+    :param model: The reference model.
+    :param mode: 'footprint' or 'profile', see :func:`footprint_from_dfg`.
+    :return: A tuple with the score and a list of deviations per pair.
+    """
+    if isinstance(log, DFG):
+        log_fp = footprint_from_dfg(log, mode)
+    else:
+        log_fp = footprint_from_log(log, mode)
+
+    if isinstance(model, DFG):
+        model_fp = footprint_from_dfg(model, mode)
+    else:
+        model_fp = footprint_from_petri_net(model, mode)
+
+    return compare_footprints(log_fp, model_fp)
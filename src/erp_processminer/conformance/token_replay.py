@@ -4,7 +4,9 @@ A simplified implementation of token-based replay for conformance checking.
 
 from typing import Tuple, List, Dict
 from erp_processminer.eventlog.structures import EventLog, Trace
+from erp_processminer.eventlog.compressed import VariantLog
 from erp_processminer.models.petri_net import PetriNet, Marking, Place, Transition
+from erp_processminer.cache import ResultCache
 
 def get_enabled_transitions(net: PetriNet, marking: Marking) -> List[Transition]:
     """
@@ -46,42 +48,70 @@ def execute_transition(net: PetriNet, marking: Marking, trans: Transition) -> Ma
         
     return new_marking
 
-def replay_trace(
-    net: PetriNet, trace: Trace, initial_marking: Marking, final_marking: Marking
+class _ReplayIndex:
+    """
+    Per-net lookup tables for replay: the input and output places of every
+    transition and the transitions of every label, in the order in which
+    :func:`get_enabled_transitions` visits them.
+    """
+
+    def __init__(self, net: PetriNet):
+        self.preset: Dict[Transition, Tuple[Place, ...]] = {}
+        self.postset: Dict[Transition, Tuple[Place, ...]] = {}
+        self.consumed: Dict[Transition, int] = {}
+        self.produced: Dict[Transition, int] = {}
+        self.by_label: Dict[str, List[Transition]] = {}
+        for t in net.transitions:
+            sources = {arc.source for arc in net.in_arcs(t)}
+            targets = {arc.target for arc in net.out_arcs(t)}
+            self.preset[t] = tuple(p for p in sources if isinstance(p, Place))
+            self.postset[t] = tuple(p for p in targets if isinstance(p, Place))
+            self.consumed[t] = len(sources)
+            self.produced[t] = len(targets)
+            self.by_label.setdefault(t.label, []).append(t)
+
+    def candidates_by_code(self, activity_names: List[str]) -> List[List[Transition]]:
+        """Returns the transitions of each activity code's label."""
+        return [self.by_label.get(name, []) for name in activity_names]
+
+def _replay_candidates(
+    index: _ReplayIndex,
+    candidates: List[List[Transition]],
+    initial_marking: Marking,
+    final_marking: Marking,
 ) -> Dict:
     """
-    Performs token-based replay for a single trace and calculates fitness metrics.
+    Replays a sequence of events, each given by the transitions carrying its
+    label, and calculates fitness metrics.
     """
     produced = 0
     consumed = 0
     missing = 0
     remaining = 0
-    
+
     # Calculate produced and consumed tokens for a perfect replay
-    for event in trace:
-        # Find the corresponding transition
-        matching_trans = [t for t in net.transitions if t.label == event.activity]
-        if matching_trans:
-            t = matching_trans[0]
-            consumed += len({arc.source for arc in net.in_arcs(t)})
-            produced += len({arc.target for arc in net.out_arcs(t)})
-
-    current_marking = initial_marking
-    for event in trace:
-        enabled_transitions = get_enabled_transitions(net, current_marking)
-        
-        # Find a transition that matches the event's activity
-        matching_trans = [t for t in enabled_transitions if t.label == event.activity]
+    for transitions in candidates:
+        if transitions:
+            consumed += index.consumed[transitions[0]]
+            produced += index.produced[transitions[0]]
 
-        if matching_trans:
-            # Fire the transition
-            current_marking = execute_transition(net, current_marking, matching_trans[0])
+    tokens = dict(initial_marking.tokens)
+    for transitions in candidates:
+        # Fire the first enabled transition with the event's label
+        for t in transitions:
+            preset = index.preset[t]
+            if preset and all(tokens.get(p, 0) >= 1 for p in preset):
+                for p in preset:
+                    tokens[p] -= 1
+                for p in index.postset[t]:
+                    tokens[p] = tokens.get(p, 0) + 1
+                break
         else:
             # This event could not be replayed (missing token)
             missing += 1
 
     # Check for remaining tokens
-    for place, count in current_marking.tokens.items():
+    for place, count in tokens.items():
         if place in final_marking.tokens:
             remaining += abs(count - final_marking[place])
         else:
@@ -98,18 +128,60 @@ def replay_trace(
         'remaining_tokens': remaining,
     }
 
+def replay_trace(
+    net: PetriNet, trace: Trace, initial_marking: Marking, final_marking: Marking
+) -> Dict:
+    """
+    Performs token-based replay for a single trace and calculates fitness metrics.
+    """
+    return replay_activities(
+        net, [event.activity for event in trace], initial_marking, final_marking
+    )
+
+def replay_activities(
+    net: PetriNet, activities: List[str], initial_marking: Marking, final_marking: Marking
+) -> Dict:
+    """
+    Performs token-based replay for a sequence of activity names, e.g. a
+    variant, and calculates fitness metrics.
+    """
+    index = _ReplayIndex(net)
+    candidates = [index.by_label.get(activity, []) for activity in activities]
+    return _replay_candidates(index, candidates, initial_marking, final_marking)
+
 
 def calculate_conformance(
-    log: EventLog, net: PetriNet
+    log: EventLog | VariantLog, net: PetriNet, cache: ResultCache | None = None
 ) -> Tuple[float, List[Dict]]:
     """
     Calculates the overall conformance of an event log with respect to a
     Petri net using token-based replay.
 
-    :param log: The event log.
+    Events are matched to transitions through their activity codes (the
+    log's vocabulary), so each event costs one list lookup instead of a scan
+    over all transitions. For a variant-compressed log, every variant is
+    replayed once and its result is shared by all cases of that variant.
+
+    :param log: The event log, or its variant-compressed form.
     :param net: The Petri net model.
+    :param cache: An optional result cache, keyed by the log and the net.
+                  The key does not depend on the order of the traces, so the
+                  results are cached per case ID and returned in this log's
+                  order. Logs with duplicate case IDs bypass the cache.
     :return: A tuple with the average fitness and a list of results per trace.
     """
+    if cache is not None:
+        case_ids = log.case_ids.tolist() if isinstance(log, VariantLog) \
+            else [trace.case_id for trace in log]
+        if len(set(case_ids)) == len(case_ids):
+            def compute():
+                fitness, results = calculate_conformance(log, net)
+                return fitness, dict(zip(case_ids, results))
+            fitness, by_case = cache.get_or_compute(
+                log, 'calculate_conformance', {'net': net}, compute
+            )
+            return fitness, [by_case[case_id] for case_id in case_ids]
+
     # Find the source and sink places of the model
     source_places = [p for p in net.places if not net.in_arcs(p)]
     sink_places = [p for p in net.places if not net.out_arcs(p)]
@@ -119,14 +191,32 @@ def calculate_conformance(
 
     initial_marking = Marking({p: 1 for p in source_places})
     final_marking = Marking({p: 1 for p in sink_places})
+    index = _ReplayIndex(net)
     
+    if isinstance(log, VariantLog):
+        by_code = index.candidates_by_code(log.activity_names)
+        variant_results = [
+            _replay_candidates(index, [by_code[c] for c in codes], initial_marking, final_marking)
+            for codes in log.variants
+        ]
+        trace_results = [variant_results[v] for v in log.case_variants.tolist()]
+        total_fitness = sum(
+            result['fitness'] * weight
+            for result, weight in zip(variant_results, log.multiplicities.tolist())
+        )
+        avg_fitness = total_fitness / len(log) if len(log) else 1.0
+        return avg_fitness, trace_results
+
+    vocabulary = log.get_vocabulary()
+    trace_codes = log.activity_codes(vocabulary)
+    by_code = index.candidates_by_code(vocabulary.activities.names)
     trace_results = []
     total_fitness = 0.0
-    for trace in log:
-        result = replay_trace(net, trace, initial_marking, final_marking)
+    for codes in trace_codes:
+        result = _replay_candidates(index, [by_code[c] for c in codes], initial_marking, final_marking)
         trace_results.append(result)
         total_fitness += result['fitness']
         
     avg_fitness = total_fitness / len(log) if log else 1.0
     
-    return avg_fitness, trace_results
\ No newline at end of file
+    return avg_fitness, trace_results
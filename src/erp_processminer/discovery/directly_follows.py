@@ -6,58 +6,111 @@ from collections import Counter
 from typing import Tuple, Dict
 
 from erp_processminer.eventlog.structures import EventLog
+from erp_processminer.eventlog.compressed import VariantLog
 from erp_processminer.models.df_graph import DFG
+from erp_processminer.cache import ResultCache
 
-def discover_dfg(log: EventLog) -> Tuple[DFG, Dict[str, int], Dict[str, int]]:
+def discover_dfg(
+    log: EventLog | VariantLog, cache: ResultCache | None = None
+) -> Tuple[DFG, Dict[str, int], Dict[str, int]]:
     """
     Discovers a Directly-Follows Graph (DFG) from an event log.
 
     The DFG captures the frequency and performance of direct handovers
-    of work between activities.
+    of work between activities. Directly-follows pairs are counted on the
+    integer activity codes of the log's vocabulary.
 
-    :param log: The event log to mine.
+    :param log: The event log to mine, or its variant-compressed form.
+    :param cache: An optional result cache; an unchanged log is then only
+                  mined once.
     :return: A tuple containing the DFG, a dictionary of start activities,
              and a dictionary of end activities.
     """
-    dfg = DFG()
-    start_activities: Counter[str] = Counter()
-    end_activities: Counter[str] = Counter()
-    activity_frequencies: Counter[str] = Counter()
+    if cache is not None:
+        return cache.get_or_compute(log, 'discover_dfg', {}, lambda: discover_dfg(log))
+    if isinstance(log, VariantLog):
+        return _discover_dfg_from_variants(log)
 
-    # Add all unique activities as nodes first
-    all_activities = {event.activity for trace in log for event in trace}
-    for activity in all_activities:
-        dfg.add_activity(activity)
+    vocabulary = log.get_vocabulary()
+    trace_codes = log.activity_codes(vocabulary)
+    names = vocabulary.activities.names
+    start_codes: Counter[int] = Counter()
+    end_codes: Counter[int] = Counter()
+    code_frequencies: Counter[int] = Counter()
+    # Edge statistics keyed by (source code, target code): [frequency, total duration]
+    edges: Dict[Tuple[int, int], list] = {}
 
-    for trace in log:
-        if not trace.events:
+    for trace, codes in zip(log, trace_codes):
+        if not codes:
             continue
 
         # Register start and end activities
-        start_activities[trace.events[0].activity] += 1
-        end_activities[trace.events[-1].activity] += 1
-        for event in trace:
-            activity_frequencies[event.activity] += 1
+        start_codes[codes[0]] += 1
+        end_codes[codes[-1]] += 1
+        code_frequencies.update(codes)
 
         # Build the DFG edges
-        for i in range(len(trace.events) - 1):
-            source_event = trace.events[i]
-            target_event = trace.events[i+1]
-            
-            duration = (target_event.timestamp - source_event.timestamp).total_seconds()
-            
-            dfg.add_edge(
-                source=source_event.activity,
-                target=target_event.activity,
-                duration=duration
-            )
+        events = trace.events
+        for i in range(len(codes) - 1):
+            duration = (events[i + 1].timestamp - events[i].timestamp).total_seconds()
+            stats = edges.get((codes[i], codes[i + 1]))
+            if stats is None:
+                edges[(codes[i], codes[i + 1])] = [1, duration]
+            else:
+                stats[0] += 1
+                stats[1] += duration
+
+    start_activities = {names[c]: n for c, n in start_codes.items()}
+    end_activities = {names[c]: n for c, n in end_codes.items()}
+    activity_frequencies = {names[c]: n for c, n in code_frequencies.items()}
+
+    dfg = DFG()
+    for activity in activity_frequencies:
+        dfg.add_activity(activity)
+    for (u, v), (frequency, duration) in edges.items():
+        dfg.add_edge(source=names[u], target=names[v], weight=frequency, duration=duration)
 
     dfg.finalize() # Compute average durations
     
     # Add frequencies to the nodes
     for activity, freq in activity_frequencies.items():
-        if dfg.graph.has_node(activity):
-            dfg.graph.nodes[activity]['frequency'] = freq
+        dfg.graph.nodes[activity]['frequency'] = freq
+
+    dfg.start_activities = start_activities
+    dfg.end_activities = end_activities
+    dfg.activity_frequencies = activity_frequencies
+
+    return dfg, dict(start_activities), dict(end_activities)
+
+def _discover_dfg_from_variants(log: VariantLog) -> Tuple[DFG, Dict[str, int], Dict[str, int]]:
+    """
+    Discovers a DFG from a variant-compressed log. Frequencies are counted
+    once per variant and weighted by its multiplicity.
+    """
+    names = log.activity_names
+    dfg = DFG()
+    start_activities: Counter[str] = Counter()
+    end_activities: Counter[str] = Counter()
+    activity_frequencies: Counter[str] = Counter()
+
+    for codes, weight in zip(log.variants, log.multiplicities.tolist()):
+        if not codes:
+            continue
+        start_activities[names[codes[0]]] += weight
+        end_activities[names[codes[-1]]] += weight
+        for code in codes:
+            activity_frequencies[names[code]] += weight
+
+    for activity in activity_frequencies:
+        dfg.add_activity(activity)
+
+    for (u, v), (frequency, duration) in log.edge_durations().items():
+        dfg.add_edge(source=names[u], target=names[v], weight=frequency, duration=duration)
+
+    dfg.finalize()
+
+    for activity, freq in activity_frequencies.items():
+        dfg.graph.nodes[activity]['frequency'] = freq
 
     dfg.start_activities = dict(start_activities)
     dfg.end_activities = dict(end_activities)
@@ -5,24 +5,35 @@ a process model (in the form of a Petri net) from an event log.
 
 from collections import Counter
 from erp_processminer.eventlog.structures import EventLog
+from erp_processminer.eventlog.compressed import VariantLog
 from erp_processminer.models.petri_net import PetriNet, Place, Transition, Arc
 from erp_processminer.discovery.directly_follows import discover_dfg
+from erp_processminer.cache import ResultCache
 
 def discover_petri_net_with_heuristics(
-    log: EventLog,
+    log: EventLog | VariantLog,
     dependency_thresh: float = 0.5,
-    min_freq: int = 1
+    min_freq: int = 1,
+    cache: ResultCache | None = None
 ) -> PetriNet:
     """
     Discovers a Petri net from an event log using a simplified heuristics
     mining approach.
 
-    :param log: The event log to mine.
+    :param log: The event log to mine, or its variant-compressed form.
     :param dependency_thresh: The dependency threshold to filter out weak
                               causal dependencies.
     :param min_freq: The minimum frequency for an edge to be considered.
+    :param cache: An optional result cache; an unchanged log is then only
+                  mined once per parameter combination.
     :return: A discovered PetriNet.
     """
+    if cache is not None:
+        return cache.get_or_compute(
+            log, 'discover_petri_net_with_heuristics',
+            {'dependency_thresh': dependency_thresh, 'min_freq': min_freq},
+            lambda: discover_petri_net_with_heuristics(log, dependency_thresh, min_freq),
+        )
     dfg, start_activities, end_activities = discover_dfg(log)
     
     # 1. Filter DFG based on frequency and dependency
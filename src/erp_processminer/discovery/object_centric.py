@@ -0,0 +1,28 @@
+"""
+Discovers object-centric directly-follows graphs (OC-DFGs).
+"""
+
+from typing import Dict, List
+
+from erp_processminer.eventlog.object_centric import ObjectCentricLog
+from erp_processminer.eventlog.compressed import VariantLog
+from erp_processminer.discovery.directly_follows import discover_dfg
+from erp_processminer.models.df_graph import DFG
+
+def discover_oc_dfg(log: ObjectCentricLog, object_types: List[str] | None = None) -> Dict[str, DFG]:
+    """
+    Discovers one DFG per object type. Directly-follows relations are taken
+    along the lifecycle of each object, so an event shared by several
+    objects is counted once per object of the type, but never duplicated in
+    the log itself.
+
+    :param log: The object-centric log.
+    :param object_types: The object types to include (default: all).
+    :return: A dictionary mapping each object type to its DFG, with start
+             and end activities set on the DFG.
+    """
+    dfgs = {}
+    for object_type in object_types or log.type_names:
+        flat = VariantLog.from_columnar(log.flatten(object_type))
+        dfgs[object_type], _, _ = discover_dfg(flat)
+    return dfgs
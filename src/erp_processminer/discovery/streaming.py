@@ -0,0 +1,180 @@
+"""
+Discovers an approximate Directly-Follows Graph from an unbounded event
+stream in fixed memory.
+
+Exact online discovery must remember every case forever. A StreamingDFG
+instead keeps:
+
+- the last activity and timestamp of at most `max_cases` active cases;
+  cases idle for longer than `ttl` (in stream time, i.e. relative to the
+  latest event timestamp) are evicted, as are the least recently active
+  cases when the cap is reached;
+- at most `max_edges` edge counters, maintained with the space-saving
+  heavy-hitters algorithm: an unseen edge replaces the edge with the
+  smallest count and inherits that count as its error bound, so every
+  reported frequency overestimates the true one by at most its error and
+  every edge more frequent than ``events / max_edges`` is kept;
+- per counter, the duration sum and number of the handovers observed since
+  the counter was created, from which the mean duration is estimated.
+
+A regular :class:`DFG` snapshot can be exported at any time.
+"""
+
+from collections import Counter, OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, Tuple, Iterable
+
+from erp_processminer.eventlog.structures import Event
+from erp_processminer.models.df_graph import DFG
+
+class StreamingDFG:
+    """
+    An approximate, fixed-memory DFG over an event stream.
+
+    :ivar events: The number of events processed.
+    :ivar evicted: The number of cases evicted (by TTL, the case cap or
+                   :meth:`close_case`).
+    """
+
+    def __init__(self, max_cases: int = 100_000, max_edges: int = 1_000,
+                 ttl: timedelta | float | None = timedelta(days=30)):
+        """
+        :param max_cases: The maximum number of active cases kept.
+        :param max_edges: The maximum number of edge counters kept.
+        :param ttl: The idle time after which a case is evicted, as a
+                    timedelta or in seconds; None disables the TTL.
+        """
+        if max_cases < 1 or max_edges < 1:
+            raise ValueError("max_cases and max_edges must be at least 1.")
+        self.max_cases = max_cases
+        self.max_edges = max_edges
+        self.ttl = timedelta(seconds=ttl) if isinstance(ttl, (int, float)) else ttl
+        # Case ID -> (last activity, last timestamp), least recently active first
+        self._cases: OrderedDict[str, Tuple[str, datetime]] = OrderedDict()
+        # Edge -> [count, error, observed handovers, duration sum]
+        self._edges: Dict[Tuple[str, str], list] = {}
+        self.activity_frequencies: Counter[str] = Counter()
+        self.start_activities: Counter[str] = Counter()
+        self.end_activities: Counter[str] = Counter()
+        self.now: datetime | None = None
+        self.events = 0
+        self.evicted = 0
+
+    def update(self, case_id: str, activity: str, timestamp: datetime):
+        """
+        Processes one event.
+
+        :param case_id: The case of the event.
+        :param activity: The activity of the event.
+        :param timestamp: The time of the event.
+        """
+        self.events += 1
+        if self.now is None or timestamp > self.now:
+            self.now = timestamp
+        self.activity_frequencies[activity] += 1
+
+        previous = self._cases.pop(case_id, None)
+        if previous is None:
+            self.start_activities[activity] += 1
+        else:
+            last_activity, last_timestamp = previous
+            self._count_edge((last_activity, activity),
+                             (timestamp - last_timestamp).total_seconds())
+        self._cases[case_id] = (activity, timestamp)
+        self._expire()
+
+    def update_event(self, event: Event):
+        """Processes one :class:`Event`."""
+        self.update(event.case_id, event.activity, event.timestamp)
+
+    def extend(self, events: Iterable[Event]):
+        """Processes a sequence of events, e.g. from :func:`tail_events`."""
+        for event in events:
+            self.update(event.case_id, event.activity, event.timestamp)
+
+    def close_case(self, case_id: str):
+        """
+        Ends a case explicitly, e.g. on a completion event, instead of
+        waiting for its TTL.
+
+        :param case_id: The case to end; unknown cases are ignored.
+        """
+        state = self._cases.pop(case_id, None)
+        if state is not None:
+            self._end(state)
+
+    def _end(self, state: Tuple[str, datetime]):
+        self.end_activities[state[0]] += 1
+        self.evicted += 1
+
+    def _expire(self):
+        cases = self._cases
+        while len(cases) > self.max_cases:
+            self._end(cases.popitem(last=False)[1])
+        if self.ttl is None:
+            return
+        horizon = self.now - self.ttl
+        while cases:
+            state = next(iter(cases.values()))
+            if state[1] >= horizon:
+                break
+            self._end(cases.popitem(last=False)[1])
+
+    def _count_edge(self, edge: Tuple[str, str], duration: float):
+        counter = self._edges.get(edge)
+        if counter is None:
+            error = 0
+            if len(self._edges) >= self.max_edges:
+                # Space-saving: replace the least frequent edge
+                smallest = min(self._edges, key=lambda e: self._edges[e][0])
+                error = self._edges.pop(smallest)[0]
+            counter = self._edges[edge] = [error, error, 0, 0.0]
+        counter[0] += 1
+        counter[2] += 1
+        counter[3] += duration
+
+    @property
+    def active_cases(self) -> int:
+        """The number of cases currently kept."""
+        return len(self._cases)
+
+    def edge_estimates(self) -> Dict[Tuple[str, str], Dict[str, float]]:
+        """
+        Returns the tracked edges with their estimated 'frequency', its
+        maximal overestimation 'error', and the estimated 'avg_duration'
+        (seconds).
+        """
+        return {
+            edge: {'frequency': count, 'error': error,
+                   'avg_duration': total / observed if observed else 0.0}
+            for edge, (count, error, observed, total) in self._edges.items()
+        }
+
+    def to_dfg(self, min_frequency: int = 0) -> DFG:
+        """
+        Exports a snapshot of the current estimates as a regular DFG. Edge
+        attributes also include the 'error' of the frequency. End activities
+        count the cases ended so far.
+
+        :param min_frequency: Omits edges with a lower estimated frequency.
+        :return: The DFG.
+        """
+        dfg = DFG()
+        for activity, frequency in self.activity_frequencies.items():
+            dfg.add_activity(activity)
+            dfg.graph.nodes[activity]['frequency'] = frequency
+        for (u, v), estimate in self.edge_estimates().items():
+            if estimate['frequency'] < min_frequency:
+                continue
+            dfg.add_edge(u, v, weight=estimate['frequency'],
+                         duration=estimate['avg_duration'] * estimate['frequency'])
+            dfg.graph.edges[u, v]['error'] = estimate['error']
+        dfg.finalize()
+        dfg.start_activities = dict(self.start_activities)
+        dfg.end_activities = dict(self.end_activities)
+        dfg.activity_frequencies = dict(self.activity_frequencies)
+        return dfg
+
+    def __repr__(self) -> str:
+        return (f"StreamingDFG(events={self.events}, active_cases={self.active_cases}, "
+                f"edges={len(self._edges)})")
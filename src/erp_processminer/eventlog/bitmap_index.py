@@ -0,0 +1,377 @@
+"""
+Provides bitmap indexes over event and case attributes.
+
+An index stores, for every distinct value of an attribute, a bitset over the
+events (or cases) of a log. Equality and IN filters then become lookups, and
+their AND/OR/NOT combinations become bitwise operations, instead of a
+dictionary lookup per event and query. Indexes are
+built once, can be saved next to the log, and are reloaded without touching
+the events.
+
+Example::
+
+    index = LogIndex.build(log, event_keys=['plant', 'doc_type'], case_keys=['vendor'])
+    selection = index.event('plant').isin({'P100', 'P200'}) & index.event('doc_type').eq('NB')
+    filtered = index.select(log, events=selection, cases=index.case('vendor').eq('V-17'))
+"""
+
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Dict, Any, Iterable, List
+import numpy as np
+import pandas as pd
+
+from erp_processminer.eventlog.structures import EventLog
+from erp_processminer.eventlog.columnar import ColumnarLog
+from erp_processminer.eventlog.operations import filter_log_by_event_mask
+
+class Bitmap:
+    """
+    A fixed-size bitset over event or case positions.
+
+    Like a (simplified) Roaring bitmap, a bitmap is stored sparsely as sorted
+    positions when few bits are set and densely as packed bits (eight
+    positions per byte) otherwise, so high-cardinality attributes stay small.
+    Supports ``&``, ``|``, ``^``, ``~`` and ``-`` (and-not).
+    """
+
+    # Sparse storage (8 bytes per set bit) wins below one bit in 64
+    SPARSE_RATIO = 64
+
+    def __init__(self, size: int, bits: np.ndarray | None = None,
+                 positions: np.ndarray | None = None):
+        self.size = size
+        self._bits = bits
+        self._positions = positions
+
+    @classmethod
+    def from_positions(cls, positions: np.ndarray, size: int) -> "Bitmap":
+        """Creates a bitmap from sorted, unique positions."""
+        positions = np.asarray(positions, dtype=np.int64)
+        if positions.size * cls.SPARSE_RATIO < size:
+            return cls(size, positions=positions)
+        mask = np.zeros(size, dtype=bool)
+        mask[positions] = True
+        return cls(size, bits=np.packbits(mask))
+
+    @classmethod
+    def from_mask(cls, mask: np.ndarray) -> "Bitmap":
+        """Creates a bitmap from a boolean array."""
+        mask = np.asarray(mask, dtype=bool)
+        if np.count_nonzero(mask) * cls.SPARSE_RATIO < mask.size:
+            return cls(mask.size, positions=np.flatnonzero(mask))
+        return cls(mask.size, bits=np.packbits(mask))
+
+    @classmethod
+    def empty(cls, size: int) -> "Bitmap":
+        """Creates a bitmap with no bits set."""
+        return cls(size, positions=np.empty(0, dtype=np.int64))
+
+    @property
+    def is_sparse(self) -> bool:
+        """Whether the bitmap is stored as a list of positions."""
+        return self._positions is not None
+
+    def to_mask(self) -> np.ndarray:
+        """Returns the bitmap as a boolean array."""
+        if self.is_sparse:
+            mask = np.zeros(self.size, dtype=bool)
+            mask[self._positions] = True
+            return mask
+        return np.unpackbits(self._bits, count=self.size).astype(bool)
+
+    def packed(self) -> np.ndarray:
+        """Returns the bitmap as packed bits."""
+        return self._bits if not self.is_sparse else np.packbits(self.to_mask())
+
+    def positions(self) -> np.ndarray:
+        """Returns the positions of the set bits."""
+        return self._positions if self.is_sparse else np.flatnonzero(self.to_mask())
+
+    def count(self) -> int:
+        """Returns the number of set bits."""
+        if self.is_sparse:
+            return int(self._positions.size)
+        return int(np.unpackbits(self._bits, count=self.size).sum())
+
+    def _combine(self, other: "Bitmap", sparse_op, dense_op) -> "Bitmap":
+        if self.size != other.size:
+            raise ValueError("Cannot combine bitmaps of different sizes.")
+        if self.is_sparse and other.is_sparse:
+            return Bitmap.from_positions(sparse_op(self._positions, other._positions), self.size)
+        bits = dense_op(self.packed(), other.packed())
+        return Bitmap.from_mask(np.unpackbits(bits, count=self.size).astype(bool)) \
+            if self.is_sparse or other.is_sparse else Bitmap(self.size, bits=bits)
+
+    def __and__(self, other: "Bitmap") -> "Bitmap":
+        return self._combine(other, lambda a, b: np.intersect1d(a, b, assume_unique=True),
+                             np.bitwise_and)
+
+    def __or__(self, other: "Bitmap") -> "Bitmap":
+        return self._combine(other, np.union1d, np.bitwise_or)
+
+    def __xor__(self, other: "Bitmap") -> "Bitmap":
+        return self._combine(other, lambda a, b: np.setxor1d(a, b, assume_unique=True),
+                             np.bitwise_xor)
+
+    def __sub__(self, other: "Bitmap") -> "Bitmap":
+        return self._combine(other, lambda a, b: np.setdiff1d(a, b, assume_unique=True),
+                             lambda a, b: a & ~b)
+
+    def __invert__(self) -> "Bitmap":
+        bits = ~self.packed()
+        if self.size % 8:
+            # Clear the padding bits of the last byte
+            bits[-1] &= np.uint8((0xFF << (8 - self.size % 8)) & 0xFF)
+        return Bitmap(self.size, bits=bits)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __repr__(self) -> str:
+        kind = 'sparse' if self.is_sparse else 'dense'
+        return f"Bitmap(size={self.size}, set={self.count()}, {kind})"
+
+class AttributeIndex:
+    """
+    A bitmap per distinct value of one attribute.
+
+    :ivar key: The attribute name.
+    :ivar level: 'event' or 'case'.
+    :ivar size: The number of events or cases indexed.
+    :ivar bitmaps: The bitmap of each value.
+    """
+
+    def __init__(self, key: str, level: str, size: int, bitmaps: Dict[Any, Bitmap]):
+        self.key = key
+        self.level = level
+        self.size = size
+        self.bitmaps = bitmaps
+
+    @classmethod
+    def from_values(cls, key: str, level: str, values: np.ndarray) -> "AttributeIndex":
+        """
+        Builds the index from one value per position. None values are not
+        indexed.
+        """
+        values = np.asarray(values, dtype=object)
+        present = np.array([v is not None for v in values], dtype=bool)
+        bitmaps = {}
+        if present.any():
+            # Sort once; each value's positions are then a contiguous run
+            positions = np.flatnonzero(present)
+            codes, uniques = _factorize(values[positions])
+            order = np.argsort(codes, kind='stable')
+            bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+            for i, value in enumerate(uniques):
+                bitmaps[value] = Bitmap.from_positions(
+                    positions[order[bounds[i]:bounds[i + 1]]], values.size
+                )
+        return cls(key, level, values.size, bitmaps)
+
+    def values(self) -> List[Any]:
+        """Returns the indexed values."""
+        return list(self.bitmaps)
+
+    def eq(self, value: Any) -> Bitmap:
+        """Returns the positions where the attribute equals `value`."""
+        bitmap = self.bitmaps.get(value)
+        return bitmap if bitmap is not None else Bitmap.empty(self.size)
+
+    def isin(self, values: Iterable[Any]) -> Bitmap:
+        """Returns the positions where the attribute takes one of `values`."""
+        result = Bitmap.empty(self.size)
+        for value in values:
+            bitmap = self.bitmaps.get(value)
+            if bitmap is not None:
+                result = result | bitmap
+        return result
+
+def _factorize(values: np.ndarray):
+    codes: Dict[Any, int] = {}
+    array = np.fromiter((codes.setdefault(v, len(codes)) for v in values),
+                        dtype=np.int64, count=len(values))
+    return array, list(codes)
+
+def _to_json_value(value: Any) -> Any:
+    """
+    Encodes an indexed value for the index file. Timestamps, dates and
+    decimals are tagged so they are restored with their type.
+    """
+    if isinstance(value, np.datetime64):
+        value = pd.Timestamp(value)
+    elif isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, datetime):
+        return {'timestamp': pd.Timestamp(value).isoformat()}
+    if isinstance(value, date):
+        return {'date': value.isoformat()}
+    if isinstance(value, Decimal):
+        return {'decimal': str(value)}
+    raise ValueError(f"Cannot save index value {value!r} of type {type(value).__name__}.")
+
+def _from_json_value(value: Any) -> Any:
+    """Decodes a value written by :func:`_to_json_value`."""
+    if not isinstance(value, dict):
+        return value
+    if 'timestamp' in value:
+        return pd.Timestamp(value['timestamp'])
+    if 'date' in value:
+        return date.fromisoformat(value['date'])
+    return Decimal(value['decimal'])
+
+class LogIndex:
+    """
+    A set of event-level and case-level attribute indexes for one log.
+
+    Event positions follow the order of events when traces are concatenated
+    (which is also the order of a ColumnarLog); case positions follow the
+    order of the traces. Case-level attributes are read from the trace
+    attributes, or else from the first event of each case that carries them.
+    """
+
+    def __init__(self, n_events: int, n_cases: int,
+                 event_indexes: Dict[str, AttributeIndex],
+                 case_indexes: Dict[str, AttributeIndex]):
+        self.n_events = n_events
+        self.n_cases = n_cases
+        self.event_indexes = event_indexes
+        self.case_indexes = case_indexes
+
+    @classmethod
+    def build(
+        cls,
+        log: EventLog | ColumnarLog,
+        event_keys: Iterable[str] = (),
+        case_keys: Iterable[str] = (),
+    ) -> "LogIndex":
+        """
+        Builds indexes for the given event and case attributes.
+
+        :param log: The event log, in object or columnar form.
+        :param event_keys: Attributes to index per event.
+        :param case_keys: Attributes to index per case.
+        :return: The LogIndex.
+        """
+        columnar = log if isinstance(log, ColumnarLog) else ColumnarLog.from_event_log(log)
+        empty = np.full(columnar.n_events, None, dtype=object)
+
+        event_indexes = {
+            key: AttributeIndex.from_values(key, 'event', columnar.attributes.get(key, empty))
+            for key in event_keys
+        }
+
+        case_indexes = {}
+        case_index = columnar.case_index()
+        for key in case_keys:
+            if key in columnar.case_attributes:
+                case_indexes[key] = AttributeIndex.from_values(
+                    key, 'case', columnar.case_attributes[key]
+                )
+                continue
+            column = columnar.attributes.get(key, empty)
+            case_values = np.full(columnar.n_cases, None, dtype=object)
+            present = np.flatnonzero([v is not None for v in column])
+            if present.size:
+                # Reverse assignment so the first event of each case wins
+                case_values[case_index[present[::-1]]] = column[present[::-1]]
+            case_indexes[key] = AttributeIndex.from_values(key, 'case', case_values)
+
+        return cls(columnar.n_events, columnar.n_cases, event_indexes, case_indexes)
+
+    def event(self, key: str) -> AttributeIndex:
+        """Returns the event-level index of an attribute."""
+        return self.event_indexes[key]
+
+    def case(self, key: str) -> AttributeIndex:
+        """Returns the case-level index of an attribute."""
+        return self.case_indexes[key]
+
+    def select(
+        self,
+        log: EventLog | ColumnarLog,
+        events: Bitmap | None = None,
+        cases: Bitmap | None = None,
+    ) -> EventLog | ColumnarLog:
+        """
+        Filters the log by an event bitmap and/or a case bitmap. Traces left
+        without events are removed.
+
+        :param log: The log the index was built for.
+        :param events: The events to keep (all if None).
+        :param cases: The cases to keep (all if None).
+        :return: The filtered log, of the same type as `log`.
+        """
+        columnar = log if isinstance(log, ColumnarLog) else None
+        n_cases = len(log)
+        n_events = columnar.n_events if columnar is not None else sum(len(t) for t in log)
+        if (n_events, n_cases) != (self.n_events, self.n_cases):
+            raise ValueError("The index was built for a different log.")
+
+        mask = events.to_mask() if events is not None else np.ones(n_events, dtype=bool)
+        lengths = columnar.trace_lengths() if columnar is not None else \
+            np.fromiter((len(t) for t in log), dtype=np.int64, count=n_cases)
+        if cases is not None:
+            mask &= np.repeat(cases.to_mask(), lengths)
+
+        if columnar is not None:
+            return columnar.select_events(mask)
+        return filter_log_by_event_mask(log, mask)
+
+    def save(self, file_path: str | Path):
+        """
+        Saves the index to a compressed ``.npz`` file, e.g. next to the log
+        it was built for. Strings, numbers, booleans, timestamps, dates and
+        decimals are restored with their type; other values are rejected.
+
+        :param file_path: The path to the output file.
+        """
+        arrays = {}
+        meta = {'n_events': self.n_events, 'n_cases': self.n_cases, 'event': {}, 'case': {}}
+        for level, indexes in (('event', self.event_indexes), ('case', self.case_indexes)):
+            for key, index in indexes.items():
+                meta[level][key] = [_to_json_value(v) for v in index.bitmaps]
+                for i, bitmap in enumerate(index.bitmaps.values()):
+                    if bitmap.is_sparse:
+                        arrays[f"{level}/{key}/{i}/positions"] = bitmap.positions()
+                    else:
+                        arrays[f"{level}/{key}/{i}/bits"] = bitmap.packed()
+        arrays['meta'] = np.frombuffer(json.dumps(meta).encode('utf-8'), dtype=np.uint8)
+        with open(file_path, 'wb') as f:
+            np.savez_compressed(f, **arrays)
+
+    @classmethod
+    def load(cls, file_path: str | Path) -> "LogIndex":
+        """
+        Loads an index saved with :meth:`save`.
+
+        :param file_path: The path to the index file.
+        :return: The LogIndex.
+        """
+        with np.load(file_path) as data:
+            meta = json.loads(data['meta'].tobytes().decode('utf-8'))
+            names = set(data.files)
+
+            def bitmap(name: str, size: int) -> Bitmap:
+                if f"{name}/positions" in names:
+                    return Bitmap(size, positions=data[f"{name}/positions"])
+                return Bitmap(size, bits=data[f"{name}/bits"])
+
+            indexes = {}
+            for level, size in (('event', meta['n_events']), ('case', meta['n_cases'])):
+                indexes[level] = {
+                    key: AttributeIndex(key, level, size, {
+                        _from_json_value(value): bitmap(f"{level}/{key}/{i}", size)
+                        for i, value in enumerate(values)
+                    })
+                    for key, values in meta[level].items()
+                }
+        return cls(meta['n_events'], meta['n_cases'], indexes['event'], indexes['case'])
+
+    def __repr__(self) -> str:
+        return (f"LogIndex(events={self.n_events}, cases={self.n_cases}, "
+                f"event_keys={list(self.event_indexes)}, case_keys={list(self.case_indexes)})")
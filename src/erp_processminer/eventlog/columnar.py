@@ -0,0 +1,330 @@
+"""
+Defines a columnar, integer-coded representation of an event log.
+
+Events are stored in flat NumPy arrays ordered by case and then by timestamp.
+Activities are dictionary-encoded as integer codes, and the events of case
+``i`` occupy the slice ``case_offsets[i]:case_offsets[i + 1]``. This layout is
+what vectorized algorithms operate on; it converts to and from the object
+model (EventLog/Trace/Event) losslessly, except for attributes whose value
+is None: attribute columns use None for events (or cases) that lack an
+attribute, so such keys are absent after converting back.
+"""
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Dict
+import numpy as np
+import pandas as pd
+
+from erp_processminer.eventlog.structures import EventLog, Trace, Event, EMPTY_ATTRIBUTES
+
+@dataclass
+class ColumnarLog:
+    """
+    A columnar event log.
+
+    :ivar case_ids: Case identifiers, one per case.
+    :ivar case_offsets: Start offset of each case's events, plus a final
+                        entry equal to the number of events.
+    :ivar activities: Integer activity code per event.
+    :ivar timestamps: Timestamp per event, as datetime64[ns].
+    :ivar activity_names: Activity name for each code.
+    :ivar attributes: Optional per-event attribute columns; None marks
+                      events without the attribute.
+    :ivar case_attributes: Optional per-case attribute columns; None marks
+                           cases without the attribute.
+    """
+    case_ids: np.ndarray
+    case_offsets: np.ndarray
+    activities: np.ndarray
+    timestamps: np.ndarray
+    activity_names: List[str]
+    attributes: Dict[str, np.ndarray] = field(default_factory=dict)
+    case_attributes: Dict[str, np.ndarray] = field(default_factory=dict)
+
+    @classmethod
+    def from_event_log(cls, log: EventLog) -> "ColumnarLog":
+        """
+        Converts an EventLog into columnar form.
+
+        :param log: The event log to convert.
+        :return: The columnar log.
+        """
+        codes: Dict[str, int] = {}
+        lengths = np.fromiter((len(trace) for trace in log), dtype=np.int64, count=len(log))
+        offsets = np.zeros(len(log) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+
+        events = [event for trace in log for event in trace]
+        activities = np.fromiter(
+            (codes.setdefault(e.activity, len(codes)) for e in events),
+            dtype=np.int32, count=len(events)
+        )
+        timestamps = np.array([e.timestamp for e in events], dtype='datetime64[ns]')
+
+        keys: Dict[str, None] = {}
+        for e in events:
+            keys.update(dict.fromkeys(e.attributes))
+        attributes = {}
+        for key in keys:
+            column = np.empty(len(events), dtype=object)
+            column[:] = [e.attributes.get(key) for e in events]
+            attributes[key] = column
+
+        case_keys: Dict[str, None] = {}
+        for trace in log:
+            case_keys.update(dict.fromkeys(trace.attributes))
+        case_attributes = {}
+        for key in case_keys:
+            column = np.empty(len(log), dtype=object)
+            column[:] = [trace.attributes.get(key) for trace in log]
+            case_attributes[key] = column
+
+        return cls(
+            case_ids=np.array([trace.case_id for trace in log], dtype=str),
+            case_offsets=offsets,
+            activities=activities,
+            timestamps=timestamps,
+            activity_names=list(codes),
+            attributes=attributes,
+            case_attributes=case_attributes,
+        )
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> "ColumnarLog":
+        """
+        Converts a DataFrame with 'case_id', 'activity' and 'timestamp'
+        columns into columnar form without materializing Event objects.
+        All other columns become event attributes.
+
+        :param df: The DataFrame to convert.
+        :return: The columnar log.
+        """
+        required_cols = ['case_id', 'activity', 'timestamp']
+        if not all(col in df.columns for col in required_cols):
+            raise ValueError(f"DataFrame must contain columns: {required_cols}")
+
+        case_codes, case_ids = pd.factorize(df['case_id'], sort=False)
+        timestamps = pd.to_datetime(df['timestamp']).to_numpy(dtype='datetime64[ns]')
+        # Group by case in order of first appearance, then sort by time
+        order = np.lexsort((timestamps, case_codes))
+
+        activity_codes, activity_names = pd.factorize(df['activity'].to_numpy()[order])
+        lengths = np.bincount(case_codes, minlength=len(case_ids))
+        offsets = np.zeros(len(case_ids) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+
+        attributes = {
+            col: df[col].to_numpy(dtype=object)[order]
+            for col in df.columns if col not in required_cols
+        }
+
+        return cls(
+            case_ids=np.asarray(case_ids, dtype=str),
+            case_offsets=offsets,
+            activities=activity_codes.astype(np.int32),
+            timestamps=timestamps[order],
+            activity_names=[str(a) for a in activity_names],
+            attributes=attributes,
+        )
+
+    def to_event_log(self) -> EventLog:
+        """
+        Converts the columnar log back into an EventLog. None entries of the
+        attribute columns mean "absent", so they produce no attribute keys.
+
+        :return: The EventLog.
+        """
+        names = self.activity_names
+        stamps = pd.DatetimeIndex(self.timestamps).to_pydatetime()
+        keys = list(self.attributes)
+        case_keys = list(self.case_attributes)
+        traces = []
+        for i, case_id in enumerate(self.case_ids.tolist()):
+            events = []
+            for j in range(self.case_offsets[i], self.case_offsets[i + 1]):
+                attributes = {}
+                for key in keys:
+                    value = self.attributes[key][j]
+                    if value is not None:
+                        attributes[key] = value
+                events.append(Event(
+                    case_id=case_id,
+                    activity=names[self.activities[j]],
+                    timestamp=stamps[j],
+                    attributes=attributes or EMPTY_ATTRIBUTES,
+                ))
+            case_attributes = {}
+            for key in case_keys:
+                value = self.case_attributes[key][i]
+                if value is not None:
+                    case_attributes[key] = value
+            traces.append(Trace.presorted(case_id, events, case_attributes or EMPTY_ATTRIBUTES))
+        return EventLog(traces)
+
+    @property
+    def n_cases(self) -> int:
+        """The number of cases."""
+        return len(self.case_ids)
+
+    @property
+    def n_events(self) -> int:
+        """The number of events."""
+        return len(self.activities)
+
+    def __len__(self) -> int:
+        return self.n_cases
+
+    def trace_lengths(self) -> np.ndarray:
+        """Returns the number of events of each case."""
+        return np.diff(self.case_offsets)
+
+    def case_index(self) -> np.ndarray:
+        """Returns, for every event, the position of its case."""
+        return np.repeat(np.arange(self.n_cases), self.trace_lengths())
+
+    def activity_code(self, activity: str) -> int | None:
+        """Returns the code of an activity, or None if it never occurs."""
+        try:
+            return self.activity_names.index(activity)
+        except ValueError:
+            return None
+
+    def select_cases(self, cases: np.ndarray) -> "ColumnarLog":
+        """
+        Returns a new columnar log with a subset of the cases.
+
+        :param cases: A boolean mask over cases or an array of case positions.
+        :return: The sub-log, sharing the activity encoding.
+        """
+        cases = np.asarray(cases)
+        if cases.dtype == bool:
+            cases = np.flatnonzero(cases)
+        lengths = self.trace_lengths()[cases]
+        offsets = np.zeros(len(cases) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        # Event positions of the selected cases, case by case
+        events = np.repeat(self.case_offsets[cases] - offsets[:-1], lengths) + np.arange(offsets[-1])
+
+        return ColumnarLog(
+            case_ids=self.case_ids[cases],
+            case_offsets=offsets,
+            activities=self.activities[events],
+            timestamps=self.timestamps[events],
+            activity_names=self.activity_names,
+            attributes={k: v[events] for k, v in self.attributes.items()},
+            case_attributes={k: v[cases] for k, v in self.case_attributes.items()},
+        )
+
+    def case_range(self, start: int, stop: int) -> "ColumnarLog":
+        """
+        Returns the cases at positions ``start:stop``. Unlike
+        :meth:`select_cases`, the event arrays are views, not copies.
+
+        :param start: The first case position.
+        :param stop: The position after the last case.
+        :return: The sub-log, sharing the activity encoding.
+        """
+        first, last = int(self.case_offsets[start]), int(self.case_offsets[stop])
+        return ColumnarLog(
+            case_ids=self.case_ids[start:stop],
+            case_offsets=np.asarray(self.case_offsets[start:stop + 1]) - first,
+            activities=self.activities[first:last],
+            timestamps=self.timestamps[first:last],
+            activity_names=self.activity_names,
+            attributes={k: v[first:last] for k, v in self.attributes.items()},
+            case_attributes={k: v[start:stop] for k, v in self.case_attributes.items()},
+        )
+
+    def select_events(self, mask: np.ndarray) -> "ColumnarLog":
+        """
+        Returns a new columnar log with only the events where `mask` is
+        True. Cases left without events are removed.
+
+        :param mask: A boolean mask over events.
+        :return: The filtered log, sharing the activity encoding.
+        """
+        mask = np.asarray(mask, dtype=bool)
+        running = np.zeros(self.n_events + 1, dtype=np.int64)
+        np.cumsum(mask, out=running[1:])
+        kept_per_case = running[self.case_offsets[1:]] - running[self.case_offsets[:-1]]
+        cases = kept_per_case > 0
+        offsets = np.zeros(int(cases.sum()) + 1, dtype=np.int64)
+        np.cumsum(kept_per_case[cases], out=offsets[1:])
+
+        return ColumnarLog(
+            case_ids=self.case_ids[cases],
+            case_offsets=offsets,
+            activities=self.activities[mask],
+            timestamps=self.timestamps[mask],
+            activity_names=self.activity_names,
+            attributes={k: v[mask] for k, v in self.attributes.items()},
+            case_attributes={k: v[cases] for k, v in self.case_attributes.items()},
+        )
+
+    def save(self, directory: str | Path):
+        """
+        Saves the log in a binary format: one ``.npy`` file per array plus a
+        ``meta.json`` file, inside `directory`. Numeric arrays can be
+        memory-mapped when loading.
+
+        :param directory: The output directory (created if missing).
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        np.save(directory / 'case_ids.npy', np.asarray(self.case_ids, dtype=str))
+        np.save(directory / 'case_offsets.npy', self.case_offsets)
+        np.save(directory / 'activities.npy', self.activities)
+        np.save(directory / 'timestamps.npy', self.timestamps.astype('datetime64[ns]'))
+        keys = list(self.attributes)
+        for i, key in enumerate(keys):
+            np.save(directory / f'attribute_{i}.npy', self.attributes[key], allow_pickle=True)
+        case_keys = list(self.case_attributes)
+        for i, key in enumerate(case_keys):
+            np.save(directory / f'case_attribute_{i}.npy', self.case_attributes[key], allow_pickle=True)
+        meta = {'activity_names': list(self.activity_names), 'attributes': keys,
+                'case_attributes': case_keys}
+        with open(directory / 'meta.json', 'w') as f:
+            json.dump(meta, f)
+
+    @classmethod
+    def load(cls, directory: str | Path, mmap: bool = True) -> "ColumnarLog":
+        """
+        Loads a log saved with :meth:`save`.
+
+        :param directory: The directory of the saved log.
+        :param mmap: Whether to memory-map the numeric arrays instead of
+                     reading them into memory.
+        :return: The columnar log.
+        """
+        directory = Path(directory)
+        with open(directory / 'meta.json') as f:
+            meta = json.load(f)
+        mode = 'r' if mmap else None
+        return cls(
+            case_ids=np.load(directory / 'case_ids.npy', mmap_mode=mode),
+            case_offsets=np.load(directory / 'case_offsets.npy', mmap_mode=mode),
+            activities=np.load(directory / 'activities.npy', mmap_mode=mode),
+            timestamps=np.load(directory / 'timestamps.npy', mmap_mode=mode),
+            activity_names=meta['activity_names'],
+            attributes={
+                key: np.load(directory / f'attribute_{i}.npy', allow_pickle=True)
+                for i, key in enumerate(meta['attributes'])
+            },
+            case_attributes={
+                key: np.load(directory / f'case_attribute_{i}.npy', allow_pickle=True)
+                for i, key in enumerate(meta.get('case_attributes', []))
+            },
+        )
+
+    def query(self) -> "LogQuery":
+        """
+        Starts a lazy, fused filter pipeline over this log.
+        See :class:`erp_processminer.eventlog.query.LogQuery`.
+        """
+        from erp_processminer.eventlog.query import LogQuery
+        return LogQuery(self)
+
+    def __repr__(self) -> str:
+        return f"ColumnarLog(cases={self.n_cases}, events={self.n_events})"
@@ -0,0 +1,250 @@
+"""
+Defines a variant-compressed representation of an event log.
+
+Each distinct activity sequence (variant) is stored once, together with its
+multiplicity. Cases only keep a variant ID, a start timestamp and the offsets
+of their events from that start. Frequency-based algorithms therefore scale
+with the number of variants rather than the number of cases, while timing
+information is still available per case.
+"""
+
+from dataclasses import dataclass
+from typing import List, Dict, Tuple, Set
+import numpy as np
+
+from erp_processminer.eventlog.structures import EventLog
+from erp_processminer.eventlog.columnar import ColumnarLog
+
+@dataclass
+class VariantLog:
+    """
+    A variant-compressed event log.
+
+    :ivar activity_names: Activity name for each activity code.
+    :ivar variants: The distinct activity-code sequences.
+    :ivar multiplicities: The number of cases of each variant.
+    :ivar case_ids: Case identifiers, one per case.
+    :ivar case_variants: The variant ID of each case.
+    :ivar case_starts: The timestamp of the first event of each case.
+    :ivar case_offsets: Start offset of each case's events in
+                        `event_offsets`, plus a final entry.
+    :ivar event_offsets: Time since the start of its case for every event,
+                         as timedelta64[ns].
+    """
+    activity_names: List[str]
+    variants: List[Tuple[int, ...]]
+    multiplicities: np.ndarray
+    case_ids: np.ndarray
+    case_variants: np.ndarray
+    case_starts: np.ndarray
+    case_offsets: np.ndarray
+    event_offsets: np.ndarray
+
+    @classmethod
+    def from_columnar(cls, log: ColumnarLog) -> "VariantLog":
+        """
+        Compresses a columnar log. Event attributes are not kept.
+
+        :param log: The columnar log.
+        :return: The variant-compressed log.
+        """
+        codes = log.activities.tolist()
+        offsets = log.case_offsets.tolist()
+        variant_ids: Dict[Tuple[int, ...], int] = {}
+        case_variants = np.fromiter(
+            (variant_ids.setdefault(tuple(codes[offsets[i]:offsets[i + 1]]), len(variant_ids))
+             for i in range(log.n_cases)),
+            dtype=np.int64, count=log.n_cases
+        )
+
+        lengths = log.trace_lengths()
+        starts = np.full(log.n_cases, np.datetime64('NaT'), dtype='datetime64[ns]')
+        non_empty = lengths > 0
+        starts[non_empty] = log.timestamps[log.case_offsets[:-1][non_empty]]
+
+        return cls(
+            activity_names=list(log.activity_names),
+            variants=list(variant_ids),
+            multiplicities=np.bincount(case_variants, minlength=len(variant_ids)),
+            case_ids=log.case_ids,
+            case_variants=case_variants,
+            case_starts=starts,
+            case_offsets=log.case_offsets,
+            event_offsets=log.timestamps - np.repeat(starts, lengths),
+        )
+
+    @classmethod
+    def from_event_log(cls, log: EventLog) -> "VariantLog":
+        """
+        Compresses an event log. Event attributes are not kept.
+
+        :param log: The event log.
+        :return: The variant-compressed log.
+        """
+        return cls.from_columnar(ColumnarLog.from_event_log(log))
+
+    def to_columnar(self) -> ColumnarLog:
+        """
+        Expands the log back into columnar form (without attributes).
+
+        :return: The columnar log.
+        """
+        lengths = np.diff(self.case_offsets)
+        pieces = [np.asarray(self.variants[v], dtype=np.int32) for v in self.case_variants.tolist()]
+        activities = np.concatenate(pieces) if pieces else np.empty(0, dtype=np.int32)
+        return ColumnarLog(
+            case_ids=self.case_ids,
+            case_offsets=self.case_offsets,
+            activities=activities,
+            timestamps=np.repeat(self.case_starts, lengths) + self.event_offsets,
+            activity_names=list(self.activity_names),
+        )
+
+    def to_event_log(self) -> EventLog:
+        """
+        Expands the log back into an EventLog (without attributes).
+
+        :return: The EventLog.
+        """
+        return self.to_columnar().to_event_log()
+
+    @property
+    def n_cases(self) -> int:
+        """The number of cases."""
+        return len(self.case_ids)
+
+    @property
+    def n_variants(self) -> int:
+        """The number of distinct variants."""
+        return len(self.variants)
+
+    def __len__(self) -> int:
+        return self.n_cases
+
+    def variant_activities(self, variant: int) -> Tuple[str, ...]:
+        """Returns the activity names of a variant."""
+        return tuple(self.activity_names[c] for c in self.variants[variant])
+
+    def variant_cases(self, variant: int) -> np.ndarray:
+        """Returns the positions of the cases following a variant."""
+        return np.flatnonzero(self.case_variants == variant)
+
+    def cycle_times(self) -> np.ndarray:
+        """Returns the cycle time of every case in seconds (NaN if empty)."""
+        lengths = np.diff(self.case_offsets)
+        result = np.full(self.n_cases, np.nan)
+        non_empty = lengths > 0
+        last = self.event_offsets[self.case_offsets[1:][non_empty] - 1]
+        result[non_empty] = last / np.timedelta64(1, 's')
+        return result
+
+    def select_cases(self, cases: np.ndarray) -> "VariantLog":
+        """
+        Returns a new log with a subset of the cases. Variants that no
+        longer occur are dropped and the remaining ones renumbered.
+
+        :param cases: A boolean mask over cases or an array of case positions.
+        :return: The sub-log.
+        """
+        cases = np.asarray(cases)
+        if cases.dtype == bool:
+            cases = np.flatnonzero(cases)
+        lengths = np.diff(self.case_offsets)[cases]
+        offsets = np.zeros(len(cases) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        events = np.repeat(self.case_offsets[cases] - offsets[:-1], lengths) + np.arange(offsets[-1])
+
+        used, case_variants = np.unique(self.case_variants[cases], return_inverse=True)
+        return VariantLog(
+            activity_names=self.activity_names,
+            variants=[self.variants[v] for v in used.tolist()],
+            multiplicities=np.bincount(case_variants, minlength=len(used)),
+            case_ids=self.case_ids[cases],
+            case_variants=case_variants.astype(np.int64),
+            case_starts=self.case_starts[cases],
+            case_offsets=offsets,
+            event_offsets=self.event_offsets[events],
+        )
+
+    def select_variants(self, variants: np.ndarray) -> "VariantLog":
+        """
+        Returns a new log with only the cases of the given variants.
+
+        :param variants: A boolean mask over variants or an array of IDs.
+        :return: The sub-log.
+        """
+        variants = np.asarray(variants)
+        mask = variants if variants.dtype == bool else np.isin(np.arange(self.n_variants), variants)
+        return self.select_cases(mask[self.case_variants])
+
+    def filter_activities(self, activities: Set[str]) -> "VariantLog":
+        """
+        Keeps only events of the given activities. Each variant is projected
+        once; cases left without events are removed and variants that become
+        identical are merged.
+
+        :param activities: The activity names to keep.
+        :return: The filtered log.
+        """
+        keep_codes = {i for i, a in enumerate(self.activity_names) if a in activities}
+        non_empty = np.array([any(c in keep_codes for c in v) for v in self.variants], dtype=bool)
+        sub = self.select_cases(non_empty[self.case_variants])
+
+        masks = [np.array([c in keep_codes for c in v], dtype=bool) for v in sub.variants]
+        projected: Dict[Tuple[int, ...], int] = {}
+        remap = np.array(
+            [projected.setdefault(tuple(c for c in v if c in keep_codes), len(projected))
+             for v in sub.variants],
+            dtype=np.int64,
+        )
+        pieces = [masks[v] for v in sub.case_variants.tolist()]
+        event_mask = np.concatenate(pieces) if pieces else np.empty(0, dtype=bool)
+
+        lengths = np.array([int(masks[v].sum()) for v in sub.case_variants.tolist()], dtype=np.int64)
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        event_offsets = sub.event_offsets[event_mask]
+        # Re-base offsets on the first remaining event of each case
+        first = event_offsets[offsets[:-1]] if len(lengths) else event_offsets[:0]
+        case_variants = remap[sub.case_variants]
+
+        return VariantLog(
+            activity_names=self.activity_names,
+            variants=list(projected),
+            multiplicities=np.bincount(case_variants, minlength=len(projected)),
+            case_ids=sub.case_ids,
+            case_variants=case_variants,
+            case_starts=sub.case_starts + first,
+            case_offsets=offsets,
+            event_offsets=event_offsets - np.repeat(first, lengths),
+        )
+
+    def edge_durations(self) -> Dict[Tuple[int, int], Tuple[int, float]]:
+        """
+        Aggregates directly-follows pairs over all cases.
+
+        Frequencies come from the variants and their multiplicities; total
+        durations are summed per variant over a (cases x positions) matrix of
+        event offsets, so there is no per-case Python work.
+
+        :return: A dictionary mapping (source code, target code) to
+                 (frequency, total duration in seconds).
+        """
+        edges: Dict[Tuple[int, int], Tuple[int, float]] = {}
+        order = np.argsort(self.case_variants, kind='stable')
+        bounds = np.searchsorted(self.case_variants[order], np.arange(self.n_variants + 1))
+        for v, codes in enumerate(self.variants):
+            if len(codes) < 2:
+                continue
+            cases = order[bounds[v]:bounds[v + 1]]
+            positions = self.case_offsets[cases][:, None] + np.arange(len(codes))
+            seconds = self.event_offsets[positions] / np.timedelta64(1, 's')
+            totals = np.diff(seconds, axis=1).sum(axis=0)
+            weight = int(self.multiplicities[v])
+            for pair, total in zip(zip(codes, codes[1:]), totals.tolist()):
+                frequency, duration = edges.get(pair, (0, 0.0))
+                edges[pair] = (frequency + weight, duration + total)
+        return edges
+
+    def __repr__(self) -> str:
+        return f"VariantLog(cases={self.n_cases}, variants={self.n_variants})"
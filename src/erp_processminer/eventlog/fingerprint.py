@@ -0,0 +1,185 @@
+"""
+Computes incremental fingerprints of event logs.
+
+A LogFingerprint keeps a 64-bit hash per case, computed from the case ID and
+the (activity, timestamp, selected attributes) of its events in order. The
+log digest is the sum of all case hashes modulo 2^64, so it does not depend
+on the order of the cases. When cases are appended or updated, only their
+hashes are recomputed and the digest is adjusted by the difference; two
+fingerprints can be diffed to list the cases that were added, removed or
+changed.
+"""
+
+from typing import List, Dict, Iterable, Sequence
+import numpy as np
+import pandas as pd
+
+from erp_processminer.eventlog.structures import EventLog
+from erp_processminer.eventlog.columnar import ColumnarLog
+from erp_processminer.eventlog.compressed import VariantLog
+
+_MASK = (1 << 64) - 1
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+
+def _mix(values: np.ndarray) -> np.ndarray:
+    """The splitmix64 finalizer, applied element-wise to uint64 values."""
+    values = values ^ (values >> np.uint64(30))
+    values = values * np.uint64(0xBF58476D1CE4E5B9)
+    values = values ^ (values >> np.uint64(27))
+    values = values * np.uint64(0x94D049BB133111EB)
+    return values ^ (values >> np.uint64(31))
+
+def _hash_values(values: np.ndarray) -> np.ndarray:
+    return pd.util.hash_array(np.asarray(values, dtype=object))
+
+def _hash_columns(log: EventLog, attributes: Sequence[str]) -> ColumnarLog:
+    """
+    Converts an EventLog into the columns the case hashes need, without
+    materializing the attributes that are not hashed.
+    """
+    lengths = np.fromiter((len(trace) for trace in log), dtype=np.int64, count=len(log))
+    offsets = np.zeros(len(log) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    events = [event for trace in log for event in trace.events]
+    codes: Dict[str, int] = {}
+    # Much faster than np.array for datetime objects; aware times become UTC
+    timestamps = pd.DatetimeIndex([event.timestamp for event in events])
+    if timestamps.tz is not None:
+        timestamps = timestamps.tz_convert(None)
+    columns = {}
+    for key in attributes:
+        columns[key] = np.empty(len(events), dtype=object)
+        columns[key][:] = [event.attributes.get(key) for event in events]
+    return ColumnarLog(
+        case_ids=np.array([trace.case_id for trace in log], dtype=str),
+        case_offsets=offsets,
+        activities=np.fromiter((codes.setdefault(e.activity, len(codes)) for e in events),
+                               dtype=np.int32, count=len(events)),
+        timestamps=timestamps.to_numpy(dtype='datetime64[ns]'),
+        activity_names=list(codes),
+        attributes=columns,
+    )
+
+def case_hashes(log: EventLog | ColumnarLog | VariantLog,
+                attributes: Sequence[str] = ()) -> Dict[str, int]:
+    """
+    Computes the hash of every case of a log.
+
+    :param log: The log.
+    :param attributes: Event attributes to include in the hashes.
+    :return: A dictionary mapping each case ID to its 64-bit hash.
+    """
+    if isinstance(log, VariantLog):
+        log = log.to_columnar()
+    elif isinstance(log, EventLog):
+        log = _hash_columns(log, attributes)
+    if not log.n_cases:
+        return {}
+
+    names = _hash_values(np.asarray(log.activity_names, dtype=object))
+    events = names[np.asarray(log.activities)] if len(names) else np.empty(0, dtype=np.uint64)
+    events = _mix(events ^ _mix(np.asarray(log.timestamps, dtype='datetime64[ns]')
+                                .view(np.int64).astype(np.uint64)))
+    for key in attributes:
+        column = log.attributes.get(key)
+        if column is not None:
+            events = _mix(events * _GOLDEN + _hash_values(column))
+    # Bind every event to its position in the case, so reordering is detected
+    lengths = np.diff(np.asarray(log.case_offsets))
+    positions = np.arange(log.n_events, dtype=np.uint64) \
+        - np.repeat(np.asarray(log.case_offsets[:-1], dtype=np.uint64), lengths)
+    events = _mix(events + positions * _GOLDEN)
+
+    sums = np.zeros(log.n_cases, dtype=np.uint64)
+    non_empty = lengths > 0
+    if non_empty.any():
+        sums[non_empty] = np.add.reduceat(events, np.asarray(log.case_offsets[:-1])[non_empty])
+    hashes = _mix(sums ^ _hash_values(log.case_ids))
+    return dict(zip(np.asarray(log.case_ids, dtype=str).tolist(), hashes.tolist()))
+
+class LogFingerprint:
+    """
+    An order-independent, incrementally maintained digest of an event log.
+
+    :ivar attributes: The event attributes included in the case hashes.
+    :ivar case_hashes: The 64-bit hash of every case.
+    :ivar digest: The sum of all case hashes modulo 2^64.
+    """
+
+    def __init__(self, case_hashes: Dict[str, int] | None = None, attributes: Sequence[str] = ()):
+        self.attributes = tuple(attributes)
+        self.case_hashes: Dict[str, int] = dict(case_hashes or {})
+        self.digest = sum(self.case_hashes.values()) & _MASK
+
+    @classmethod
+    def from_log(cls, log: EventLog | ColumnarLog | VariantLog,
+                 attributes: Sequence[str] = ()) -> "LogFingerprint":
+        """
+        Fingerprints a log.
+
+        :param log: The log.
+        :param attributes: Event attributes to include, in addition to
+                           activities and timestamps.
+        :return: The fingerprint.
+        """
+        return cls(case_hashes(log, attributes), attributes)
+
+    def update(self, cases: EventLog | ColumnarLog | VariantLog):
+        """
+        Adds new cases or replaces updated ones. Only these cases are hashed.
+
+        :param cases: The complete new or updated cases, e.g. the traces
+                      touched by an incremental load.
+        """
+        for case_id, value in case_hashes(cases, self.attributes).items():
+            old = self.case_hashes.get(case_id, 0)
+            self.case_hashes[case_id] = value
+            self.digest = (self.digest - old + value) & _MASK
+
+    def remove(self, case_ids: Iterable[str]):
+        """
+        Removes cases from the fingerprint.
+
+        :param case_ids: The case IDs to remove; unknown IDs are ignored.
+        """
+        for case_id in case_ids:
+            old = self.case_hashes.pop(case_id, None)
+            if old is not None:
+                self.digest = (self.digest - old) & _MASK
+
+    def diff(self, other: "LogFingerprint") -> Dict[str, List[str]]:
+        """
+        Lists the cases that differ from another fingerprint.
+
+        :param other: The newer fingerprint.
+        :return: A dictionary with the 'added', 'removed' and 'changed'
+                 case IDs, each sorted.
+        """
+        if self.attributes != other.attributes:
+            raise ValueError("Cannot diff fingerprints over different attributes.")
+        mine, theirs = self.case_hashes, other.case_hashes
+        return {
+            'added': sorted(theirs.keys() - mine.keys()),
+            'removed': sorted(mine.keys() - theirs.keys()),
+            'changed': sorted(c for c in mine.keys() & theirs.keys() if mine[c] != theirs[c]),
+        }
+
+    def changed_cases(self, other: "LogFingerprint") -> List[str]:
+        """Returns the IDs of all added, removed or changed cases, sorted."""
+        return sorted(case_id for ids in self.diff(other).values() for case_id in ids)
+
+    def hexdigest(self) -> str:
+        """The digest as 16 hexadecimal digits."""
+        return f'{self.digest:016x}'
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, LogFingerprint):
+            return NotImplemented
+        return self.attributes == other.attributes and self.digest == other.digest \
+            and len(self.case_hashes) == len(other.case_hashes)
+
+    def __len__(self) -> int:
+        return len(self.case_hashes)
+
+    def __repr__(self) -> str:
+        return f"LogFingerprint({self.hexdigest()}, cases={len(self)})"
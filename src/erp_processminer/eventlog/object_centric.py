@@ -0,0 +1,167 @@
+"""
+Defines an object-centric event log.
+
+In ERP data an event often concerns several business objects at once, e.g.
+one invoice covering five purchase orders. Flattening such data to a single
+case notion copies the event once per object. An ObjectCentricLog stores
+every event exactly once, in columnar form, and keeps the event-to-object
+relations as compressed sparse rows (CSR): the objects of event ``i`` are
+``relation_objects[relation_offsets[i]:relation_offsets[i + 1]]``. Memory
+therefore grows with events plus relations. A classic log for one object
+type is only materialized on demand, and then cached.
+"""
+
+from dataclasses import dataclass, field
+from typing import List, Dict, Any
+import numpy as np
+import pandas as pd
+
+from erp_processminer.eventlog.columnar import ColumnarLog
+
+@dataclass
+class ObjectCentricLog:
+    """
+    An object-centric event log.
+
+    :ivar activities: Integer activity code per event.
+    :ivar timestamps: Timestamp per event, as datetime64[ns].
+    :ivar activity_names: Activity name for each activity code.
+    :ivar object_ids: Identifier of each object.
+    :ivar object_types: Integer type code of each object.
+    :ivar type_names: Object type name for each type code.
+    :ivar relation_offsets: Start offset of each event's objects in
+                            `relation_objects`, plus a final entry.
+    :ivar relation_objects: Object positions related to the events.
+    :ivar attributes: Optional per-event attribute columns.
+    """
+    activities: np.ndarray
+    timestamps: np.ndarray
+    activity_names: List[str]
+    object_ids: np.ndarray
+    object_types: np.ndarray
+    type_names: List[str]
+    relation_offsets: np.ndarray
+    relation_objects: np.ndarray
+    attributes: Dict[str, np.ndarray] = field(default_factory=dict)
+    _flattened: Dict[str, ColumnarLog] = field(default_factory=dict, init=False, repr=False)
+
+    @classmethod
+    def from_dataframes(cls, events: pd.DataFrame, relations: pd.DataFrame) -> "ObjectCentricLog":
+        """
+        Builds an object-centric log from an event table and a relation table.
+
+        :param events: One row per event, with 'event_id', 'activity' and
+                       'timestamp' columns; other columns become attributes.
+        :param relations: One row per event-object relation, with
+                          'event_id', 'object_id' and 'object_type' columns.
+        :return: The object-centric log.
+        """
+        required_cols = ['event_id', 'activity', 'timestamp']
+        if not all(col in events.columns for col in required_cols):
+            raise ValueError(f"Event table must contain columns: {required_cols}")
+        relation_cols = ['event_id', 'object_id', 'object_type']
+        if not all(col in relations.columns for col in relation_cols):
+            raise ValueError(f"Relation table must contain columns: {relation_cols}")
+
+        event_index = pd.Index(events['event_id'])
+        if not event_index.is_unique:
+            raise ValueError("Event IDs must be unique.")
+        event_pos = event_index.get_indexer(relations['event_id'])
+        if (event_pos < 0).any():
+            raise ValueError("Relation table refers to unknown event IDs.")
+
+        # Objects are identified by (type, id)
+        type_codes, type_names = pd.factorize(relations['object_type'].astype(str))
+        object_keys = pd.MultiIndex.from_arrays([type_codes, relations['object_id'].astype(str)])
+        object_pos, objects = pd.factorize(object_keys)
+
+        order = np.argsort(event_pos, kind='stable')
+        lengths = np.bincount(event_pos, minlength=len(events))
+        offsets = np.zeros(len(events) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+
+        activity_codes, activity_names = pd.factorize(events['activity'])
+        return cls(
+            activities=activity_codes.astype(np.int32),
+            timestamps=pd.to_datetime(events['timestamp']).to_numpy(dtype='datetime64[ns]'),
+            activity_names=[str(a) for a in activity_names],
+            object_ids=np.asarray(objects.get_level_values(1), dtype=str),
+            object_types=np.asarray(objects.get_level_values(0), dtype=np.int32),
+            type_names=list(type_names),
+            relation_offsets=offsets,
+            relation_objects=object_pos[order].astype(np.int64),
+            attributes={
+                col: events[col].to_numpy(dtype=object)
+                for col in events.columns if col not in required_cols
+            },
+        )
+
+    @property
+    def n_events(self) -> int:
+        """The number of events."""
+        return len(self.activities)
+
+    @property
+    def n_objects(self) -> int:
+        """The number of objects."""
+        return len(self.object_ids)
+
+    @property
+    def n_relations(self) -> int:
+        """The number of event-object relations."""
+        return len(self.relation_objects)
+
+    def __len__(self) -> int:
+        return self.n_events
+
+    def event_objects(self, event: int) -> List[tuple]:
+        """Returns the (object type, object ID) pairs related to an event."""
+        objects = self.relation_objects[self.relation_offsets[event]:self.relation_offsets[event + 1]]
+        return [(self.type_names[self.object_types[o]], self.object_ids[o]) for o in objects.tolist()]
+
+    def relation_events(self) -> np.ndarray:
+        """Returns the event position of every relation."""
+        return np.repeat(np.arange(self.n_events), np.diff(self.relation_offsets))
+
+    def flatten(self, object_type: str) -> ColumnarLog:
+        """
+        Returns the classic log for one object type: one case per object of
+        that type, holding the events related to it. The result is built on
+        first use and cached.
+
+        :param object_type: The object type to use as case notion.
+        :return: The flattened columnar log.
+        """
+        if object_type in self._flattened:
+            return self._flattened[object_type]
+        if object_type not in self.type_names:
+            raise ValueError(f"Unknown object type '{object_type}'. Available: {self.type_names}")
+        type_code = self.type_names.index(object_type)
+
+        events = self.relation_events()
+        objects = self.relation_objects
+        keep = self.object_types[objects] == type_code
+        events, objects = events[keep], objects[keep]
+
+        # Cases follow object order; events within a case follow time
+        cases, case_codes = np.unique(objects, return_inverse=True)
+        order = np.lexsort((self.timestamps[events], case_codes))
+        events = events[order]
+        lengths = np.bincount(case_codes, minlength=len(cases))
+        offsets = np.zeros(len(cases) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+
+        log = ColumnarLog(
+            case_ids=self.object_ids[cases],
+            case_offsets=offsets,
+            activities=self.activities[events],
+            timestamps=self.timestamps[events],
+            activity_names=list(self.activity_names),
+            attributes={key: column[events] for key, column in self.attributes.items()},
+        )
+        self._flattened[object_type] = log
+        return log
+
+    def __repr__(self) -> str:
+        return (f"ObjectCentricLog(events={self.n_events}, objects={self.n_objects}, "
+                f"relations={self.n_relations}, types={self.type_names})")
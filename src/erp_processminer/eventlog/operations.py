@@ -3,10 +3,15 @@ Provides functions for common operations on EventLog objects, such as
 filtering, subsetting, and merging.
 """
 
-from typing import List, Callable
+import heapq
+import itertools
+from pathlib import Path
+from typing import List, Dict, Tuple, Iterable, Iterator, Callable
 from datetime import datetime
+import numpy as np
 
 from erp_processminer.eventlog.structures import EventLog, Trace, Event
+from erp_processminer.eventlog.columnar import ColumnarLog
 
 def filter_log_by_activities(log: EventLog, activities: List[str]) -> EventLog:
     """
@@ -21,8 +26,8 @@ def filter_log_by_activities(log: EventLog, activities: List[str]) -> EventLog:
     for trace in log:
         filtered_events = [e for e in trace.events if e.activity in activities]
         if filtered_events:
-            new_traces.append(Trace(case_id=trace.case_id, events=filtered_events))
-    return EventLog(new_traces)
+            new_traces.append(Trace.presorted(trace.case_id, filtered_events, trace.attributes))
+    return EventLog(new_traces, vocabulary=log.vocabulary)
 
 def filter_log_by_timestamp(
     log: EventLog, 
@@ -43,8 +48,8 @@ def filter_log_by_timestamp(
                          (start_time is None or e.timestamp >= start_time) and 
                          (end_time is None or e.timestamp <= end_time)]
         if filtered_events:
-            new_traces.append(Trace(case_id=trace.case_id, events=filtered_events))
-    return EventLog(new_traces)
+            new_traces.append(Trace.presorted(trace.case_id, filtered_events, trace.attributes))
+    return EventLog(new_traces, vocabulary=log.vocabulary)
 
 def filter_log_by_attribute(log: EventLog, attr_key: str, attr_values: List) -> EventLog:
     """
@@ -62,27 +67,236 @@ def filter_log_by_attribute(log: EventLog, attr_key: str, attr_values: List) ->
             if e.attributes.get(attr_key) in attr_values
         ]
         if filtered_events:
-            new_traces.append(Trace(case_id=trace.case_id, events=filtered_events))
-    return EventLog(new_traces)
+            new_traces.append(Trace.presorted(trace.case_id, filtered_events, trace.attributes))
+    return EventLog(new_traces, vocabulary=log.vocabulary)
+
+def filter_log_by_event_mask(log: EventLog, mask: np.ndarray) -> EventLog:
+    """
+    Filters an event log with a boolean mask over its events, in the order
+    obtained by concatenating the traces (the order of a ColumnarLog).
+    Traces whose events are all kept are reused rather than copied.
+
+    :param log: The event log to filter.
+    :param mask: A boolean array with one entry per event.
+    :return: A new, filtered EventLog.
+    """
+    new_traces = []
+    start = 0
+    for trace in log:
+        keep = mask[start:start + len(trace.events)]
+        start += len(trace.events)
+        if keep.all():
+            if trace.events:
+                new_traces.append(trace)
+        elif keep.any():
+            new_traces.append(Trace.presorted(
+                trace.case_id,
+                [e for e, k in zip(trace.events, keep.tolist()) if k],
+                trace.attributes,
+            ))
+    return EventLog(new_traces, vocabulary=log.vocabulary)
+
+def _event_key(event: Event) -> tuple:
+    """Returns a hashable identity for an event (activity, time, attributes)."""
+    try:
+        attributes = frozenset(event.attributes.items())
+    except TypeError:
+        attributes = repr(sorted(event.attributes.items(), key=lambda item: item[0]))
+    return (event.activity, event.timestamp, attributes)
+
+def _merge_events(event_lists: List[List[Event]], deduplicate: bool) -> List[Event]:
+    """
+    Merges timestamp-sorted event lists with a heap-based k-way merge.
+    Ties keep the order of the inputs. Identical events share a timestamp,
+    so duplicates are detected among the events of the current timestamp.
+    """
+    merged = heapq.merge(*event_lists, key=lambda e: e.timestamp)
+    if not deduplicate:
+        return list(merged)
+    events: List[Event] = []
+    seen: set = set()
+    current = None
+    for event in merged:
+        if event.timestamp != current:
+            current = event.timestamp
+            seen = set()
+        key = _event_key(event)
+        if key not in seen:
+            seen.add(key)
+            events.append(event)
+    return events
+
+def merge_event_logs(logs: Iterable[EventLog], deduplicate: bool = True) -> EventLog:
+    """
+    Merges any number of event logs. Events of a case ID present in several
+    logs are combined into one trace by a k-way merge of the (already
+    sorted) source traces. The inputs are never modified; a case found in
+    only one log keeps its original Trace object.
+
+    :param logs: The event logs to merge.
+    :param deduplicate: Whether to drop events of a merged case that are
+                        identical (same activity, timestamp and attributes)
+                        to an earlier one.
+    :return: A new, merged EventLog, with cases in order of first appearance.
+    """
+    sources: Dict[str, List[Trace]] = {}
+    for log in logs:
+        for trace in log:
+            sources.setdefault(trace.case_id, []).append(trace)
+
+    traces = []
+    for case_id, case_traces in sources.items():
+        if len(case_traces) == 1:
+            traces.append(case_traces[0])
+        else:
+            events = _merge_events([t.events for t in case_traces], deduplicate)
+            # Case attributes from earlier logs take precedence
+            attributes = {}
+            for trace in reversed(case_traces):
+                attributes.update(trace.attributes)
+            traces.append(Trace.presorted(case_id, events, attributes))
+    return EventLog(traces)
 
 def merge_logs(log1: EventLog, log2: EventLog) -> EventLog:
     """
     Merges two event logs. If a case ID exists in both logs, the events
-    are combined into a single trace.
+    are combined into a single trace. Neither input is modified.
 
     :param log1: The first event log.
     :param log2: The second event log.
     :return: A new, merged EventLog.
     """
-    traces_map: dict[str, Trace] = {t.case_id: t for t in log1.traces}
+    return merge_event_logs([log1, log2], deduplicate=False)
 
-    for trace in log2:
-        if trace.case_id in traces_map:
-            # Merge events and re-sort
-            existing_trace = traces_map[trace.case_id]
-            existing_trace.events.extend(trace.events)
-            existing_trace.events.sort(key=lambda e: e.timestamp)
-        else:
-            traces_map[trace.case_id] = trace
-    
-    return EventLog(list(traces_map.values()))
\ No newline at end of file
+def _columnar_case_stream(source: int, log: ColumnarLog) -> Iterator[Tuple[str, int, int]]:
+    """Yields (case ID, source, case position) in case ID order."""
+    case_ids = np.asarray(log.case_ids).astype(str)
+    for position in np.argsort(case_ids, kind='stable').tolist():
+        yield case_ids[position], source, position
+
+def _merge_case_parts(
+    logs: List[ColumnarLog],
+    parts: List[Tuple[int, np.ndarray]],
+    keys: List[str],
+    deduplicate: bool,
+) -> List[Tuple[int, np.ndarray]]:
+    """
+    Merges the events of one case coming from several columnar logs.
+
+    :return: Runs of (source, event positions) in merged order.
+    """
+    sources = np.concatenate([np.full(len(events), source) for source, events in parts])
+    positions = np.concatenate([events for _, events in parts])
+    stamps = np.concatenate([
+        np.asarray(logs[source].timestamps[events], dtype='datetime64[ns]') for source, events in parts
+    ])
+    order = np.argsort(stamps, kind='stable')
+    sources, positions, stamps = sources[order], positions[order], stamps[order]
+
+    if deduplicate:
+        keep = np.ones(len(order), dtype=bool)
+        seen = set()
+        for i, (source, position) in enumerate(zip(sources.tolist(), positions.tolist())):
+            log = logs[source]
+            key = (
+                log.activity_names[int(log.activities[position])],
+                int(stamps[i].view(np.int64)),
+                tuple(log.attributes[k][position] if k in log.attributes else None for k in keys),
+            )
+            try:
+                duplicate = key in seen
+                seen.add(key)
+            except TypeError:
+                duplicate = False
+            keep[i] = not duplicate
+        sources, positions = sources[keep], positions[keep]
+
+    bounds = np.flatnonzero(np.r_[True, sources[1:] != sources[:-1], True])
+    return [(int(sources[a]), positions[a:b]) for a, b in zip(bounds[:-1], bounds[1:])]
+
+def merge_columnar_logs(
+    logs: Iterable[ColumnarLog | str | Path],
+    deduplicate: bool = True,
+    output: str | Path | None = None,
+) -> ColumnarLog:
+    """
+    Merges any number of columnar logs, given in memory or as directories
+    written by :meth:`ColumnarLog.save` (which are memory-mapped, so only
+    the cases being merged are read at a time).
+
+    The cases of all inputs are streamed in case ID order through a
+    heap-based k-way merge; the events of a case found in several inputs are
+    merged by timestamp, ties keeping the order of the inputs. The inputs
+    are never modified.
+
+    :param logs: The columnar logs or paths of saved columnar logs.
+    :param deduplicate: Whether to drop events of a merged case that are
+                        identical (same activity, timestamp and attributes)
+                        to an earlier one.
+    :param output: If given, the merged log is also saved to this directory.
+    :return: The merged ColumnarLog, with cases sorted by case ID.
+    """
+    logs = [ColumnarLog.load(log) if isinstance(log, (str, Path)) else log for log in logs]
+
+    codes: Dict[str, int] = {}
+    remaps = []
+    for log in logs:
+        remaps.append(np.array(
+            [codes.setdefault(a, len(codes)) for a in log.activity_names] or [0], dtype=np.int32
+        ))
+    activity_names = list(codes)
+    keys = list(dict.fromkeys(key for log in logs for key in log.attributes))
+
+    case_ids: List[str] = []
+    case_sources: List[Tuple[int, int]] = []
+    lengths: List[int] = []
+    pieces: List[Tuple[int, np.ndarray]] = []
+    streams = [_columnar_case_stream(i, log) for i, log in enumerate(logs)]
+    merged = heapq.merge(*streams, key=lambda item: item[0])
+    for case_id, group in itertools.groupby(merged, key=lambda item: item[0]):
+        parts = []
+        for _, source, position in group:
+            if not parts:
+                case_sources.append((source, position))
+            offsets = logs[source].case_offsets
+            parts.append((source, np.arange(offsets[position], offsets[position + 1])))
+        if len(parts) > 1:
+            parts = _merge_case_parts(logs, parts, keys, deduplicate)
+        case_ids.append(case_id)
+        lengths.append(sum(len(events) for _, events in parts))
+        pieces.extend(parts)
+
+    case_offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=case_offsets[1:])
+    activities = [remaps[source][np.asarray(logs[source].activities[events])]
+                  for source, events in pieces]
+    timestamps = [np.asarray(logs[source].timestamps[events], dtype='datetime64[ns]')
+                  for source, events in pieces]
+    attributes = {}
+    for key in keys:
+        attributes[key] = np.concatenate([
+            logs[source].attributes[key][events] if key in logs[source].attributes
+            else np.full(len(events), None, dtype=object)
+            for source, events in pieces
+        ]) if pieces else np.empty(0, dtype=object)
+    # Case attributes are taken from the first input containing the case
+    case_attributes = {}
+    for key in dict.fromkeys(key for log in logs for key in log.case_attributes):
+        column = np.full(len(case_ids), None, dtype=object)
+        for i, (source, position) in enumerate(case_sources):
+            if key in logs[source].case_attributes:
+                column[i] = logs[source].case_attributes[key][position]
+        case_attributes[key] = column
+
+    result = ColumnarLog(
+        case_ids=np.array(case_ids, dtype=str),
+        case_offsets=case_offsets,
+        activities=np.concatenate(activities) if pieces else np.empty(0, dtype=np.int32),
+        timestamps=np.concatenate(timestamps) if pieces else np.empty(0, dtype='datetime64[ns]'),
+        activity_names=activity_names,
+        attributes=attributes,
+        case_attributes=case_attributes,
+    )
+    if output is not None:
+        result.save(output)
+    return result
@@ -0,0 +1,221 @@
+"""
+Defines a partitioned, on-disk event log dataset.
+
+Logs spanning several years do not fit into memory as a whole. A
+PartitionedLog splits the cases over a fixed number of partitions by a hash
+of their case ID, so every case lives in exactly one partition and
+per-partition results can be combined without looking at other partitions.
+Each partition is a :class:`ColumnarLog` saved in the binary ``.npy`` format
+(and memory-mapped when loaded). A ``manifest.json`` file records per
+partition the number of cases and events, the time range and the set of
+activities, which lets callers skip partitions that cannot contain relevant
+events before loading anything.
+
+Directory layout::
+
+    dataset/
+        manifest.json
+        part-00000/   (a saved ColumnarLog)
+        part-00001/
+        ...
+"""
+
+import json
+from pathlib import Path
+from typing import List, Dict, Any, Iterable, Iterator
+import numpy as np
+import pandas as pd
+
+from erp_processminer.eventlog.structures import EventLog
+from erp_processminer.eventlog.columnar import ColumnarLog
+
+MANIFEST = 'manifest.json'
+
+def case_partitions(case_ids: np.ndarray, n_partitions: int) -> np.ndarray:
+    """
+    Assigns case IDs to partitions by a stable 64-bit hash, which does not
+    depend on the process or Python's hash seed.
+
+    :param case_ids: The case IDs.
+    :param n_partitions: The number of partitions.
+    :return: The partition number of every case ID.
+    """
+    hashes = pd.util.hash_array(np.asarray(case_ids, dtype=object))
+    return (hashes % np.uint64(n_partitions)).astype(np.int64)
+
+def _partition_stats(log: ColumnarLog) -> Dict[str, Any]:
+    """Computes the manifest entry of a partition."""
+    present = np.unique(np.asarray(log.activities)).tolist() if log.n_events else []
+    timestamps = np.asarray(log.timestamps)
+    return {
+        'n_cases': log.n_cases,
+        'n_events': log.n_events,
+        'start': pd.Timestamp(timestamps.min()).isoformat() if log.n_events else None,
+        'end': pd.Timestamp(timestamps.max()).isoformat() if log.n_events else None,
+        'activities': sorted(log.activity_names[code] for code in present),
+    }
+
+class PartitionedLog:
+    """
+    A case-hash partitioned event log stored in a directory.
+
+    :ivar directory: The dataset directory.
+    :ivar n_partitions: The number of partitions.
+    :ivar partitions: The manifest entry of every partition, with 'name',
+                      'n_cases', 'n_events', 'start', 'end' and 'activities'.
+    """
+
+    def __init__(self, directory: str | Path, n_partitions: int, partitions: List[Dict[str, Any]]):
+        self.directory = Path(directory)
+        self.n_partitions = n_partitions
+        self.partitions = partitions
+
+    @classmethod
+    def write(cls, log: EventLog | ColumnarLog, directory: str | Path,
+              n_partitions: int = 16) -> "PartitionedLog":
+        """
+        Writes a log as a new partitioned dataset, replacing any dataset in
+        the directory. Larger logs can be written chunk by chunk by writing
+        the first chunk and appending the others with :meth:`append`.
+
+        :param log: The log to write.
+        :param directory: The dataset directory (created if missing).
+        :param n_partitions: The number of partitions.
+        :return: The dataset.
+        """
+        if n_partitions < 1:
+            raise ValueError("n_partitions must be at least 1.")
+        columnar = log if isinstance(log, ColumnarLog) else ColumnarLog.from_event_log(log)
+        dataset = cls(directory, n_partitions,
+                      [{'name': f'part-{i:05d}'} for i in range(n_partitions)])
+        dataset.directory.mkdir(parents=True, exist_ok=True)
+        parts = case_partitions(columnar.case_ids, n_partitions)
+        for i in range(n_partitions):
+            dataset._write_partition(i, columnar.select_cases(np.flatnonzero(parts == i)))
+        dataset._write_manifest()
+        return dataset
+
+    @classmethod
+    def open(cls, directory: str | Path) -> "PartitionedLog":
+        """
+        Opens an existing dataset.
+
+        :param directory: The dataset directory.
+        :return: The dataset.
+        """
+        directory = Path(directory)
+        manifest_path = directory / MANIFEST
+        if not manifest_path.exists():
+            raise ValueError(f"No partitioned log found in '{directory}'.")
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        return cls(directory, manifest['n_partitions'], manifest['partitions'])
+
+    def _write_partition(self, partition: int, log: ColumnarLog):
+        entry = self.partitions[partition]
+        log.save(self.directory / entry['name'])
+        entry.update(_partition_stats(log))
+
+    def _write_manifest(self):
+        manifest = {'n_partitions': self.n_partitions, 'partitions': self.partitions}
+        with open(self.directory / MANIFEST, 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+    @property
+    def n_cases(self) -> int:
+        """The number of cases, from the manifest."""
+        return sum(entry['n_cases'] for entry in self.partitions)
+
+    @property
+    def n_events(self) -> int:
+        """The number of events, from the manifest."""
+        return sum(entry['n_events'] for entry in self.partitions)
+
+    def __len__(self) -> int:
+        return self.n_cases
+
+    def select(self, start: Any = None, end: Any = None,
+               activities: Iterable[str] | None = None) -> List[int]:
+        """
+        Prunes partitions using the manifest. Empty partitions are always
+        skipped. Pruning works on whole partitions: the kept partitions may
+        still contain events outside the given range.
+
+        :param start: Skip partitions whose events all lie before this time.
+        :param end: Skip partitions whose events all lie after this time.
+        :param activities: Skip partitions containing none of these activities.
+        :return: The numbers of the partitions that may contain matches.
+        """
+        start = None if start is None else pd.Timestamp(start)
+        end = None if end is None else pd.Timestamp(end)
+        wanted = None if activities is None else set(activities)
+        selected = []
+        for i, entry in enumerate(self.partitions):
+            if entry['n_events'] == 0:
+                continue
+            if start is not None and pd.Timestamp(entry['end']) < start:
+                continue
+            if end is not None and pd.Timestamp(entry['start']) > end:
+                continue
+            if wanted is not None and wanted.isdisjoint(entry['activities']):
+                continue
+            selected.append(i)
+        return selected
+
+    def partition_path(self, partition: int) -> Path:
+        """Returns the directory of a partition."""
+        return self.directory / self.partitions[partition]['name']
+
+    def load_partition(self, partition: int, mmap: bool = True) -> ColumnarLog:
+        """
+        Loads one partition.
+
+        :param partition: The partition number.
+        :param mmap: Whether to memory-map the numeric arrays.
+        :return: The partition's cases as a columnar log.
+        """
+        return ColumnarLog.load(self.partition_path(partition), mmap=mmap)
+
+    def iter_partitions(self, partitions: Iterable[int] | None = None,
+                        mmap: bool = True) -> Iterator[ColumnarLog]:
+        """
+        Loads partitions one at a time.
+
+        :param partitions: The partitions to load; by default all non-empty ones.
+        :param mmap: Whether to memory-map the numeric arrays.
+        :return: An iterator over the partitions.
+        """
+        for partition in self.select() if partitions is None else partitions:
+            yield self.load_partition(partition, mmap=mmap)
+
+    def append(self, events: EventLog | ColumnarLog) -> List[int]:
+        """
+        Appends new events. Only the partitions receiving events are
+        rewritten, and within them only the affected cases are re-sorted.
+
+        :param events: The new events.
+        :return: The numbers of the rewritten partitions.
+        """
+        from erp_processminer.io_erp.incremental import _append_columnar
+
+        delta = events if isinstance(events, ColumnarLog) else ColumnarLog.from_event_log(events)
+        parts = case_partitions(delta.case_ids, self.n_partitions)
+        touched = np.unique(parts).tolist()
+        for partition in touched:
+            part_delta = delta.select_cases(np.flatnonzero(parts == partition))
+            existing = self.load_partition(partition, mmap=False)
+            self._write_partition(partition, _append_columnar(existing, part_delta))
+        self._write_manifest()
+        return touched
+
+    def to_columnar(self) -> ColumnarLog:
+        """
+        Loads the whole dataset into one columnar log (partition by
+        partition; only for logs that fit into memory).
+        """
+        from erp_processminer.eventlog.operations import merge_columnar_logs
+        return merge_columnar_logs(list(self.iter_partitions(mmap=False)), deduplicate=False)
+
+    def __repr__(self) -> str:
+        return (f"PartitionedLog(partitions={self.n_partitions}, "
+                f"cases={self.n_cases}, events={self.n_events})")
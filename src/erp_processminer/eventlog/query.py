@@ -0,0 +1,238 @@
+"""
+Provides a lazy query builder that fuses chained filters into a single pass.
+
+Calling the functions in :mod:`erp_processminer.filters` one after another
+copies the whole log at every step. A :class:`LogQuery` only records the
+steps; when it is materialized, each trace runs through all steps at once and
+a new Trace is built only if its events actually changed. On a ColumnarLog the
+steps are evaluated as boolean masks over the event arrays instead.
+
+Example::
+
+    fast_receipts = (
+        log.query()
+        .activities({'Create PO', 'Receive Goods'})
+        .attribute('plant', {'P100'})
+        .cycle_time(max_duration=7 * 86400)
+        .collect()
+    )
+"""
+
+from datetime import datetime
+from typing import List, Tuple, Callable, Any, Iterable
+import numpy as np
+import pandas as pd
+
+from erp_processminer.eventlog.structures import EventLog, Trace, Event
+from erp_processminer.eventlog.columnar import ColumnarLog
+
+class LogQuery:
+    """
+    A recorded sequence of filter steps over an EventLog or ColumnarLog.
+
+    Event-level steps (activities, attribute, timestamp, where_event) drop
+    events; trace-level steps (cycle_time, where) drop whole traces based on
+    the events remaining at that point. Steps apply in the order they were
+    added, exactly as if the corresponding filter functions were chained,
+    and traces left without events are removed.
+    """
+
+    def __init__(self, log: EventLog | ColumnarLog):
+        self._log = log
+        self._steps: List[Tuple[str, str, Tuple]] = []
+
+    def _add(self, level: str, kind: str, *args) -> "LogQuery":
+        query = LogQuery(self._log)
+        query._steps = self._steps + [(level, kind, args)]
+        return query
+
+    def activities(self, activities: Iterable[str]) -> "LogQuery":
+        """Keeps only events whose activity is in `activities`."""
+        return self._add('event', 'activities', frozenset(activities))
+
+    def attribute(self, key: str, values: Iterable[Any]) -> "LogQuery":
+        """Keeps only events whose attribute `key` takes one of `values`."""
+        return self._add('event', 'attribute', key, frozenset(values))
+
+    def timestamp(
+        self, start_time: datetime | None = None, end_time: datetime | None = None
+    ) -> "LogQuery":
+        """Keeps only events within the (inclusive) time window."""
+        return self._add('event', 'timestamp', start_time, end_time)
+
+    def where_event(self, predicate: Callable[[Event], bool]) -> "LogQuery":
+        """Keeps only events for which `predicate` returns True."""
+        return self._add('event', 'where_event', predicate)
+
+    def cycle_time(
+        self, min_duration: float | None = None, max_duration: float | None = None
+    ) -> "LogQuery":
+        """Keeps only traces whose cycle time (in seconds) is within range."""
+        return self._add('trace', 'cycle_time', min_duration, max_duration)
+
+    def where(self, predicate: Callable[[Trace], bool]) -> "LogQuery":
+        """Keeps only traces for which `predicate` returns True."""
+        return self._add('trace', 'where', predicate)
+
+    # --- Object-mode execution ---
+
+    def _event_predicate(self, kind: str, args: Tuple) -> Callable[[Event], bool]:
+        if kind == 'activities':
+            (keep,) = args
+            return lambda e: e.activity in keep
+        if kind == 'attribute':
+            key, values = args
+            return lambda e: e.attributes.get(key) in values
+        if kind == 'timestamp':
+            start, end = args
+            return lambda e: (start is None or e.timestamp >= start) and \
+                             (end is None or e.timestamp <= end)
+        return args[0]
+
+    def _run_trace(self, trace: Trace, steps) -> List[Event] | None:
+        """Runs all steps on one trace; returns its remaining events or None."""
+        events = trace.events
+        for level, kind, test in steps:
+            if level == 'event':
+                events = [e for e in events if test(e)]
+            elif kind == 'cycle_time':
+                if not events:
+                    return None
+                low, high = test
+                duration = (events[-1].timestamp - events[0].timestamp).total_seconds()
+                if (low is not None and duration < low) or (high is not None and duration > high):
+                    return None
+            else:
+                view = trace if events is trace.events else Trace.presorted(trace.case_id, events, trace.attributes)
+                if not test(view):
+                    return None
+            if not events:
+                return None
+        return events
+
+    def _compiled_steps(self):
+        return [
+            (level, kind, self._event_predicate(kind, args) if level == 'event'
+             else args if kind == 'cycle_time' else args[0])
+            for level, kind, args in self._steps
+        ]
+
+    def indices(self) -> List[Tuple[int, List[int] | None]]:
+        """
+        Evaluates the query without building any traces.
+
+        :return: For every kept trace, its position in the source log and the
+                 positions of its kept events (None if all events are kept).
+        """
+        if isinstance(self._log, ColumnarLog):
+            raise ValueError("Use mask() to evaluate a query over a ColumnarLog.")
+        steps = self._compiled_steps()
+        result = []
+        for i, trace in enumerate(self._log):
+            events = self._run_trace(trace, steps)
+            if events is None:
+                continue
+            if len(events) == len(trace.events):
+                result.append((i, None))
+            else:
+                kept = {id(e) for e in events}
+                result.append((i, [j for j, e in enumerate(trace.events) if id(e) in kept]))
+        return result
+
+    def collect(self) -> EventLog | ColumnarLog:
+        """
+        Materializes the query in a single pass over the log.
+
+        Traces whose events are all kept are reused as they are rather than
+        copied. For a ColumnarLog, the result is built from a single event
+        mask.
+
+        :return: A filtered log of the same type as the source.
+        """
+        if isinstance(self._log, ColumnarLog):
+            return self._log.select_events(self.mask())
+
+        steps = self._compiled_steps()
+        traces = []
+        for trace in self._log:
+            events = self._run_trace(trace, steps)
+            if events is None:
+                continue
+            if len(events) == len(trace.events):
+                traces.append(trace)
+            else:
+                traces.append(Trace.presorted(trace.case_id, events, trace.attributes))
+        return EventLog(traces, vocabulary=self._log.vocabulary)
+
+    def count(self) -> int:
+        """Returns the number of traces the query keeps."""
+        if isinstance(self._log, ColumnarLog):
+            log = self._log
+            mask = self.mask()
+            return int(np.count_nonzero(np.bincount(log.case_index()[mask], minlength=log.n_cases)))
+        return len(self.indices())
+
+    # --- Columnar execution ---
+
+    def mask(self) -> np.ndarray:
+        """
+        Evaluates the query over a ColumnarLog as a boolean event mask.
+        Custom predicates (where, where_event) are not supported here.
+
+        :return: A boolean array over the events of the source log.
+        """
+        log = self._log
+        if not isinstance(log, ColumnarLog):
+            raise ValueError("mask() requires a ColumnarLog; use indices() or collect().")
+
+        mask = np.ones(log.n_events, dtype=bool)
+        case_index = None
+        for level, kind, args in self._steps:
+            if kind == 'activities':
+                (keep,) = args
+                codes = [i for i, a in enumerate(log.activity_names) if a in keep]
+                mask &= np.isin(log.activities, codes)
+            elif kind == 'attribute':
+                key, values = args
+                column = log.attributes.get(key)
+                if column is None:
+                    mask[:] = False
+                else:
+                    mask &= pd.Series(column).isin(list(values)).to_numpy()
+            elif kind == 'timestamp':
+                start, end = args
+                if start is not None:
+                    mask &= log.timestamps >= np.datetime64(pd.Timestamp(start))
+                if end is not None:
+                    mask &= log.timestamps <= np.datetime64(pd.Timestamp(end))
+            elif kind == 'cycle_time':
+                if case_index is None:
+                    case_index = log.case_index()
+                mask &= self._cycle_time_mask(log, mask, case_index, *args)[case_index]
+            else:
+                raise ValueError(f"Step '{kind}' cannot be evaluated on a ColumnarLog.")
+        return mask
+
+    @staticmethod
+    def _cycle_time_mask(log: ColumnarLog, mask: np.ndarray, case_index: np.ndarray,
+                         low: float | None, high: float | None) -> np.ndarray:
+        """Per-case keep flags for a cycle-time step over the masked events."""
+        kept = np.flatnonzero(mask)
+        cases = case_index[kept]
+        keep = np.zeros(log.n_cases, dtype=bool)
+        if not kept.size:
+            return keep
+        starts = np.flatnonzero(np.r_[True, cases[1:] != cases[:-1]])
+        ends = np.r_[starts[1:] - 1, kept.size - 1]
+        durations = (log.timestamps[kept[ends]] - log.timestamps[kept[starts]]) / np.timedelta64(1, 's')
+        ok = np.ones(starts.size, dtype=bool)
+        if low is not None:
+            ok &= durations >= low
+        if high is not None:
+            ok &= durations <= high
+        keep[cases[starts]] = ok
+        return keep
+
+    def __repr__(self) -> str:
+        steps = " -> ".join(kind for _, kind, _ in self._steps) or "all"
+        return f"LogQuery({steps})"
@@ -4,13 +4,60 @@ like CSV.
 """
 
 from pathlib import Path
+from typing import List, Dict, Any
+import numpy as np
 import pandas as pd
 
-from erp_processminer.eventlog.structures import EventLog, Event, Trace
+from erp_processminer.eventlog.structures import (
+    EventLog, Event, Trace, EMPTY_ATTRIBUTES, _SharedAttributes
+)
+from erp_processminer.eventlog.vocabulary import LogVocabulary
+
+def shared_attribute_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """
+    Converts the rows of a DataFrame into attribute dictionaries, creating
+    one dictionary per distinct row and sharing it among all equal rows
+    (dictionary encoding). Shared dictionaries are read-only.
+
+    :param df: The attribute columns.
+    :return: One attribute dictionary per row.
+    """
+    if df.shape[1] == 0:
+        return [EMPTY_ATTRIBUTES] * len(df)
+    try:
+        codes = df.groupby(list(df.columns), dropna=False, sort=False).ngroup().to_numpy()
+    except TypeError:
+        # Unhashable values cannot be encoded
+        return df.to_dict('records')
+    uniques, first = np.unique(codes, return_index=True)
+    records = df.iloc[first].to_dict('records')
+    lookup = np.empty(len(uniques), dtype=object)
+    lookup[uniques] = [_SharedAttributes(record) for record in records]
+    return lookup[codes].tolist()
+
+def case_attribute_table(df: pd.DataFrame, columns: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Extracts case-level attributes: for every case, the first non-missing
+    value of each of `columns`.
+
+    :param df: Rows with a 'case_id' column.
+    :param columns: The case-level attribute columns (missing ones are skipped).
+    :return: A dictionary mapping case IDs to their attributes.
+    """
+    columns = [col for col in columns if col in df.columns]
+    if not columns:
+        return {}
+    table = df[['case_id', *columns]].groupby('case_id', sort=False).first()
+    return {
+        case_id: {k: v for k, v in values.items() if not pd.isna(v)}
+        for case_id, values in table.to_dict('index').items()
+    }
 
 def log_to_dataframe(log: EventLog) -> pd.DataFrame:
     """
     Converts an EventLog object to a pandas DataFrame.
+    Case-level attributes are expanded onto the events of their case, unless
+    an event attribute of the same name exists.
 
     :param log: The event log to convert.
     :return: A pandas DataFrame representation of the log.
@@ -26,14 +73,23 @@ def log_to_dataframe(log: EventLog) -> pd.DataFrame:
                 **event.attributes
             }
             records.append(record)
-    return pd.DataFrame(records)
+    df = pd.DataFrame(records)
+
+    if any(trace.attributes for trace in log):
+        cases = pd.DataFrame([trace.attributes for trace in log])
+        cases = cases[[col for col in cases.columns if col not in df.columns]]
+        positions = np.repeat(np.arange(len(log)), [len(trace) for trace in log])
+        df = pd.concat([df, cases.iloc[positions].reset_index(drop=True)], axis=1)
+    return df
 
-def dataframe_to_log(df: pd.DataFrame) -> EventLog:
+def dataframe_to_log(df: pd.DataFrame, case_attributes: List[str] | None = None) -> EventLog:
     """
     Converts a pandas DataFrame into an EventLog object.
     The DataFrame must contain 'case_id', 'activity', and 'timestamp' columns.
 
     :param df: The DataFrame to convert.
+    :param case_attributes: Columns holding case-level data; they are stored
+                            once per trace instead of on every event.
     :return: An EventLog object.
     """
     required_cols = ['case_id', 'activity', 'timestamp']
@@ -43,29 +99,38 @@ def dataframe_to_log(df: pd.DataFrame) -> EventLog:
     # Convert to datetime if not already
     df['timestamp'] = pd.to_datetime(df['timestamp'])
 
-    traces_map = {}
-    for _, row in df.iterrows():
-        case_id = row['case_id']
-        
-        # Collect other columns as attributes
-        attributes = row.drop(required_cols).to_dict()
+    case_cols = [col for col in case_attributes or [] if col in df.columns]
+    cases = case_attribute_table(df, case_cols)
+    # Collect other columns as attributes, interning activities and strings
+    vocabulary = LogVocabulary()
+    attributes = shared_attribute_records(
+        vocabulary.intern_frame(df.drop(columns=required_cols + case_cols))
+    )
+    activities = vocabulary.activities.intern_values(df['activity'])
 
-        event = Event(
+    # Order rows by case (in order of first appearance), then by timestamp,
+    # so traces can be built without sorting each one
+    case_codes, _ = pd.factorize(df['case_id'])
+    stamps = df['timestamp'].to_numpy(dtype='datetime64[ns]')
+    order = np.lexsort((stamps, case_codes)).tolist()
+    case_ids = df['case_id'].tolist()
+    timestamps = list(df['timestamp'])
+
+    traces = []
+    current = None
+    for i in order:
+        case_id = case_ids[i]
+        if current is None or case_id != current.case_id:
+            current = Trace.presorted(case_id, [], cases.get(case_id, EMPTY_ATTRIBUTES))
+            traces.append(current)
+        current.events.append(Event(
             case_id=case_id,
-            activity=row['activity'],
-            timestamp=row['timestamp'],
-            attributes=attributes,
-        )
-
-        if case_id not in traces_map:
-            traces_map[case_id] = Trace(case_id=case_id, events=[])
-        traces_map[case_id].events.append(event)
-
-    # Sort events within each trace
-    for trace in traces_map.values():
-        trace.events.sort(key=lambda e: e.timestamp)
-        
-    return EventLog(list(traces_map.values()))
+            activity=activities[i],
+            timestamp=timestamps[i],
+            attributes=attributes[i],
+        ))
+
+    return EventLog(traces, vocabulary=vocabulary)
 
 def export_log_to_csv(log: EventLog, file_path: str | Path):
     """
@@ -0,0 +1,127 @@
+"""
+Shares a columnar log with worker processes through shared memory.
+
+Sending an EventLog to a process pool pickles every Event object, which
+often costs more than the work done in the worker. Instead, the publishing
+process copies the arrays of a :class:`ColumnarLog` once into
+``multiprocessing.shared_memory`` blocks and passes workers a small,
+picklable :class:`SharedLogHandle`. :func:`attach` turns the handle back
+into a ColumnarLog whose arrays are read-only views on the shared blocks,
+without copying.
+
+Object-valued attribute columns cannot live in shared memory; they are only
+shared (by pickling them into the handle) when requested.
+"""
+
+from dataclasses import dataclass, field
+from multiprocessing.shared_memory import SharedMemory
+from typing import List, Dict, Tuple
+import numpy as np
+
+from erp_processminer.eventlog.columnar import ColumnarLog
+
+_ARRAYS = ('case_ids', 'case_offsets', 'activities', 'timestamps')
+
+# Blocks attached by this process, kept open while views on them exist
+_attached: Dict[str, SharedMemory] = {}
+
+@dataclass(frozen=True)
+class SharedLogHandle:
+    """
+    A picklable reference to a log published with :class:`SharedLog`.
+
+    :ivar arrays: For each array, the shared block name, shape and dtype.
+    :ivar activity_names: Activity name for each code.
+    :ivar attributes: The event attribute columns, if shared.
+    :ivar case_attributes: The case attribute columns, if shared.
+    """
+    arrays: Dict[str, Tuple[str, Tuple[int, ...], str]]
+    activity_names: List[str]
+    attributes: Dict[str, np.ndarray] = field(default_factory=dict)
+    case_attributes: Dict[str, np.ndarray] = field(default_factory=dict)
+
+class SharedLog:
+    """
+    Publishes the arrays of a columnar log in shared memory. The blocks are
+    owned by the publisher and released by :meth:`close`, so use it as a
+    context manager around the parallel work::
+
+        with SharedLog(log) as shared:
+            results = pool.map(work, [shared.handle] * n)
+
+    :ivar handle: The handle to pass to workers.
+    """
+
+    def __init__(self, log: ColumnarLog, attributes: bool = False):
+        """
+        :param log: The log to publish.
+        :param attributes: Whether to include the attribute columns (they
+                           are pickled into the handle, not shared).
+        """
+        self._blocks: List[SharedMemory] = []
+        arrays = {}
+        try:
+            for name in _ARRAYS:
+                array = np.ascontiguousarray(getattr(log, name))
+                if name == 'case_ids':
+                    array = array.astype(str)
+                block = SharedMemory(create=True, size=max(array.nbytes, 1))
+                self._blocks.append(block)
+                np.ndarray(array.shape, array.dtype, buffer=block.buf)[...] = array
+                arrays[name] = (block.name, array.shape, array.dtype.str)
+        except BaseException:
+            self.close()
+            raise
+        self.handle = SharedLogHandle(
+            arrays=arrays,
+            activity_names=list(log.activity_names),
+            attributes=dict(log.attributes) if attributes else {},
+            case_attributes=dict(log.case_attributes) if attributes else {},
+        )
+
+    def close(self):
+        """Releases the shared blocks. Attached views become invalid."""
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+    def __enter__(self) -> "SharedLog":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def attach(handle: SharedLogHandle) -> ColumnarLog:
+    """
+    Attaches to a published log without copying its arrays.
+
+    :param handle: The handle of the published log.
+    :return: A columnar log whose arrays are read-only views on shared memory.
+    """
+    arrays = {}
+    for name, (block_name, shape, dtype) in handle.arrays.items():
+        block = _attached.get(block_name)
+        if block is None:
+            block = _attached[block_name] = SharedMemory(name=block_name)
+        array = np.ndarray(shape, np.dtype(dtype), buffer=block.buf)
+        array.flags.writeable = False
+        arrays[name] = array
+    return ColumnarLog(
+        activity_names=handle.activity_names,
+        attributes=handle.attributes,
+        case_attributes=handle.case_attributes,
+        **arrays,
+    )
+
+def detach(handle: SharedLogHandle):
+    """
+    Closes this process's mappings of a published log. Views returned by
+    :func:`attach` for it must no longer be used.
+
+    :param handle: The handle of the published log.
+    """
+    for block_name, _, _ in handle.arrays.values():
+        block = _attached.pop(block_name, None)
+        if block is not None:
+            block.close()
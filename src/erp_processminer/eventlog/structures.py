@@ -4,35 +4,104 @@ Defines the core data structures for process mining: Event, Trace, and EventLog.
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Dict, Any, Iterator
+from typing import List, Dict, Any, Iterator, Iterable
 
-@dataclass(frozen=True)
+from erp_processminer.eventlog.vocabulary import LogVocabulary
+
+class _EmptyAttributes(dict):
+    """
+    A read-only empty dictionary, shared as the default attributes of all
+    events and traces so that objects without attributes allocate none.
+    """
+    __slots__ = ()
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("Shared empty attributes are read-only; assign a new dict instead.")
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self):
+        return (_empty_attributes, ())
+
+EMPTY_ATTRIBUTES: Dict[str, Any] = _EmptyAttributes()
+
+def _empty_attributes() -> Dict[str, Any]:
+    return EMPTY_ATTRIBUTES
+
+class _SharedAttributes(dict):
+    """
+    A read-only attribute dictionary shared by all events with equal
+    attributes (see :func:`erp_processminer.eventlog.serialization.shared_attribute_records`),
+    so that writing to one event cannot change the attributes of others.
+    """
+    __slots__ = ()
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("Shared event attributes are read-only; copy them with dict() and "
+                        "create a new event instead.")
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self):
+        return (_SharedAttributes, (dict(self),))
+
+@dataclass(frozen=True, slots=True)
 class Event:
     """
     Represents a single event in a process, corresponding to a single
-    activity instance. Events are immutable.
+    activity instance. Events are immutable and slotted (no per-instance
+    ``__dict__``); events without attributes share :data:`EMPTY_ATTRIBUTES`.
     """
     case_id: str
     activity: str
     timestamp: datetime
-    attributes: Dict[str, Any] = field(default_factory=dict)
+    attributes: Dict[str, Any] = field(default_factory=_empty_attributes)
 
     def __repr__(self) -> str:
         return f"Event(activity='{self.activity}', timestamp='{self.timestamp}')"
 
-@dataclass
+@dataclass(slots=True)
 class Trace:
     """
     A Trace is a sequence of events for a single case, ordered by timestamp.
     Traces are mutable to allow for filtering and modification.
+
+    Case-level attributes (e.g. vendor or company code) are stored once in
+    `attributes` instead of being repeated on every event.
+
+    The constructor sorts the events; code that already holds events in
+    timestamp order (e.g. a subset of another trace) should use
+    :meth:`presorted` to skip the sort.
     """
     case_id: str
     events: List[Event] = field(default_factory=list)
+    attributes: Dict[str, Any] = field(default_factory=_empty_attributes)
 
     def __post_init__(self):
         # Ensure events are sorted by timestamp
         self.events.sort(key=lambda e: e.timestamp)
 
+    @classmethod
+    def presorted(
+        cls, case_id: str, events: List[Event], attributes: Dict[str, Any] | None = None
+    ) -> "Trace":
+        """
+        Creates a trace from events that are already ordered by timestamp,
+        without sorting or copying them.
+
+        :param case_id: The case ID.
+        :param events: The events, in timestamp order.
+        :param attributes: The case-level attributes, if any.
+        :return: The trace.
+        """
+        trace = cls.__new__(cls)
+        trace.case_id = case_id
+        trace.events = events
+        trace.attributes = EMPTY_ATTRIBUTES if attributes is None else attributes
+        return trace
+
     def __len__(self) -> int:
         return len(self.events)
 
@@ -47,8 +116,17 @@ class EventLog:
     """
     An EventLog is a collection of traces. It is the primary input for
     most process mining algorithms.
+
+    Logs built by the ingestion functions carry a `vocabulary` interning
+    their activity names and categorical attribute values; see
+    :meth:`get_vocabulary` for logs built otherwise.
     """
     traces: List[Trace]
+    vocabulary: LogVocabulary | None = field(default=None, repr=False, compare=False)
+    _case_index: Dict[str, int] | None = field(default=None, init=False, repr=False, compare=False)
+    _case_index_key: tuple | None = field(default=None, init=False, repr=False, compare=False)
+    _fingerprint: str | None = field(default=None, init=False, repr=False, compare=False)
+    _fingerprint_key: tuple | None = field(default=None, init=False, repr=False, compare=False)
 
     def __len__(self) -> int:
         return len(self.traces)
@@ -61,9 +139,104 @@ class EventLog:
         """Returns a flat list of all events in the log."""
         return [event for trace in self.traces for event in trace]
         
-    def get_trace(self, case_id: str) -> Trace | None:
-        """Finds a trace by its case ID."""
+    def get_vocabulary(self) -> LogVocabulary:
+        """
+        Returns the log's vocabulary or, for a log created without one, a new
+        vocabulary of its activities. The new vocabulary is not stored on
+        the log, so analyses never modify their input; assign it to
+        `vocabulary` to reuse it.
+        """
+        if self.vocabulary is not None:
+            return self.vocabulary
+        vocabulary = LogVocabulary()
+        encode = vocabulary.activities.encode
         for trace in self.traces:
-            if trace.case_id == case_id:
-                return trace
-        return None
\ No newline at end of file
+            for event in trace.events:
+                encode(event.activity)
+        return vocabulary
+
+    def activity_codes(self, vocabulary: LogVocabulary | None = None) -> List[List[int]]:
+        """
+        Returns the activity codes of every trace.
+
+        :param vocabulary: The vocabulary to encode with, e.g. from
+                           :meth:`get_vocabulary`; by default the log's own.
+                           Activities it lacks are registered in it.
+        :return: The codes of every trace.
+        """
+        encode = (vocabulary or self.get_vocabulary()).activities.encode
+        return [[encode(event.activity) for event in trace.events] for trace in self.traces]
+
+    def query(self) -> "LogQuery":
+        """
+        Starts a lazy, fused filter pipeline over this log.
+        See :class:`erp_processminer.eventlog.query.LogQuery`.
+        """
+        from erp_processminer.eventlog.query import LogQuery
+        return LogQuery(self)
+
+    def _index(self) -> Dict[str, int]:
+        """
+        Returns the case ID -> position index, building it on first use and
+        rebuilding it when the traces list was replaced or resized.
+        """
+        key = (id(self.traces), len(self.traces))
+        if self._case_index is None or self._case_index_key != key:
+            index: Dict[str, int] = {}
+            for i, trace in enumerate(self.traces):
+                # The first trace of a duplicated case ID wins
+                index.setdefault(trace.case_id, i)
+            self._case_index = index
+            self._case_index_key = key
+        return self._case_index
+
+    def invalidate_index(self):
+        """
+        Discards the case index and the memoized fingerprint (see
+        :func:`erp_processminer.cache.log_fingerprint`). Replacing traces in
+        place is detected by lookups, but the fingerprint only notices
+        changes to the number of traces or events, so call this after
+        replacing traces or events in place.
+        """
+        self._case_index = None
+        self._fingerprint = None
+
+    def _lookup(self, case_id: str, rebuild: bool = True) -> Trace | None:
+        stale = self._case_index
+        index = self._index()
+        position = index.get(case_id)
+        if position is not None and self.traces[position].case_id == case_id:
+            return self.traces[position]
+        if not rebuild or index is not stale:
+            # The index was just built, so the answer is trustworthy
+            return None
+        # A trace may have been replaced in place; rebuild once and retry
+        self.invalidate_index()
+        position = self._index().get(case_id)
+        return None if position is None else self.traces[position]
+
+    def get_trace(self, case_id: str) -> Trace | None:
+        """
+        Finds a trace by its case ID in constant time, using a lazily built
+        case index. A miss rebuilds the index once to rule out traces that
+        were replaced in place.
+        """
+        return self._lookup(case_id)
+
+    def get_traces(self, case_ids: Iterable[str]) -> List[Trace | None]:
+        """
+        Finds many traces at once, rebuilding the index at most once.
+
+        :param case_ids: The case IDs to look up.
+        :return: The trace of each case ID, or None where there is none.
+        """
+        traces = []
+        rebuild = True
+        for case_id in case_ids:
+            trace = self._lookup(case_id, rebuild)
+            rebuild = rebuild and trace is not None
+            traces.append(trace)
+        return traces
+
+    def __contains__(self, case_id: str) -> bool:
+        return self._lookup(case_id) is not None
\ No newline at end of file
@@ -0,0 +1,201 @@
+"""
+Provides a time index for event-level and case-level window queries.
+
+Event timestamps are kept in a sorted array, and every non-empty case is
+represented by its [start, end] interval, stored in arrays sorted by start and
+by end as well as in a centered interval tree. Window queries are answered by
+binary search plus a walk over the matching entries, i.e. in logarithmic time
+plus output size, instead of comparing every event's timestamp.
+
+Case-level semantics for a window [start, end]:
+
+- ``started``: the case's first event lies in the window.
+- ``completed``: the case's last event lies in the window.
+- ``contained``: the whole case lies in the window.
+- ``intersecting``: the case overlaps the window.
+"""
+
+from datetime import datetime
+from typing import List
+import numpy as np
+import pandas as pd
+
+from erp_processminer.eventlog.structures import EventLog
+from erp_processminer.eventlog.columnar import ColumnarLog
+from erp_processminer.eventlog.operations import filter_log_by_event_mask
+
+def _to_ns(value: datetime | np.datetime64 | str) -> int:
+    return int(pd.Timestamp(value).as_unit('ns').value)
+
+class IntervalTree:
+    """
+    A static centered interval tree over closed integer intervals.
+
+    Each node holds the intervals containing its center, sorted by start and
+    by end, so a stabbing query visits one path of the tree and only touches
+    the intervals it reports.
+    """
+
+    def __init__(self, starts: np.ndarray, ends: np.ndarray, ids: np.ndarray | None = None):
+        self.starts = np.asarray(starts, dtype=np.int64)
+        self.ends = np.asarray(ends, dtype=np.int64)
+        ids = np.arange(self.starts.size) if ids is None else np.asarray(ids)
+        # Nodes: (center, ids by start, starts sorted, ids by end, ends sorted, left, right)
+        self.nodes: List[tuple] = []
+        self.root = self._build(ids)
+
+    def _build(self, ids: np.ndarray) -> int:
+        if ids.size == 0:
+            return -1
+        starts, ends = self.starts[ids], self.ends[ids]
+        # The center is a median endpoint, taken exactly from the int64 values
+        # (float arithmetic can round nanosecond timestamps). An endpoint lies
+        # in its own interval, so every node keeps at least one interval and
+        # both subtrees receive fewer ids.
+        points = np.concatenate([starts, ends])
+        k = points.size // 2
+        center = int(np.partition(points, k)[k])
+        here = (starts <= center) & (ends >= center)
+
+        by_start = np.argsort(starts[here], kind='stable')
+        by_end = np.argsort(ends[here], kind='stable')
+        node = len(self.nodes)
+        self.nodes.append(None)
+        left = self._build(ids[ends < center])
+        right = self._build(ids[starts > center])
+        self.nodes[node] = (
+            center,
+            ids[here][by_start], starts[here][by_start],
+            ids[here][by_end], ends[here][by_end],
+            left, right,
+        )
+        return node
+
+    def stab(self, point: int) -> np.ndarray:
+        """Returns the IDs of all intervals containing `point`."""
+        found = []
+        node = self.root
+        while node != -1:
+            center, ids_s, starts, ids_e, ends, left, right = self.nodes[node]
+            if point < center:
+                found.append(ids_s[:np.searchsorted(starts, point, side='right')])
+                node = left
+            elif point > center:
+                found.append(ids_e[np.searchsorted(ends, point, side='left'):])
+                node = right
+            else:
+                found.append(ids_s)
+                break
+        return np.concatenate(found) if found else np.empty(0, dtype=np.int64)
+
+class TimeIndex:
+    """
+    A time index over the events and cases of a log.
+
+    Event positions follow the order of a ColumnarLog (traces concatenated);
+    case positions follow the order of the traces.
+    """
+
+    def __init__(self, log: EventLog | ColumnarLog):
+        columnar = log if isinstance(log, ColumnarLog) else ColumnarLog.from_event_log(log)
+        self.n_events = columnar.n_events
+        self.n_cases = columnar.n_cases
+
+        stamps = columnar.timestamps.astype('datetime64[ns]').view(np.int64)
+        self.event_order = np.argsort(stamps, kind='stable')
+        self.event_times = stamps[self.event_order]
+
+        lengths = columnar.trace_lengths()
+        self.cases = np.flatnonzero(lengths > 0)
+        self.case_starts = stamps[columnar.case_offsets[:-1][self.cases]]
+        self.case_ends = stamps[columnar.case_offsets[1:][self.cases] - 1]
+
+        self.start_order = np.argsort(self.case_starts, kind='stable')
+        self.sorted_starts = self.case_starts[self.start_order]
+        self.end_order = np.argsort(self.case_ends, kind='stable')
+        self.sorted_ends = self.case_ends[self.end_order]
+        self.tree = IntervalTree(self.case_starts, self.case_ends)
+
+    def events_between(self, start_time=None, end_time=None) -> np.ndarray:
+        """
+        Returns the positions of the events within the inclusive window,
+        ordered by timestamp.
+        """
+        lo = 0 if start_time is None else np.searchsorted(self.event_times, _to_ns(start_time), 'left')
+        hi = self.event_times.size if end_time is None else \
+            np.searchsorted(self.event_times, _to_ns(end_time), 'right')
+        return self.event_order[lo:hi]
+
+    def _range(self, sorted_values: np.ndarray, order: np.ndarray, start_time, end_time,
+               right_open_start: bool = False) -> np.ndarray:
+        lo = 0 if start_time is None else np.searchsorted(
+            sorted_values, _to_ns(start_time), 'right' if right_open_start else 'left')
+        hi = sorted_values.size if end_time is None else \
+            np.searchsorted(sorted_values, _to_ns(end_time), 'right')
+        return order[lo:hi]
+
+    def cases_started_in(self, start_time=None, end_time=None) -> np.ndarray:
+        """Returns the positions of the cases whose first event is in the window."""
+        return np.sort(self.cases[self._range(self.sorted_starts, self.start_order, start_time, end_time)])
+
+    def cases_completed_in(self, start_time=None, end_time=None) -> np.ndarray:
+        """Returns the positions of the cases whose last event is in the window."""
+        return np.sort(self.cases[self._range(self.sorted_ends, self.end_order, start_time, end_time)])
+
+    def cases_contained_in(self, start_time=None, end_time=None) -> np.ndarray:
+        """Returns the positions of the cases lying entirely in the window."""
+        candidates = self._range(self.sorted_starts, self.start_order, start_time, end_time)
+        if end_time is not None:
+            candidates = candidates[self.case_ends[candidates] <= _to_ns(end_time)]
+        return np.sort(self.cases[candidates])
+
+    def cases_intersecting(self, start_time=None, end_time=None) -> np.ndarray:
+        """Returns the positions of the cases overlapping the window."""
+        if start_time is None:
+            return self.cases_started_in(None, end_time)
+        # Cases spanning the window start, plus cases starting inside it
+        spanning = self.tree.stab(_to_ns(start_time))
+        inside = self._range(self.sorted_starts, self.start_order, start_time, end_time,
+                             right_open_start=True)
+        return np.sort(self.cases[np.concatenate([spanning, inside])])
+
+    def filter(
+        self,
+        log: EventLog | ColumnarLog,
+        start_time: datetime | None = None,
+        end_time: datetime | None = None,
+        mode: str = 'events',
+    ) -> EventLog | ColumnarLog:
+        """
+        Filters the indexed log by a time window.
+
+        :param log: The log the index was built for.
+        :param start_time: The start of the window (inclusive), or None.
+        :param end_time: The end of the window (inclusive), or None.
+        :param mode: 'events' keeps the events inside the window, like
+                     :func:`filter_log_by_timestamp`; 'started', 'completed',
+                     'contained' and 'intersecting' keep whole cases.
+        :return: The filtered log, of the same type as `log`.
+        """
+        if len(log) != self.n_cases:
+            raise ValueError("The index was built for a different log.")
+
+        if mode == 'events':
+            mask = np.zeros(self.n_events, dtype=bool)
+            mask[self.events_between(start_time, end_time)] = True
+            if isinstance(log, ColumnarLog):
+                return log.select_events(mask)
+            return filter_log_by_event_mask(log, mask)
+
+        queries = {
+            'started': self.cases_started_in,
+            'completed': self.cases_completed_in,
+            'contained': self.cases_contained_in,
+            'intersecting': self.cases_intersecting,
+        }
+        if mode not in queries:
+            raise ValueError(f"Unknown mode '{mode}'. Use 'events' or one of {list(queries)}.")
+        cases = queries[mode](start_time, end_time)
+        if isinstance(log, ColumnarLog):
+            return log.select_cases(cases)
+        return EventLog([log.traces[i] for i in cases.tolist()], vocabulary=log.vocabulary)
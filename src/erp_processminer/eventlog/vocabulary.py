@@ -0,0 +1,151 @@
+"""
+Provides log-wide vocabularies that intern activity names and categorical
+attribute values.
+
+A Vocabulary maps each distinct string to a dense integer code and keeps a
+single canonical string object per value. Ingestion routes all activity
+names and categorical attribute values through the vocabulary, so equal
+strings are shared between events instead of being allocated per event, and
+algorithms can work on the integer codes while names are only decoded for
+display.
+"""
+
+from typing import List, Dict, Iterable, Any
+import sys
+import numpy as np
+import pandas as pd
+
+class Vocabulary:
+    """
+    A bidirectional mapping between strings and dense integer codes.
+
+    Codes are assigned in order of first appearance and never change, so
+    code arrays remain valid as the vocabulary grows.
+    """
+
+    def __init__(self, values: Iterable[str] = ()):
+        self.names: List[str] = []
+        self._codes: Dict[str, int] = {}
+        for value in values:
+            self.encode(value)
+
+    def encode(self, value: str) -> int:
+        """Returns the code of a value, registering it if it is new."""
+        code = self._codes.get(value)
+        if code is None:
+            value = sys.intern(value) if type(value) is str else value
+            code = len(self.names)
+            self._codes[value] = code
+            self.names.append(value)
+        return code
+
+    def code(self, value: str) -> int | None:
+        """Returns the code of a value, or None if it is unknown."""
+        return self._codes.get(value)
+
+    def decode(self, code: int) -> str:
+        """Returns the value of a code."""
+        return self.names[code]
+
+    def intern(self, value: str) -> str:
+        """Returns the canonical (shared) object for a value."""
+        return self.names[self.encode(value)]
+
+    def encode_array(self, values: Iterable[Any]) -> np.ndarray:
+        """
+        Encodes many values at once; each distinct value is looked up once.
+        Missing values get code -1.
+
+        :param values: The values to encode.
+        :return: An int32 array of codes.
+        """
+        if not isinstance(values, (np.ndarray, pd.Series)):
+            values = list(values)
+        local, uniques = pd.factorize(np.asarray(values, dtype=object))
+        remap = np.array([self.encode(value) for value in uniques] + [-1], dtype=np.int32)
+        return remap[local]
+
+    def decode_array(self, codes: np.ndarray) -> np.ndarray:
+        """
+        Decodes an array of codes into an object array of canonical values;
+        code -1 decodes to None.
+        """
+        names = np.empty(len(self.names) + 1, dtype=object)
+        names[:-1] = self.names
+        names[-1] = None
+        return names[np.asarray(codes)]
+
+    def intern_values(self, values: Iterable[Any]) -> List[Any]:
+        """
+        Replaces every value by its canonical object. Missing values are
+        returned unchanged.
+
+        :param values: The values to intern, e.g. a DataFrame column.
+        :return: The interned values, as a list.
+        """
+        values = pd.Series(values, dtype=object) if not isinstance(values, pd.Series) \
+            else values.astype(object)
+        codes = self.encode_array(values)
+        interned = self.decode_array(codes)
+        missing = codes < 0
+        if missing.any():
+            interned[missing] = values.to_numpy()[missing]
+        return interned.tolist()
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, value: str) -> bool:
+        return value in self._codes
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __repr__(self) -> str:
+        return f"Vocabulary(size={len(self)})"
+
+class LogVocabulary:
+    """
+    The vocabularies of one event log: one for activity names and one per
+    categorical (string-valued) attribute.
+    """
+
+    def __init__(self):
+        self.activities = Vocabulary()
+        self.attributes: Dict[str, Vocabulary] = {}
+
+    def attribute(self, key: str) -> Vocabulary:
+        """Returns the vocabulary of an attribute, creating it if needed."""
+        vocabulary = self.attributes.get(key)
+        if vocabulary is None:
+            vocabulary = self.attributes[key] = Vocabulary()
+        return vocabulary
+
+    def intern_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Interns the string columns of an attribute DataFrame.
+
+        :param df: Attribute columns; non-string columns are left as they are.
+        :return: A DataFrame whose string values are canonical objects.
+        """
+        columns = {}
+        for col in df.columns:
+            values = df[col]
+            if pd.api.types.is_string_dtype(values) or values.dtype == object:
+                try:
+                    values = pd.Series(self.attribute(col).intern_values(values),
+                                       index=df.index, dtype=object)
+                except TypeError:
+                    # Unhashable values are kept as they are
+                    pass
+            columns[col] = values
+        return pd.DataFrame(columns, index=df.index)
+
+    def activity_codes(self, activities: Iterable[str]) -> List[int]:
+        """Encodes a sequence of activity names."""
+        encode = self.activities.encode
+        return [encode(activity) for activity in activities]
+
+    def __repr__(self) -> str:
+        return (f"LogVocabulary(activities={len(self.activities)}, "
+                f"attributes={ {k: len(v) for k, v in self.attributes.items()} })")
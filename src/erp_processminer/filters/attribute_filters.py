@@ -4,22 +4,29 @@ Provides functions for filtering event logs based on event or trace attributes.
 from typing import List, Set, Callable
 
 from erp_processminer.eventlog.structures import EventLog, Trace, Event
+from erp_processminer.eventlog.compressed import VariantLog
 
-def filter_log_by_activity(log: EventLog, activities_to_keep: Set[str]) -> EventLog:
+def filter_log_by_activity(
+    log: EventLog | VariantLog, 
+    activities_to_keep: Set[str]
+) -> EventLog | VariantLog:
     """
     Filters an event log, keeping only events with an activity from the given set.
     Traces that become empty after filtering are removed.
 
-    :param log: The event log to filter.
+    :param log: The event log to filter, or its variant-compressed form.
     :param activities_to_keep: A set of activity names to keep.
-    :return: A new, filtered EventLog.
+    :return: A new, filtered log of the same type.
     """
+    if isinstance(log, VariantLog):
+        return log.filter_activities(activities_to_keep)
+
     new_traces = []
     for trace in log:
         filtered_events = [e for e in trace.events if e.activity in activities_to_keep]
         if filtered_events:
-            new_traces.append(Trace(case_id=trace.case_id, events=filtered_events))
-    return EventLog(traces=new_traces)
+            new_traces.append(Trace.presorted(trace.case_id, filtered_events, trace.attributes))
+    return EventLog(traces=new_traces, vocabulary=log.vocabulary)
 
 def filter_log_by_event_attribute(
     log: EventLog, 
@@ -41,8 +48,8 @@ def filter_log_by_event_attribute(
             if e.attributes.get(attribute_key) in attribute_values
         ]
         if filtered_events:
-            new_traces.append(Trace(case_id=trace.case_id, events=filtered_events))
-    return EventLog(traces=new_traces)
+            new_traces.append(Trace.presorted(trace.case_id, filtered_events, trace.attributes))
+    return EventLog(traces=new_traces, vocabulary=log.vocabulary)
 
 def filter_log_by_trace_attribute(
     log: EventLog, 
@@ -57,16 +64,22 @@ def filter_log_by_trace_attribute(
     :return: A new, filtered EventLog.
     """
     new_traces = [trace for trace in log if filter_fn(trace)]
-    return EventLog(traces=new_traces)
+    return EventLog(traces=new_traces, vocabulary=log.vocabulary)
 
-def filter_variants_by_frequency(log: EventLog, min_frequency: int) -> EventLog:
+def filter_variants_by_frequency(
+    log: EventLog | VariantLog, 
+    min_frequency: int
+) -> EventLog | VariantLog:
     """
     Filters out process variants that occur less than a specified number of times.
 
-    :param log: The event log to filter.
+    :param log: The event log to filter, or its variant-compressed form.
     :param min_frequency: The minimum number of times a variant must appear.
-    :return: A new EventLog containing only the frequent variants.
+    :return: A new log of the same type containing only the frequent variants.
     """
+    if isinstance(log, VariantLog):
+        return log.select_variants(log.multiplicities >= min_frequency)
+
     from erp_processminer.statistics.variants import get_variants
     
     variants = get_variants(log)
@@ -84,4 +97,4 @@ def filter_variants_by_frequency(log: EventLog, min_frequency: int) -> EventLog:
         for trace in traces
     ]
     
-    return EventLog(traces=new_traces)
\ No newline at end of file
+    return EventLog(traces=new_traces, vocabulary=log.vocabulary)
\ No newline at end of file
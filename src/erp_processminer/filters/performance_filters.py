@@ -2,23 +2,35 @@
 Provides functions for filtering event logs based on performance metrics
 like cycle time.
 """
+import numpy as np
+
 from erp_processminer.eventlog.structures import EventLog, Trace
+from erp_processminer.eventlog.compressed import VariantLog
 from erp_processminer.statistics.performance import calculate_cycle_time
 
 def filter_log_by_cycle_time(
-    log: EventLog, 
+    log: EventLog | VariantLog, 
     min_duration: float | None = None, 
     max_duration: float | None = None
-) -> EventLog:
+) -> EventLog | VariantLog:
     """
     Filters an event log, keeping only traces with a cycle time within the
     specified range.
 
-    :param log: The event log to filter.
+    :param log: The event log to filter, or its variant-compressed form.
     :param min_duration: The minimum cycle time in seconds.
     :param max_duration: The maximum cycle time in seconds.
-    :return: A new, filtered EventLog.
+    :return: A new, filtered log of the same type.
     """
+    if isinstance(log, VariantLog):
+        cycle_times = log.cycle_times()
+        keep = ~np.isnan(cycle_times)
+        if min_duration is not None:
+            keep &= cycle_times >= min_duration
+        if max_duration is not None:
+            keep &= cycle_times <= max_duration
+        return log.select_cases(keep)
+
     new_traces = []
     for trace in log:
         cycle_time = calculate_cycle_time(trace)
@@ -29,4 +41,4 @@ def filter_log_by_cycle_time(
            (max_duration is None or cycle_time <= max_duration):
             new_traces.append(trace)
             
-    return EventLog(traces=new_traces)
\ No newline at end of file
+    return EventLog(traces=new_traces, vocabulary=log.vocabulary)
\ No newline at end of file
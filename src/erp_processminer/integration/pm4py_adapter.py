@@ -23,6 +23,7 @@ def to_pm4py_log(log: EventLog):
     pm4py_log = Pm4pyEventLog()
     for trace in log:
         pm4py_trace = Trace()
+        pm4py_trace.attributes.update(trace.attributes)
         pm4py_trace.attributes['concept:name'] = trace.case_id
         for event in trace:
             pm4py_event = Event()
@@ -0,0 +1,129 @@
+"""
+Provides hash-based deduplication of events extracted from overlapping ERP
+tables or delta extracts.
+
+Each row is reduced to a 64-bit fingerprint of its key columns (by default
+case, activity and timestamp, typically extended with a document number).
+Duplicates within a batch are found with one sort of the batch's hashes, and
+duplicates of earlier batches with a binary search in the sorted array of
+all previously seen fingerprints, so no row is handled in Python. The
+fingerprint set can be saved and reloaded for incremental runs.
+"""
+
+from pathlib import Path
+from typing import List, Dict, Sequence
+import numpy as np
+import pandas as pd
+
+DEFAULT_KEY_COLUMNS = ('case_id', 'activity', 'timestamp')
+
+class EventDeduplicator:
+    """
+    Drops rows whose key columns were already seen, in this batch or in any
+    earlier one.
+
+    :ivar key_columns: The columns identifying an event. Every key column
+                       must be present in the hashed rows.
+    :ivar fingerprints: The fingerprints seen so far (sorted, unique uint64).
+    :ivar seen: The number of rows processed.
+    :ivar dropped: The number of duplicate rows dropped.
+    """
+
+    def __init__(self, key_columns: Sequence[str] = DEFAULT_KEY_COLUMNS,
+                 fingerprints: np.ndarray | None = None):
+        if not key_columns:
+            raise ValueError("At least one key column is required for deduplication.")
+        self.key_columns: List[str] = list(key_columns)
+        # Kept sorted and unique, for binary-search membership tests
+        self.fingerprints = np.empty(0, dtype=np.uint64) if fingerprints is None \
+            else np.unique(np.asarray(fingerprints, dtype=np.uint64))
+        self.seen = 0
+        self.dropped = 0
+
+    def hash_rows(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Computes the 64-bit fingerprint of every row over the key columns.
+
+        :param df: The rows to hash.
+        :return: A uint64 array with one fingerprint per row.
+        """
+        missing_cols = [col for col in self.key_columns if col not in df.columns]
+        if missing_cols:
+            raise ValueError(
+                f"Rows are missing deduplication key columns: {missing_cols}. "
+                f"Available columns: {list(df.columns)}"
+            )
+        return pd.util.hash_pandas_object(df[self.key_columns], index=False) \
+            .to_numpy(dtype=np.uint64)
+
+    def deduplicate(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Removes duplicate rows and records the fingerprints of the kept ones.
+
+        :param df: A batch of event rows.
+        :return: The rows not seen before, in their original order.
+        """
+        return df[self.new_rows(self.hash_rows(df))]
+
+    def new_rows(self, hashes: np.ndarray) -> np.ndarray:
+        """
+        Marks the first occurrence of every fingerprint not seen before and
+        records these fingerprints.
+
+        :param hashes: The fingerprints of a batch of rows, from :meth:`hash_rows`.
+        :return: A boolean mask of the rows to keep.
+        """
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        unique, first = np.unique(hashes, return_index=True)
+        positions = np.searchsorted(self.fingerprints, unique)
+        known = positions < self.fingerprints.size
+        known[known] = self.fingerprints[positions[known]] == unique[known]
+
+        keep = np.zeros(hashes.size, dtype=bool)
+        keep[first[~known]] = True
+        # Merge the new fingerprints into the sorted array
+        self.fingerprints = np.insert(self.fingerprints, positions[~known], unique[~known])
+        self.seen += int(hashes.size)
+        self.dropped += int(hashes.size - keep.sum())
+        return keep
+
+    def report(self) -> Dict[str, int]:
+        """
+        Summarizes the work done so far.
+
+        :return: A dictionary with the number of rows seen, kept and dropped,
+                 and the size of the fingerprint set.
+        """
+        return {
+            'seen': self.seen,
+            'kept': self.seen - self.dropped,
+            'dropped': self.dropped,
+            'fingerprints': int(self.fingerprints.size),
+        }
+
+    def save(self, file_path: str | Path):
+        """
+        Saves the fingerprint set to a ``.npy`` file.
+
+        :param file_path: The path to the output file.
+        """
+        np.save(file_path, self.fingerprints)
+
+    @classmethod
+    def load(cls, file_path: str | Path,
+             key_columns: Sequence[str] = DEFAULT_KEY_COLUMNS) -> "EventDeduplicator":
+        """
+        Restores a deduplicator from a saved fingerprint set. A missing file
+        yields an empty set, so the first incremental run needs no setup.
+
+        :param file_path: The path of the fingerprint file.
+        :param key_columns: The key columns; they must match the ones used
+                            when the fingerprints were computed.
+        :return: The deduplicator.
+        """
+        file_path = Path(file_path)
+        fingerprints = np.load(file_path) if file_path.exists() else None
+        return cls(key_columns, fingerprints)
+
+    def __repr__(self) -> str:
+        return f"EventDeduplicator(keys={self.key_columns}, dropped={self.dropped})"
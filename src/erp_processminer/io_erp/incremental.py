@@ -0,0 +1,263 @@
+"""
+Supports incremental ERP-to-log ingestion.
+
+Each table keeps a high-watermark: the largest value of its watermark column
+(by default its timestamp column, or e.g. a change number) that has already
+been ingested. A run maps only the rows above the watermark, so mapping
+work is proportional to the day's delta rather than to the full table
+dumps. The resulting events are appended to the existing log; where the log
+is a :class:`PartitionedLog`, only the partitions receiving new events are
+rewritten, so writing is proportional to the delta as well. A saved
+:class:`ColumnarLog` stores the events of each case contiguously and is
+rewritten as a whole on every append.
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, Any
+import numpy as np
+import pandas as pd
+
+from erp_processminer.eventlog.structures import EventLog
+from erp_processminer.eventlog.columnar import ColumnarLog
+from erp_processminer.eventlog.partitioned import PartitionedLog, MANIFEST
+from erp_processminer.eventlog.operations import merge_event_logs
+
+class Watermarks:
+    """
+    Per-table high-watermarks, persisted as a JSON file.
+
+    Rows are new if their watermark column is strictly greater than the
+    stored value, so rows arriving later with an already ingested value are
+    skipped; prefer a monotonically increasing change number where the
+    source table has one. A watermark column must be numeric or hold
+    timestamps; text columns are parsed as timestamps before comparing.
+
+    :ivar values: The watermark of each table. Timestamps are kept as
+                  pandas Timestamps, other values as they are.
+    """
+
+    def __init__(self, values: Dict[str, Any] | None = None):
+        self.values: Dict[str, Any] = dict(values or {})
+
+    @staticmethod
+    def _comparable(table_name: str, values: pd.Series, column: str) -> pd.Series:
+        """
+        Returns the watermark values in a comparable type: numbers as they
+        are, everything else as timestamps.
+        """
+        if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+            return values
+        if pd.api.types.is_datetime64_any_dtype(values):
+            return values
+        try:
+            return pd.to_datetime(values)
+        except (ValueError, TypeError) as e:
+            raise ValueError(
+                f"Watermark column '{column}' in table '{table_name}' must hold numbers "
+                f"or timestamps: {e}"
+            ) from e
+
+    @staticmethod
+    def column(table_config: Dict[str, Any]) -> str:
+        """Returns the watermark column of a table configuration."""
+        return table_config.get('watermark', table_config['timestamp'])
+
+    def new_rows(self, table_name: str, df: pd.DataFrame, column: str) -> pd.DataFrame:
+        """
+        Returns the rows of a table above its watermark.
+
+        :param table_name: The table name in the mapping configuration.
+        :param df: The table rows.
+        :param column: The watermark column.
+        :return: The new rows.
+        """
+        if column not in df.columns:
+            raise ValueError(f"Watermark column '{column}' not found in table '{table_name}'.")
+        mark = self.values.get(table_name)
+        if mark is None:
+            return df
+        values = self._comparable(table_name, df[column], column)
+        if pd.api.types.is_datetime64_any_dtype(values):
+            mark = pd.Timestamp(mark)
+        return df[(values > mark).to_numpy()]
+
+    def advance(self, table_name: str, df: pd.DataFrame, column: str):
+        """
+        Moves the watermark of a table to the largest value in `df`.
+
+        :param table_name: The table name in the mapping configuration.
+        :param df: The rows just ingested.
+        :param column: The watermark column.
+        """
+        values = self._comparable(table_name, df[column], column).dropna()
+        if values.empty:
+            return
+        top = values.max()
+        mark = self.values.get(table_name)
+        if mark is not None and pd.api.types.is_datetime64_any_dtype(values):
+            mark = pd.Timestamp(mark)
+        if mark is None or top > mark:
+            self.values[table_name] = top
+
+    def save(self, file_path: str | Path):
+        """
+        Saves the watermarks to a JSON file. Timestamps are written in ISO
+        format.
+
+        :param file_path: The path to the output file.
+        """
+        state = {}
+        for table, value in self.values.items():
+            if isinstance(value, (pd.Timestamp, np.datetime64)):
+                value = pd.Timestamp(value).isoformat()
+            elif isinstance(value, np.generic):
+                value = value.item()
+            state[table] = value
+        with open(file_path, 'w') as f:
+            json.dump(state, f, indent=2)
+
+    @classmethod
+    def load(cls, file_path: str | Path) -> "Watermarks":
+        """
+        Loads watermarks from a JSON file; a missing file yields no
+        watermarks, i.e. a full first run.
+
+        :param file_path: The path of the state file.
+        :return: The watermarks.
+        """
+        file_path = Path(file_path)
+        if not file_path.exists():
+            return cls()
+        with open(file_path) as f:
+            return cls(json.load(f))
+
+    def __repr__(self) -> str:
+        return f"Watermarks({self.values})"
+
+def _ranges(starts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """Concatenates the index ranges [start, start + length)."""
+    before = np.zeros(len(lengths), dtype=np.int64)
+    np.cumsum(lengths[:-1], out=before[1:])
+    return np.repeat(starts - before, lengths) + np.arange(int(lengths.sum()))
+
+def _append_columnar(log: ColumnarLog, delta: ColumnarLog) -> ColumnarLog:
+    """
+    Appends the events of `delta` to `log`. Events of unaffected cases are
+    moved with vectorized copies; only the affected cases are re-sorted.
+    """
+    codes = {a: i for i, a in enumerate(log.activity_names)}
+    remap = np.array(
+        [codes.setdefault(a, len(codes)) for a in delta.activity_names] or [0], dtype=np.int32
+    )
+
+    positions = pd.Index(log.case_ids).get_indexer(delta.case_ids)
+    new = positions < 0
+    targets = positions.copy()
+    targets[new] = log.n_cases + np.arange(int(new.sum()))
+    n_cases = log.n_cases + int(new.sum())
+
+    old_lengths = np.zeros(n_cases, dtype=np.int64)
+    old_lengths[:log.n_cases] = log.trace_lengths()
+    delta_lengths = np.diff(delta.case_offsets)
+    lengths = old_lengths.copy()
+    lengths[targets] += delta_lengths
+    offsets = np.zeros(n_cases + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+
+    # Old events keep their order at the start of their case; new events follow
+    old_dest = _ranges(offsets[:log.n_cases], old_lengths[:log.n_cases])
+    delta_dest = _ranges(offsets[targets] + old_lengths[targets], delta_lengths)
+    n_events = int(offsets[-1])
+
+    activities = np.empty(n_events, dtype=np.int32)
+    activities[old_dest] = log.activities
+    activities[delta_dest] = remap[np.asarray(delta.activities)]
+    timestamps = np.empty(n_events, dtype='datetime64[ns]')
+    timestamps[old_dest] = log.timestamps
+    timestamps[delta_dest] = delta.timestamps
+    attributes = {}
+    for key in dict.fromkeys([*log.attributes, *delta.attributes]):
+        column = np.full(n_events, None, dtype=object)
+        if key in log.attributes:
+            column[old_dest] = log.attributes[key]
+        if key in delta.attributes:
+            column[delta_dest] = delta.attributes[key]
+        attributes[key] = column
+
+    # Re-sort only the existing cases that received events (stable, so old
+    # events stay ahead of new events with the same timestamp)
+    touched = targets[~new & (delta_lengths > 0)]
+    if touched.size:
+        events = _ranges(offsets[touched], lengths[touched])
+        order = np.lexsort((timestamps[events], np.repeat(touched, lengths[touched])))
+        source = events[order]
+        activities[events] = activities[source]
+        timestamps[events] = timestamps[source]
+        for column in attributes.values():
+            column[events] = column[source]
+
+    # Existing cases keep their attributes; the delta only fills in gaps
+    case_attributes = {}
+    for key in dict.fromkeys([*log.case_attributes, *delta.case_attributes]):
+        column = np.full(n_cases, None, dtype=object)
+        if key in log.case_attributes:
+            column[:log.n_cases] = log.case_attributes[key]
+        if key in delta.case_attributes:
+            values = delta.case_attributes[key]
+            column[targets[new]] = values[new]
+            existing = targets[~new]
+            missing = np.array([v is None for v in column[existing]], dtype=bool)
+            column[existing[missing]] = values[~new][missing]
+        case_attributes[key] = column
+
+    case_ids = np.concatenate([np.asarray(log.case_ids), np.asarray(delta.case_ids)[new]])
+    return ColumnarLog(
+        case_ids=case_ids.astype(str),
+        case_offsets=offsets,
+        activities=activities,
+        timestamps=timestamps,
+        activity_names=list(codes),
+        attributes=attributes,
+        case_attributes=case_attributes,
+    )
+
+def append_events(
+    log: EventLog | ColumnarLog | PartitionedLog | str | Path,
+    events: EventLog,
+) -> EventLog | ColumnarLog | PartitionedLog:
+    """
+    Appends newly mapped events to an existing log. Cases that receive no
+    events are left untouched; new cases are added at the end.
+
+    :param log: The existing log: an EventLog, a ColumnarLog, a
+                PartitionedLog, or the directory of a saved ColumnarLog or
+                PartitionedLog (an empty directory becomes a ColumnarLog). A saved
+                ColumnarLog is loaded into memory and saved again in full;
+                a PartitionedLog only rewrites the partitions receiving
+                events, and is the better choice for large logs.
+    :param events: The new events, e.g. from an incremental
+                   :func:`apply_mapping` run.
+    :return: The updated log.
+    """
+    if isinstance(log, EventLog):
+        return merge_event_logs([log, events], deduplicate=False)
+    if isinstance(log, PartitionedLog):
+        log.append(events)
+        return log
+
+    directory = None
+    if isinstance(log, (str, Path)):
+        directory = Path(log)
+        if (directory / MANIFEST).exists():
+            return append_events(PartitionedLog.open(directory), events)
+        if not (directory / 'meta.json').exists():
+            result = ColumnarLog.from_event_log(events)
+            result.save(directory)
+            return result
+        log = ColumnarLog.load(directory, mmap=False)
+
+    result = _append_columnar(log, ColumnarLog.from_event_log(events))
+    if directory is not None:
+        result.save(directory)
+    return result
@@ -3,10 +3,14 @@ Contains functions to load ERP data from external sources like CSV files
 into pandas DataFrames.
 """
 
+import csv
+import time
 from pathlib import Path
-from typing import List
+from typing import List, Iterator
 import pandas as pd
 
+from erp_processminer.eventlog.structures import Event
+
 def load_erp_data(file_path: str | Path) -> pd.DataFrame:
     """
     Loads data from a CSV file into a pandas DataFrame.
@@ -34,4 +38,57 @@ def load_multiple_erp_data(file_paths: List[str | Path]) -> List[pd.DataFrame]:
     :param file_paths: A list of paths to the CSV files.
     :return: A list of pandas DataFrames.
     """
-    return [load_erp_data(fp) for fp in file_paths]
\ No newline at end of file
+    return [load_erp_data(fp) for fp in file_paths]
+
+def tail_events(
+    file_path: str | Path,
+    follow: bool = False,
+    poll_interval: float = 0.5,
+    idle_timeout: float | None = None,
+) -> Iterator[Event]:
+    """
+    Reads events from a CSV file as a stream, optionally following the file
+    as new lines are appended (like ``tail -f``). The file needs a header
+    with 'case_id', 'activity' and 'timestamp' columns; other columns become
+    event attributes. Incomplete trailing lines are only read once finished.
+
+    :param file_path: The path to the CSV file.
+    :param follow: Whether to wait for new lines at the end of the file.
+    :param poll_interval: Seconds between checks for new lines.
+    :param idle_timeout: When following, stop after this many seconds
+                         without new lines; None follows forever.
+    :return: An iterator over the events, in file order.
+    """
+    with open(file_path, newline='') as f:
+        header = None
+        buffer = ''
+        idle_since = time.monotonic()
+        while True:
+            line = f.readline()
+            if line:
+                buffer += line
+            if not buffer.endswith('\n'):
+                # At the end of the file, possibly inside a partly written line
+                if not follow:
+                    if not buffer:
+                        return
+                elif idle_timeout is not None and time.monotonic() - idle_since > idle_timeout:
+                    return
+                else:
+                    time.sleep(poll_interval)
+                    continue
+            line, buffer = buffer, ''
+            idle_since = time.monotonic()
+            values = next(csv.reader([line]), None)
+            if not values:
+                continue
+            if header is None:
+                header = values
+                missing = {'case_id', 'activity', 'timestamp'} - set(header)
+                if missing:
+                    raise ValueError(f"Event stream is missing columns: {sorted(missing)}")
+                continue
+            row = dict(zip(header, values))
+            case_id, activity = row.pop('case_id'), row.pop('activity')
+            timestamp = pd.Timestamp(row.pop('timestamp')).to_pydatetime()
+            yield Event(case_id, activity, timestamp, row) if row else Event(case_id, activity, timestamp)
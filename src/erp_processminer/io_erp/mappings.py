@@ -4,47 +4,147 @@ based on a declarative mapping configuration.
 """
 
 from typing import List, Dict, Any
+import numpy as np
 import pandas as pd
 
-from erp_processminer.eventlog.structures import Event, Trace, EventLog
+from erp_processminer.eventlog.structures import Event, Trace, EventLog, EMPTY_ATTRIBUTES
+from erp_processminer.eventlog.object_centric import ObjectCentricLog
+from erp_processminer.eventlog.vocabulary import LogVocabulary
+from erp_processminer.eventlog.serialization import shared_attribute_records, case_attribute_table
+from erp_processminer.io_erp.deduplication import EventDeduplicator
+from erp_processminer.io_erp.incremental import Watermarks
+from erp_processminer.io_erp.linking import derive_case_ids
+
+# Event fields generated by the mapping; source columns with these names are
+# never copied as attributes, as they would clash with the generated ones
+RESERVED_COLUMNS = ('case_id', 'activity', 'timestamp')
+
+def _attribute_frame(df: pd.DataFrame, table_config: Dict[str, Any], *mapped: str) -> pd.DataFrame:
+    """
+    Returns the columns of a table that become event attributes: all columns
+    except the timestamp source, the other `mapped` columns and the reserved
+    event field names. An activity source column (e.g. a status or
+    transaction code) is kept, unless it has a reserved name.
+    """
+    excluded = {*RESERVED_COLUMNS, *mapped, table_config['timestamp']}
+    return df[[col for col in df.columns if col not in excluded]]
+
+def _table_events(
+    df: pd.DataFrame,
+    table_name: str,
+    table_config: Dict[str, Any],
+    case_id_col: str,
+) -> pd.DataFrame:
+    """
+    Builds the event rows of one table: 'case_id', 'activity' and
+    'timestamp' columns followed by the attribute columns.
+    """
+    # Activity can be a static string or a column name
+    activity_source = table_config['activity']
+    if activity_source.startswith("'") and activity_source.endswith("'"):
+        activity = pd.Series(activity_source.strip("'"), index=df.index)
+    else:
+        activity = df[activity_source].astype(str)
+
+    attributes = _attribute_frame(df, table_config, case_id_col, table_config['entity_id'])
+    events = pd.DataFrame({
+        'case_id': df[case_id_col].astype(str),
+        'activity': activity,
+        'timestamp': pd.to_datetime(df[table_config['timestamp']]),
+    }, index=df.index)
+    # A source column named 'source_table' takes precedence over the generated one
+    source = None if 'source_table' in attributes.columns else \
+        pd.DataFrame({'source_table': table_name}, index=df.index)
+    return pd.concat([events, source, attributes], axis=1)
+
+def _deduplication_keys(df: pd.DataFrame, rows: pd.DataFrame, key_columns: List[str]) -> pd.DataFrame:
+    """
+    Returns the deduplication key columns of a table's event rows: generated
+    event fields from `rows`, all other columns from the source table `df`,
+    so that mapped columns which are not kept as attributes can be keys.
+    Unknown key columns are left out for the deduplicator to report.
+    """
+    columns = {}
+    for col in key_columns:
+        if col in rows.columns and (col in RESERVED_COLUMNS or col not in df.columns):
+            columns[col] = rows[col].to_numpy()
+        elif col in df.columns:
+            columns[col] = df[col].to_numpy()
+    return pd.DataFrame(columns)
+
+def _match_tables(dataframes: List[pd.DataFrame], config: Dict[str, Any]) -> Dict[str, pd.DataFrame]:
+    """Assigns the given DataFrames to the tables of the configuration."""
+    # Heuristic to find the right dataframe for each table config
+    df_map = {df.columns.name if df.columns.name else f"df_{i}": df for i, df in enumerate(dataframes)}
+    
+    # A better heuristic would be to inspect columns, but this is a start
+    # We assume the user provides dataframes in the same order as the config
+    # or that we can distinguish them by some property.
+    
+    # A simple approach if no names are set on dataframes
+    if len(dataframes) == len(config['tables']):
+        df_map = {list(config['tables'].keys())[i]: df for i, df in enumerate(dataframes)}
+    return df_map
 
 def apply_mapping(
     dataframes: List[pd.DataFrame], 
-    config: Dict[str, Any]
+    config: Dict[str, Any],
+    deduplicator: EventDeduplicator | None = None,
+    watermarks: Watermarks | None = None,
 ) -> EventLog:
     """
     Transforms one or more pandas DataFrames into an EventLog object based on a
     mapping configuration.
 
     The configuration dictionary specifies how to extract the case ID, activity,
-    and timestamp from the tables.
+    and timestamp from the tables. Columns listed in ``case_attributes`` are
+    stored once per trace (first non-missing value) instead of on every
+    event, and equal event attribute dictionaries are shared between events.
+    Activity names and string attribute values are interned in the log's
+    vocabulary. If the configuration declares ``links`` between tables, case
+    IDs are derived from the document flow (see
+    :mod:`erp_processminer.io_erp.linking`), so tables need not carry the
+    case ID column themselves.
 
     :param dataframes: A list of pandas DataFrames, each representing an ERP table.
     :param config: A dictionary defining the mapping rules.
+    :param deduplicator: An optional EventDeduplicator; events whose key
+                         columns were already seen (in this call or in
+                         earlier runs sharing its fingerprints) are dropped.
+                         Key columns may be 'case_id', 'activity',
+                         'timestamp', 'source_table' or any column of the
+                         source tables, including the mapped ones.
+    :param watermarks: Optional per-table high-watermarks for incremental
+                       runs. Only rows whose watermark column (the table's
+                       'watermark' setting, or its timestamp column) is above
+                       the table's watermark are mapped, and the watermarks
+                       are advanced past them.
     :return: An EventLog object.
     """
-    all_events: List[Event] = []
     case_id_col = config['case_id']
     if not case_id_col:
         raise ValueError("Mapping configuration must define a non-empty 'case_id' column.")
     
-    # Heuristic to find the right dataframe for each table config
-    df_map = {df.columns.name if df.columns.name else f"df_{i}": df for i, df in enumerate(dataframes)}
-    
-    # A better heuristic would be to inspect columns, but this is a start
-    # We assume the user provides dataframes in the same order as the config
-    # or that we can distinguish them by some property.
-    
-    # A simple approach if no names are set on dataframes
-    if len(dataframes) == len(config['tables']):
-        df_map = {list(config['tables'].keys())[i]: df for i, df in enumerate(dataframes)}
+    df_map = _match_tables(dataframes, config)
 
+    derived_case_ids = None
+    if config.get('links'):
+        missing = [name for name in config['tables'] if name not in df_map]
+        if missing:
+            raise ValueError(f"No DataFrame found for tables {missing} in config.")
+        derived_case_ids = derive_case_ids({name: df_map[name] for name in config['tables']}, config)
 
+    case_attribute_cols = list(config.get('case_attributes', []))
+    case_frames: List[pd.DataFrame] = []
+    vocabulary = LogVocabulary()
+    all_events: List[Event] = []
     for table_name, table_config in config['tables'].items():
         if table_name not in df_map:
             raise ValueError(f"No DataFrame found for table '{table_name}' in config.")
         
         df = df_map[table_name]
+        if derived_case_ids is not None:
+            df = df.assign(**{case_id_col: derived_case_ids[table_name]})
         
         # Ensure required columns exist
         required_cols = {
@@ -59,38 +159,128 @@ def apply_mapping(
                 f"Available columns: {list(df.columns)}"
             )
 
-        for _, row in df.iterrows():
-            # Activity can be a static string or a column name
-            activity_source = table_config['activity']
-            if activity_source.startswith("'") and activity_source.endswith("'"):
-                activity = activity_source.strip("'")
-            else:
-                activity = row[activity_source]
-
-            excluded_cols = {
-                case_id_col,
-                table_config['entity_id'],
-                table_config['timestamp'],
-            }
-
-            event = Event(
-                case_id=str(row[case_id_col]),
-                activity=str(activity),
-                timestamp=pd.to_datetime(row[table_config['timestamp']]),
-                attributes={
-                    'source_table': table_name,
-                    **{k: v for k, v in row.items() if k not in excluded_cols}
-                }
-            )
-            all_events.append(event)
+        if watermarks is not None:
+            watermark_col = Watermarks.column(table_config)
+            df = watermarks.new_rows(table_name, df, watermark_col)
+            watermarks.advance(table_name, df, watermark_col)
+
+        rows = _table_events(df, table_name, table_config, case_id_col)
+        if deduplicator is not None:
+            keys = _deduplication_keys(df, rows, deduplicator.key_columns)
+            rows = rows[deduplicator.new_rows(deduplicator.hash_rows(keys))]
+
+        case_cols = [col for col in case_attribute_cols if col in rows.columns]
+        case_frames.append(rows[['case_id', *case_cols]])
+        attributes = vocabulary.intern_frame(
+            rows.drop(columns=['case_id', 'activity', 'timestamp', *case_cols])
+        )
+        for case_id, activity, timestamp, attrs in zip(
+            rows['case_id'].tolist(), vocabulary.activities.intern_values(rows['activity']),
+            rows['timestamp'], shared_attribute_records(attributes),
+        ):
+            all_events.append(Event(
+                case_id=case_id,
+                activity=activity,
+                timestamp=timestamp,
+                attributes=attrs,
+            ))
 
     # Group events by case_id and sort them to form traces
     all_events.sort(key=lambda e: (e.case_id, e.timestamp))
     
+    cases = case_attribute_table(pd.concat(case_frames), case_attribute_cols) \
+        if case_attribute_cols and case_frames else {}
     traces: Dict[str, Trace] = {}
     for event in all_events:
         if event.case_id not in traces:
-            traces[event.case_id] = Trace(case_id=event.case_id, events=[])
+            traces[event.case_id] = Trace.presorted(
+                event.case_id, [], cases.get(event.case_id, EMPTY_ATTRIBUTES)
+            )
         traces[event.case_id].events.append(event)
         
-    return EventLog(list(traces.values()))
+    return EventLog(list(traces.values()), vocabulary=vocabulary)
+
+def apply_object_centric_mapping(
+    dataframes: List[pd.DataFrame],
+    config: Dict[str, Any],
+) -> ObjectCentricLog:
+    """
+    Transforms one or more pandas DataFrames into an ObjectCentricLog.
+
+    Instead of a single 'case_id', each table configuration declares the
+    objects its rows refer to, as a mapping from object type to column, e.g.
+    ``"objects": {"invoice": "INVOICE_NUMBER", "purchase_order": "PO_NUMBER"}``.
+    Rows with the same activity, timestamp and entity ID are one event, so
+    an invoice covering two purchase orders becomes a single event related
+    to both. The entity ID column is the table's ``entity_id`` setting, or
+    else the column of its first object type. An event is related to the
+    objects filled in any of its rows; its attributes are taken from its
+    first row.
+
+    :param dataframes: A list of pandas DataFrames, each representing an ERP table.
+    :param config: A dictionary defining the mapping rules.
+    :return: An ObjectCentricLog object.
+    """
+    df_map = _match_tables(dataframes, config)
+
+    event_frames: List[pd.DataFrame] = []
+    relation_frames: List[pd.DataFrame] = []
+    n_events = 0
+    for table_name, table_config in config['tables'].items():
+        if table_name not in df_map:
+            raise ValueError(f"No DataFrame found for table '{table_name}' in config.")
+        df = df_map[table_name]
+
+        objects = table_config.get('objects')
+        if not objects:
+            raise ValueError(f"Table '{table_name}' must declare its 'objects'.")
+        required_cols = {table_config['timestamp'], *objects.values()}
+        missing_cols = [col for col in required_cols if col not in df.columns]
+        if missing_cols:
+            raise ValueError(
+                f"DataFrame for '{table_name}' is missing required columns: {missing_cols}. "
+                f"Available columns: {list(df.columns)}"
+            )
+
+        entity_col = table_config.get('entity_id', next(iter(objects.values())))
+        if entity_col not in df.columns:
+            raise ValueError(f"DataFrame for '{table_name}' is missing entity column '{entity_col}'.")
+
+        activity_source = table_config['activity']
+        if activity_source.startswith("'") and activity_source.endswith("'"):
+            activity = np.full(len(df), activity_source.strip("'"), dtype=object)
+        else:
+            activity = df[activity_source].astype(str).to_numpy()
+        timestamps = pd.to_datetime(df[table_config['timestamp']]).to_numpy()
+
+        # One event per (activity, timestamp, entity ID), numbered by first row
+        row_events = pd.DataFrame({
+            'activity': activity, 'timestamp': timestamps, 'entity': df[entity_col].to_numpy(),
+        }).groupby(['activity', 'timestamp', 'entity'], sort=False, dropna=False).ngroup().to_numpy()
+        _, first_rows = np.unique(row_events, return_index=True)
+        event_ids = n_events + np.arange(len(first_rows))
+        row_events = row_events + n_events
+        n_events += len(first_rows)
+
+        attributes = _attribute_frame(df, table_config, 'event_id', 'source_table', *objects.values())
+        event_frames.append(pd.concat([
+            pd.DataFrame({
+                'event_id': event_ids,
+                'activity': activity[first_rows],
+                'timestamp': timestamps[first_rows],
+                'source_table': table_name,
+            }),
+            attributes.iloc[first_rows].reset_index(drop=True),
+        ], axis=1))
+
+        for object_type, column in objects.items():
+            filled = df[column].notna().to_numpy()
+            relation_frames.append(pd.DataFrame({
+                'event_id': row_events[filled],
+                'object_id': df[column].to_numpy()[filled].astype(str),
+                'object_type': object_type,
+            }))
+
+    events = pd.concat(event_frames, ignore_index=True)
+    relations = pd.concat(relation_frames, ignore_index=True).drop_duplicates()
+    return ObjectCentricLog.from_dataframes(events, relations)
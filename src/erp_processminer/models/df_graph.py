@@ -58,6 +58,30 @@ class DFG:
             if data['frequency'] > 0:
                 data['avg_duration'] = data['total_duration'] / data['frequency']
 
+    def merge(self, other: "DFG") -> "DFG":
+        """
+        Adds the counts of another DFG to this one, e.g. the DFG of another
+        partition of the same log. Frequencies and total durations are
+        summed and average durations are recomputed.
+
+        :param other: The DFG to merge in.
+        :return: This DFG.
+        """
+        for activity, data in other.graph.nodes(data=True):
+            self.add_activity(activity)
+            self.graph.nodes[activity]['frequency'] += data.get('frequency', 0)
+        for u, v, data in other.graph.edges(data=True):
+            self.add_edge(u, v, weight=data['frequency'], duration=data['total_duration'])
+        for mine, theirs in ((self.start_activities, other.start_activities),
+                             (self.end_activities, other.end_activities)):
+            for activity, count in theirs.items():
+                mine[activity] = mine.get(activity, 0) + count
+        self.activity_frequencies = {
+            activity: frequency for activity, frequency in self.graph.nodes(data='frequency')
+        }
+        self.finalize()
+        return self
+
     def get_activities(self) -> Set[str]:
         """Returns the set of all activities in the DFG."""
         return set(self.graph.nodes)
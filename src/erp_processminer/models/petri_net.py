@@ -3,7 +3,7 @@ Defines data structures for representing Petri nets.
 """
 
 from dataclasses import dataclass, field
-from typing import Set, Dict, Tuple
+from typing import Set, Dict, Tuple, List
 
 @dataclass(frozen=True)
 class Place:
@@ -74,6 +74,13 @@ class PetriNet:
         """Returns the set of outgoing arcs for a given node."""
         return self._out_arcs.get(node, set())
 
+    def compile(self) -> "CompiledPetriNet":
+        """
+        Compiles the net into an index-based form for fast repeated replay.
+        See :class:`CompiledPetriNet`.
+        """
+        return CompiledPetriNet.from_net(self)
+
     def __repr__(self) -> str:
         return (
             f"PetriNet(name='{self.name}', "
@@ -97,4 +104,104 @@ class Marking:
         self.tokens[place] = count
 
     def __repr__(self) -> str:
-        return f"Marking({self.tokens})"
\ No newline at end of file
+        return f"Marking({self.tokens})"
+
+@dataclass(frozen=True)
+class CompiledPetriNet:
+    """
+    An index-based, immutable view of a Petri net.
+
+    Places and transitions are numbered (sorted by name, so the numbering is
+    deterministic), markings are tuples of token counts indexed by place, and
+    each transition stores the indices of its input and output places. This
+    avoids set and dictionary lookups when the same net is replayed many
+    times. Transitions without input places are never enabled, matching the
+    semantics of token-based replay.
+    """
+    places: Tuple[Place, ...]
+    transitions: Tuple[Transition, ...]
+    preset: Tuple[Tuple[int, ...], ...]
+    postset: Tuple[Tuple[int, ...], ...]
+    initial_marking: Tuple[int, ...]
+    final_marking: Tuple[int, ...]
+    transitions_by_label: Dict[str, Tuple[int, ...]]
+
+    @classmethod
+    def from_net(cls, net: PetriNet) -> "CompiledPetriNet":
+        """
+        Compiles a PetriNet. The initial marking puts one token on every
+        source place and the final marking one token on every sink place.
+
+        :param net: The Petri net to compile.
+        :return: The compiled net.
+        """
+        places = tuple(sorted(net.places, key=lambda p: p.name))
+        transitions = tuple(sorted(net.transitions, key=lambda t: t.name))
+        place_index = {p: i for i, p in enumerate(places)}
+
+        preset = tuple(
+            tuple(sorted({place_index[arc.source] for arc in net.in_arcs(t)
+                          if isinstance(arc.source, Place)}))
+            for t in transitions
+        )
+        postset = tuple(
+            tuple(sorted({place_index[arc.target] for arc in net.out_arcs(t)
+                          if isinstance(arc.target, Place)}))
+            for t in transitions
+        )
+
+        by_label: Dict[str, List[int]] = {}
+        for i, t in enumerate(transitions):
+            if t.label is not None:
+                by_label.setdefault(t.label, []).append(i)
+
+        return cls(
+            places=places,
+            transitions=transitions,
+            preset=preset,
+            postset=postset,
+            initial_marking=tuple(int(not net.in_arcs(p)) for p in places),
+            final_marking=tuple(int(not net.out_arcs(p)) for p in places),
+            transitions_by_label={k: tuple(v) for k, v in by_label.items()},
+        )
+
+    def is_enabled(self, marking: Tuple[int, ...], transition: int) -> bool:
+        """Checks whether a transition (by index) is enabled in a marking."""
+        pre = self.preset[transition]
+        return bool(pre) and all(marking[p] > 0 for p in pre)
+
+    def enabled_transitions(self, marking: Tuple[int, ...]) -> List[int]:
+        """Returns the indices of all transitions enabled in a marking."""
+        return [t for t in range(len(self.transitions)) if self.is_enabled(marking, t)]
+
+    def enabled_labels(self, marking: Tuple[int, ...]) -> Set[str]:
+        """Returns the labels of all visible transitions enabled in a marking."""
+        return {
+            label for label, ts in self.transitions_by_label.items()
+            if any(self.is_enabled(marking, t) for t in ts)
+        }
+
+    def fire(self, marking: Tuple[int, ...], transition: int) -> Tuple[int, ...]:
+        """
+        Fires a transition (by index) and returns the resulting marking.
+        The caller is responsible for checking that it is enabled.
+        """
+        tokens = list(marking)
+        for p in self.preset[transition]:
+            tokens[p] -= 1
+        for p in self.postset[transition]:
+            tokens[p] += 1
+        return tuple(tokens)
+
+    def fire_label(
+        self, marking: Tuple[int, ...], label: str
+    ) -> Tuple[int, ...] | None:
+        """
+        Fires the first enabled transition carrying the given label.
+
+        :return: The new marking, or None if no such transition is enabled.
+        """
+        for t in self.transitions_by_label.get(label, ()):
+            if self.is_enabled(marking, t):
+                return self.fire(marking, t)
+        return None
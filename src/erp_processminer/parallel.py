@@ -0,0 +1,224 @@
+"""
+Runs analyses in parallel with a map-reduce executor.
+
+An analysis runs on disjoint sets of complete cases independently (map) and
+the partial results are combined afterwards (reduce). The map step runs in a
+process pool, and workers never receive pickled events:
+
+- For a :class:`PartitionedLog`, workers receive a partition directory and
+  memory-map the partition themselves, so the peak memory of each worker is
+  about one partition. Partitions can be pruned with the manifest
+  (``start``, ``end``, ``activities``).
+- For an in-memory log, the columnar arrays are published once in shared
+  memory (see :mod:`erp_processminer.eventlog.shared`) and workers receive
+  the handle and a case range, which they attach without copying.
+
+In both cases the data can be filtered inside the workers with ``where``, a
+picklable function from ColumnarLog to ColumnarLog.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Dict, Tuple, List, Any, Callable, Iterable, Iterator
+from collections import Counter
+import numpy as np
+
+from erp_processminer.eventlog.structures import EventLog
+from erp_processminer.eventlog.columnar import ColumnarLog
+from erp_processminer.eventlog.compressed import VariantLog
+from erp_processminer.eventlog.partitioned import PartitionedLog
+from erp_processminer.eventlog.shared import SharedLog, SharedLogHandle, attach
+from erp_processminer.models.df_graph import DFG
+from erp_processminer.models.petri_net import PetriNet
+from erp_processminer.statistics.streaming import PerformanceAccumulator
+
+Where = Callable[[ColumnarLog], ColumnarLog] | None
+Source = PartitionedLog | ColumnarLog | EventLog
+
+def map_partitions(
+    dataset: PartitionedLog,
+    func: Callable[[ColumnarLog], Any],
+    max_workers: int | None = None,
+    where: Where = None,
+    start: Any = None,
+    end: Any = None,
+    activities: Iterable[str] | None = None,
+) -> Iterator[Any]:
+    """
+    Applies a function to every selected partition, in a process pool.
+
+    :param dataset: The partitioned log.
+    :param func: A picklable function computing a partial result from one
+                 partition.
+    :param max_workers: The number of worker processes; 1 runs in this
+                        process, None uses one per CPU.
+    :param where: An optional picklable filter applied to each partition
+                  before `func`.
+    :param start: Prunes partitions ending before this time.
+    :param end: Prunes partitions starting after this time.
+    :param activities: Prunes partitions containing none of these activities.
+    :return: An iterator over the partial results, in partition order.
+    """
+    paths = [dataset.partition_path(i)
+             for i in dataset.select(start=start, end=end, activities=activities)]
+    task = partial(_run_partition, func=func, where=where)
+    if max_workers == 1 or len(paths) <= 1:
+        yield from map(task, paths)
+        return
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        yield from executor.map(task, paths)
+
+def _apply(log: ColumnarLog, func: Callable[[ColumnarLog], Any], where: Where) -> Any:
+    if where is not None:
+        log = where(log)
+    return func(log)
+
+def _run_partition(path: Path, func: Callable[[ColumnarLog], Any], where: Where) -> Any:
+    return _apply(ColumnarLog.load(path), func, where)
+
+def map_cases(
+    log: ColumnarLog | EventLog,
+    func: Callable[[ColumnarLog], Any],
+    max_workers: int | None = None,
+    where: Where = None,
+    n_chunks: int | None = None,
+    attributes: bool = False,
+) -> Iterator[Any]:
+    """
+    Applies a function to chunks of consecutive cases of an in-memory log,
+    in a process pool. The log is published in shared memory for the
+    duration of the call.
+
+    :param log: The log; an EventLog is converted to columnar form once.
+    :param func: A picklable function computing a partial result from one
+                 chunk.
+    :param max_workers: The number of worker processes; 1 runs in this
+                        process, None uses one per CPU.
+    :param where: An optional picklable filter applied to each chunk
+                  before `func`.
+    :param n_chunks: The number of chunks, balanced by event count; by
+                     default one per worker.
+    :param attributes: Whether workers need the attribute columns (these
+                       are pickled, not shared).
+    :return: An iterator over the partial results, in case order.
+    """
+    columnar = log if isinstance(log, ColumnarLog) else ColumnarLog.from_event_log(log)
+    workers = max_workers or os.cpu_count() or 1
+    targets = np.linspace(0, columnar.n_events, (n_chunks or workers) + 1)
+    bounds = np.unique(np.concatenate([
+        [0], np.searchsorted(columnar.case_offsets, targets[1:-1]), [columnar.n_cases]
+    ]))
+    ranges = list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+    if workers == 1 or len(ranges) <= 1:
+        for start, stop in ranges:
+            yield _apply(columnar.case_range(start, stop), func, where)
+        return
+    with SharedLog(columnar, attributes=attributes) as shared, \
+            ProcessPoolExecutor(max_workers=workers) as executor:
+        task = partial(_run_chunk, handle=shared.handle, func=func, where=where)
+        yield from executor.map(task, ranges)
+
+def _run_chunk(bounds: Tuple[int, int], handle: SharedLogHandle,
+               func: Callable[[ColumnarLog], Any], where: Where) -> Any:
+    return _apply(attach(handle).case_range(*bounds), func, where)
+
+def _map(source: Source, func: Callable[[ColumnarLog], Any],
+         max_workers: int | None, options: Dict[str, Any]) -> Iterator[Any]:
+    if isinstance(source, PartitionedLog):
+        return map_partitions(source, func, max_workers, **options)
+    return map_cases(source, func, max_workers, **options)
+
+def _partition_dfg(log: ColumnarLog) -> DFG:
+    from erp_processminer.discovery.directly_follows import discover_dfg
+    return discover_dfg(VariantLog.from_columnar(log))[0]
+
+def parallel_dfg(source: Source, max_workers: int | None = None,
+                 **options) -> Tuple[DFG, Dict[str, int], Dict[str, int]]:
+    """
+    Discovers the DFG of a log, one partition or chunk of cases per task.
+
+    :param source: A partitioned log or an in-memory log.
+    :param max_workers: The number of worker processes.
+    :param options: Further options of :func:`map_partitions` or
+                    :func:`map_cases`, such as `where`.
+    :return: The same tuple as :func:`discover_dfg`: the DFG, the start
+             activities and the end activities.
+    """
+    dfg = DFG()
+    for part in _map(source, _partition_dfg, max_workers, options):
+        dfg.merge(part)
+    return dfg, dict(dfg.start_activities), dict(dfg.end_activities)
+
+def _partition_variants(log: ColumnarLog) -> Counter:
+    variants = VariantLog.from_columnar(log)
+    return Counter({
+        variants.variant_activities(v): count
+        for v, count in enumerate(variants.multiplicities.tolist())
+    })
+
+def parallel_variants(source: Source, max_workers: int | None = None,
+                      **options) -> Dict[Tuple[str, ...], int]:
+    """
+    Counts the variants of a log in parallel.
+
+    :param source: A partitioned log or an in-memory log.
+    :param max_workers: The number of worker processes.
+    :param options: Further options of :func:`map_partitions` or
+                    :func:`map_cases`, such as `where`.
+    :return: The number of cases of every variant, most frequent first.
+    """
+    total: Counter = Counter()
+    for part in _map(source, _partition_variants, max_workers, options):
+        total.update(part)
+    return dict(total.most_common())
+
+def _partition_performance(log: ColumnarLog, accuracy: float) -> PerformanceAccumulator:
+    accumulator = PerformanceAccumulator(accuracy)
+    accumulator.update(log)
+    return accumulator
+
+def parallel_performance(source: Source, max_workers: int | None = None,
+                         accuracy: float = 0.01, **options) -> PerformanceAccumulator:
+    """
+    Accumulates cycle times and waiting times of a log in parallel.
+
+    :param source: A partitioned log or an in-memory log.
+    :param max_workers: The number of worker processes.
+    :param accuracy: The relative accuracy of the quantile sketches.
+    :param options: Further options of :func:`map_partitions` or
+                    :func:`map_cases`, such as `where`.
+    :return: The merged accumulator; call its ``summary()`` for tables.
+    """
+    total = PerformanceAccumulator(accuracy)
+    task = partial(_partition_performance, accuracy=accuracy)
+    for part in _map(source, task, max_workers, options):
+        total.merge(part)
+    return total
+
+def _partition_conformance(log: ColumnarLog, net: PetriNet) -> List[Tuple[str, Dict]]:
+    from erp_processminer.conformance.token_replay import calculate_conformance
+    variants = VariantLog.from_columnar(log)
+    _, results = calculate_conformance(variants, net)
+    return list(zip(variants.case_ids.tolist(), results))
+
+def parallel_conformance(source: Source, net: PetriNet, max_workers: int | None = None,
+                         **options) -> Tuple[float, Dict[str, Dict]]:
+    """
+    Replays a log on a Petri net with token-based replay, in parallel.
+
+    :param source: A partitioned log or an in-memory log.
+    :param net: The Petri net model.
+    :param max_workers: The number of worker processes.
+    :param options: Further options of :func:`map_partitions` or
+                    :func:`map_cases`, such as `where`.
+    :return: A tuple with the average fitness and the replay result of
+             every case, keyed by case ID.
+    """
+    task = partial(_partition_conformance, net=net)
+    results: Dict[str, Dict] = {}
+    for part in _map(source, task, max_workers, options):
+        results.update(part)
+    fitness = sum(result['fitness'] for result in results.values())
+    return (fitness / len(results) if results else 1.0), results
@@ -4,7 +4,11 @@ event logs, such as cycle times and waiting times.
 """
 
 from typing import List, Dict, Tuple
+import numpy as np
+import pandas as pd
+
 from erp_processminer.eventlog.structures import EventLog, Trace, Event
+from erp_processminer.eventlog.columnar import ColumnarLog
 
 def calculate_cycle_time(trace: Trace) -> float | None:
     """
@@ -75,3 +79,122 @@ def get_all_waiting_times(log: EventLog) -> Dict[Tuple[str, str], List[float]]:
             all_waiting_times[pair].extend(durations)
             
     return all_waiting_times
+
+def _as_columnar(log: EventLog | ColumnarLog) -> ColumnarLog:
+    return log if isinstance(log, ColumnarLog) else ColumnarLog.from_event_log(log)
+
+def get_cycle_time_array(log: EventLog | ColumnarLog) -> np.ndarray:
+    """
+    Calculates the cycle time of every non-empty case as a NumPy array.
+
+    :param log: The event log, in object or columnar form.
+    :return: An array of cycle times in seconds, in case order.
+    """
+    columnar = _as_columnar(log)
+    lengths = columnar.trace_lengths()
+    non_empty = lengths > 0
+    first = columnar.case_offsets[:-1][non_empty]
+    last = columnar.case_offsets[1:][non_empty] - 1
+    stamps = columnar.timestamps
+    return (stamps[last] - stamps[first]) / np.timedelta64(1, 's')
+
+def get_waiting_time_arrays(
+    log: EventLog | ColumnarLog
+) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+    """
+    Calculates the waiting time of every directly-following pair of events.
+
+    Pairs are identified by an integer pair code ``source * n + target``,
+    where source and target are activity codes and n is the number of
+    activities, so ``divmod(code, n)`` recovers the two activity codes.
+
+    :param log: The event log, in object or columnar form.
+    :return: A tuple of (pair codes, waiting times in seconds, activity
+             names indexed by activity code).
+    """
+    columnar = _as_columnar(log)
+    n = len(columnar.activity_names)
+
+    # Every event that is followed by an event of the same case starts a pair
+    case_index = columnar.case_index()
+    sources = np.flatnonzero(case_index[1:] == case_index[:-1])
+
+    codes = columnar.activities.astype(np.int64)
+    pair_codes = codes[sources] * n + codes[sources + 1]
+    stamps = columnar.timestamps
+    durations = (stamps[sources + 1] - stamps[sources]) / np.timedelta64(1, 's')
+    return pair_codes, durations, columnar.activity_names
+
+def summarize_durations(
+    groups: np.ndarray, durations: np.ndarray, n_groups: int | None = None
+) -> pd.DataFrame:
+    """
+    Computes count, mean, median, p90, p95 and max of durations per group.
+
+    All statistics are computed with a single sort by (group, duration); the
+    group boundaries are read off the sorted group codes, so the cost does
+    not depend on the range of the codes. Percentiles use linear
+    interpolation, like ``numpy.percentile``.
+
+    :param groups: An integer group code per duration.
+    :param durations: The durations.
+    :param n_groups: The number of groups, if known; codes must be below it.
+    :return: A DataFrame indexed by group code, with one row per non-empty
+             group.
+    """
+    columns = ['count', 'mean', 'median', 'p90', 'p95', 'max']
+    groups = np.asarray(groups, dtype=np.int64)
+    durations = np.asarray(durations, dtype=float)
+    if n_groups is not None and groups.size and int(groups.max()) >= n_groups:
+        raise ValueError("Group codes must be below n_groups.")
+    if not groups.size:
+        return pd.DataFrame(columns=columns, index=pd.Index([], name='group'))
+
+    order = np.lexsort((durations, groups))
+    ordered = durations[order]
+    sorted_groups = groups[order]
+    starts = np.flatnonzero(np.concatenate([[True], sorted_groups[1:] != sorted_groups[:-1]]))
+    counts = np.diff(np.append(starts, groups.size))
+    present = sorted_groups[starts]
+
+    def quantile(q: float) -> np.ndarray:
+        rank = (counts - 1) * q
+        low = np.floor(rank).astype(np.int64)
+        high = np.minimum(low + 1, counts - 1)
+        frac = rank - low
+        return ordered[starts + low] * (1 - frac) + ordered[starts + high] * frac
+
+    sums = np.add.reduceat(ordered, starts)
+    return pd.DataFrame({
+        'count': counts,
+        'mean': sums / counts,
+        'median': quantile(0.5),
+        'p90': quantile(0.9),
+        'p95': quantile(0.95),
+        'max': ordered[starts + counts - 1],
+    }, index=pd.Index(present, name='group'))
+
+def get_performance_summary(log: EventLog | ColumnarLog) -> Dict[str, pd.DataFrame]:
+    """
+    Computes cycle-time and waiting-time summary tables in one pass over a
+    columnar encoding of the log.
+
+    :param log: The event log, in object or columnar form.
+    :return: A dictionary with a 'cycle_time' table (a single row) and a
+             'waiting_time' table indexed by (source, target) activity pair.
+    """
+    columnar = _as_columnar(log)
+    cycle_times = get_cycle_time_array(columnar)
+    pair_codes, durations, names = get_waiting_time_arrays(columnar)
+    n = len(names)
+
+    cycle_summary = summarize_durations(np.zeros(len(cycle_times), dtype=np.int64), cycle_times, 1)
+    waiting_summary = summarize_durations(pair_codes, durations, n * n)
+    pairs = waiting_summary.index.to_numpy()
+    name_array = np.asarray(names, dtype=object)
+    waiting_summary.index = pd.MultiIndex.from_arrays(
+        [name_array[pairs // n], name_array[pairs % n]] if n else [[], []],
+        names=['source', 'target'],
+    )
+
+    return {'cycle_time': cycle_summary, 'waiting_time': waiting_summary}
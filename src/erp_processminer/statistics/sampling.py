@@ -0,0 +1,277 @@
+"""
+Provides case sampling with error estimates for exploratory analysis.
+
+Discovery and statistics on a sample of cases are much faster than on a
+large log, but their results are only estimates. The samplers here draw
+cases without replacement and record the design of the sample, so that
+totals and means can be scaled up to the full log with confidence bounds:
+
+- :func:`uniform_sample` draws cases uniformly at random.
+- :func:`stratified_sample` samples every variant separately, so all
+  variants (including rare ones) are represented.
+- :class:`ReservoirSampler` keeps a uniform sample of a stream of cases of
+  unknown length in fixed memory.
+
+Any analysis can run on ``sample.log``. :func:`estimate_dfg` and
+:func:`estimate_cycle_time` estimate DFG edge frequencies, mean edge
+durations and the mean cycle time of the full log, using the stratified
+(Horvitz-Thompson) estimator for totals and a ratio estimator for means,
+with normal-approximation confidence intervals.
+"""
+
+import random
+from dataclasses import dataclass
+from statistics import NormalDist
+from typing import List, Dict, Iterable
+import numpy as np
+import pandas as pd
+
+from erp_processminer.eventlog.structures import EventLog, Trace
+from erp_processminer.eventlog.columnar import ColumnarLog
+from erp_processminer.eventlog.compressed import VariantLog
+
+@dataclass
+class LogSample:
+    """
+    A sample of cases and its design.
+
+    :ivar log: The sampled cases.
+    :ivar strata: The stratum of every sampled case.
+    :ivar stratum_sizes: The number of cases of every stratum in the full log.
+    :ivar method: The name of the sampling method.
+    """
+    log: EventLog
+    strata: np.ndarray
+    stratum_sizes: np.ndarray
+    method: str
+
+    @property
+    def population(self) -> int:
+        """The number of cases in the full log."""
+        return int(self.stratum_sizes.sum())
+
+    @property
+    def sample_sizes(self) -> np.ndarray:
+        """The number of sampled cases of every stratum."""
+        return np.bincount(self.strata, minlength=len(self.stratum_sizes))
+
+    @property
+    def weights(self) -> np.ndarray:
+        """The number of full-log cases each sampled case stands for."""
+        sizes = self.sample_sizes
+        return self.stratum_sizes[self.strata] / sizes[self.strata]
+
+    def __len__(self) -> int:
+        return len(self.log)
+
+    def __repr__(self) -> str:
+        return f"LogSample({self.method}, cases={len(self)}/{self.population})"
+
+def _sample_size(n: int, fraction: float | None, size: int | None) -> int:
+    if (fraction is None) == (size is None):
+        raise ValueError("Specify exactly one of fraction and size.")
+    if fraction is not None:
+        if not 0 < fraction <= 1:
+            raise ValueError("fraction must be in (0, 1].")
+        size = max(1, round(fraction * n)) if n else 0
+    if size < 0:
+        raise ValueError("size must not be negative.")
+    return min(size, n)
+
+def _sub_log(log: EventLog, cases: np.ndarray) -> EventLog:
+    return EventLog([log.traces[i] for i in cases.tolist()], vocabulary=log.vocabulary)
+
+def uniform_sample(log: EventLog, fraction: float | None = None, size: int | None = None,
+                   seed: int | None = None) -> LogSample:
+    """
+    Draws cases uniformly at random, without replacement.
+
+    :param log: The full log.
+    :param fraction: The fraction of cases to draw (or give `size`).
+    :param size: The number of cases to draw (or give `fraction`).
+    :param seed: The random seed.
+    :return: The sample, with cases in log order.
+    """
+    n = _sample_size(len(log), fraction, size)
+    cases = np.sort(np.random.default_rng(seed).choice(len(log), size=n, replace=False))
+    return LogSample(_sub_log(log, cases), np.zeros(n, dtype=np.int64),
+                     np.array([len(log)]), 'uniform')
+
+def stratified_sample(log: EventLog, fraction: float, min_per_variant: int = 1,
+                      seed: int | None = None) -> LogSample:
+    """
+    Samples the cases of every variant separately: each variant contributes
+    `fraction` of its cases, but at least `min_per_variant` (or all of them),
+    so every variant appears in the sample.
+
+    :param log: The full log.
+    :param fraction: The fraction of cases to draw per variant.
+    :param min_per_variant: The minimum number of cases per variant.
+    :param seed: The random seed.
+    :return: The sample, stratified by variant, with cases in log order.
+    """
+    if not 0 < fraction <= 1:
+        raise ValueError("fraction must be in (0, 1].")
+    variants = VariantLog.from_event_log(log).case_variants
+    sizes = np.bincount(variants)
+    quotas = np.minimum(sizes, np.maximum(min_per_variant, np.round(fraction * sizes)))
+    quotas = quotas.astype(np.int64)
+
+    # Rank the cases of each variant in random order and keep the first ones
+    order = np.random.default_rng(seed).permutation(len(variants))
+    order = order[np.argsort(variants[order], kind='stable')]
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    ranks = np.empty(len(variants), dtype=np.int64)
+    ranks[order] = np.arange(len(variants)) - np.repeat(starts, sizes)
+    cases = np.flatnonzero(ranks < quotas[variants])
+
+    return LogSample(_sub_log(log, cases), variants[cases], sizes, 'stratified')
+
+class ReservoirSampler:
+    """
+    Keeps a uniform random sample of at most `size` cases from a stream of
+    cases (reservoir sampling, Algorithm R). Memory is bounded by `size`.
+    """
+
+    def __init__(self, size: int, seed: int | None = None):
+        if size < 1:
+            raise ValueError("size must be at least 1.")
+        self.size = size
+        self.seen = 0
+        self.reservoir: List[Trace] = []
+        self._random = random.Random(seed)
+
+    def add(self, trace: Trace):
+        """Offers one case to the sample."""
+        if len(self.reservoir) < self.size:
+            self.reservoir.append(trace)
+        else:
+            slot = self._random.randrange(self.seen + 1)
+            if slot < self.size:
+                self.reservoir[slot] = trace
+        self.seen += 1
+
+    def extend(self, traces: Iterable[Trace]):
+        """Offers many cases to the sample."""
+        for trace in traces:
+            self.add(trace)
+
+    def sample(self) -> LogSample:
+        """Returns the current sample of all cases seen so far."""
+        n = len(self.reservoir)
+        return LogSample(EventLog(list(self.reservoir)), np.zeros(n, dtype=np.int64),
+                         np.array([self.seen]), 'reservoir')
+
+def _z(confidence: float) -> float:
+    if not 0 < confidence < 1:
+        raise ValueError("confidence must be between 0 and 1.")
+    return NormalDist().inv_cdf((1 + confidence) / 2)
+
+def _stratum_variance(sample: LogSample, sums: pd.DataFrame, value: str, square: str) -> pd.Series:
+    """
+    Estimates the variance of an estimated total from per-stratum sums of a
+    per-case value and of its square (zeros for cases without a row).
+    """
+    n = sample.sample_sizes[sums['stratum']].astype(float)
+    population = sample.stratum_sizes[sums['stratum']].astype(float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        spread = np.where(n > 1, (sums[square] - sums[value] ** 2 / n) / (n - 1), 0.0)
+        terms = population ** 2 * (1 - n / population) * np.clip(spread, 0, None) / n
+    return pd.Series(terms, index=sums.index)
+
+def estimate_dfg(sample: LogSample, confidence: float = 0.95) -> pd.DataFrame:
+    """
+    Estimates the DFG edge frequencies and mean edge durations of the full
+    log from a sample.
+
+    :param sample: The sample.
+    :param confidence: The confidence level of the intervals.
+    :return: A table indexed by (source, target) with the sampled frequency,
+             the estimated full-log frequency and mean duration (seconds),
+             and the lower and upper confidence bounds of both.
+    """
+    z = _z(confidence)
+    columns = ['sample_frequency', 'frequency', 'frequency_low', 'frequency_high',
+               'mean_duration', 'duration_low', 'duration_high']
+    log = ColumnarLog.from_event_log(sample.log)
+    case_index = log.case_index()
+    same_case = case_index[1:] == case_index[:-1]
+    if not same_case.any():
+        empty = pd.MultiIndex.from_tuples([], names=['source', 'target'])
+        return pd.DataFrame(columns=columns, index=empty)
+
+    n_names = len(log.activity_names)
+    durations = np.diff(log.timestamps).astype('timedelta64[ns]').astype(np.int64) / 1e9
+    per_case = pd.DataFrame({
+        'edge': (log.activities[:-1].astype(np.int64) * n_names + log.activities[1:])[same_case],
+        'case': case_index[:-1][same_case],
+        'y': 1.0,
+        'd': durations[same_case],
+    }).groupby(['edge', 'case'], sort=False).sum().reset_index()
+    per_case['stratum'] = sample.strata[per_case['case']]
+    per_case['yy'] = per_case['y'] ** 2
+    per_case['dd'] = per_case['d'] ** 2
+    per_case['dy'] = per_case['d'] * per_case['y']
+    per_case['w'] = sample.weights[per_case['case']]
+    per_case['wy'] = per_case['w'] * per_case['y']
+    per_case['wd'] = per_case['w'] * per_case['d']
+
+    sums = per_case.groupby(['edge', 'stratum']).sum()[['y', 'yy', 'd', 'dd', 'dy']].reset_index()
+    totals = per_case.groupby('edge')[['y', 'wy', 'wd']].sum()
+    ratio = (totals['wd'] / totals['wy']).rename('ratio')
+
+    # Frequency: variance of the estimated total of y
+    var_frequency = _stratum_variance(sample, sums, 'y', 'yy').groupby(sums['edge']).sum()
+    # Mean duration: linearized variance of the ratio, using z = d - R * y
+    r = ratio.reindex(sums['edge']).to_numpy()
+    sums['z'] = sums['d'] - r * sums['y']
+    sums['zz'] = sums['dd'] - 2 * r * sums['dy'] + r ** 2 * sums['yy']
+    var_ratio = _stratum_variance(sample, sums, 'z', 'zz').groupby(sums['edge']).sum() \
+        / totals['wy'] ** 2
+
+    frequency_margin = z * np.sqrt(var_frequency)
+    duration_margin = z * np.sqrt(var_ratio)
+    edges = totals.index.to_numpy()
+    result = pd.DataFrame({
+        'sample_frequency': totals['y'].astype(np.int64),
+        'frequency': totals['wy'],
+        'frequency_low': np.maximum(totals['wy'] - frequency_margin, totals['y']),
+        'frequency_high': totals['wy'] + frequency_margin,
+        'mean_duration': ratio,
+        'duration_low': ratio - duration_margin,
+        'duration_high': ratio + duration_margin,
+    })
+    result.index = pd.MultiIndex.from_arrays(
+        [[log.activity_names[e // n_names] for e in edges.tolist()],
+         [log.activity_names[e % n_names] for e in edges.tolist()]],
+        names=['source', 'target'],
+    )
+    return result.sort_values('frequency', ascending=False)
+
+def estimate_cycle_time(sample: LogSample, confidence: float = 0.95) -> Dict[str, float]:
+    """
+    Estimates the mean cycle time (seconds) of the full log from a sample.
+    Cases without events count with a cycle time of zero.
+
+    :param sample: The sample.
+    :param confidence: The confidence level of the interval.
+    :return: A dictionary with the 'mean' estimate and its 'low' and 'high'
+             confidence bounds.
+    """
+    z = _z(confidence)
+    log = ColumnarLog.from_event_log(sample.log)
+    if not log.n_cases:
+        return {'mean': float('nan'), 'low': float('nan'), 'high': float('nan')}
+    non_empty = log.trace_lengths() > 0
+    first = log.case_offsets[:-1][non_empty]
+    last = log.case_offsets[1:][non_empty] - 1
+    cycle_times = np.zeros(log.n_cases)
+    cycle_times[non_empty] = (log.timestamps[last] - log.timestamps[first]) / np.timedelta64(1, 's')
+
+    # The stratified mean is the estimated total divided by the population
+    per_case = pd.DataFrame({'stratum': sample.strata, 'y': cycle_times, 'yy': cycle_times ** 2})
+    sums = per_case.groupby('stratum').sum().reset_index()
+    mean = float((sample.weights * cycle_times).sum() / sample.population)
+    variance = _stratum_variance(sample, sums, 'y', 'yy').sum()
+    margin = z * float(np.sqrt(variance)) / sample.population
+    return {'mean': mean, 'low': mean - margin, 'high': mean + margin}
@@ -0,0 +1,312 @@
+"""
+Provides bounded-memory, mergeable accumulators for performance statistics.
+
+Unlike :func:`erp_processminer.statistics.performance.get_all_waiting_times`,
+these accumulators never keep the raw durations. They can be fed trace by
+trace or chunk by chunk, merged across workers, and summarized at the end:
+
+- :class:`RunningStats` keeps count, mean, variance (Welford), min and max.
+- :class:`QuantileSketch` is a relative-error, log-bucketed quantile sketch.
+- :class:`Histogram` counts durations in fixed bins.
+- :class:`PerformanceAccumulator` combines them for cycle times and for the
+  waiting times of every activity pair.
+"""
+
+import math
+from typing import Dict, Tuple, Iterable
+import numpy as np
+import pandas as pd
+
+from erp_processminer.eventlog.structures import EventLog, Trace
+from erp_processminer.eventlog.columnar import ColumnarLog
+from erp_processminer.statistics.performance import (
+    get_cycle_time_array, get_waiting_time_arrays
+)
+
+class RunningStats:
+    """
+    Running count, mean, variance, min and max using Welford's algorithm.
+    Two instances are merged with Chan's parallel update.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float):
+        """Adds a single observation."""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def add_array(self, values: np.ndarray):
+        """Adds a batch of observations."""
+        values = np.asarray(values, dtype=float)
+        if not values.size:
+            return
+        batch = RunningStats()
+        batch.count = values.size
+        batch.mean = float(values.mean())
+        batch.m2 = float(((values - batch.mean) ** 2).sum())
+        batch.min = float(values.min())
+        batch.max = float(values.max())
+        self.merge(batch)
+
+    def merge(self, other: "RunningStats"):
+        """Merges another accumulator into this one."""
+        if other.count == 0:
+            return
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def variance(self) -> float:
+        """The sample variance, or 0 for fewer than two observations."""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        """The sample standard deviation."""
+        return math.sqrt(self.variance)
+
+class QuantileSketch:
+    """
+    A mergeable quantile sketch with relative accuracy (DDSketch).
+
+    Positive values are counted in logarithmic buckets of ratio
+    ``(1 + accuracy) / (1 - accuracy)``, so every quantile estimate is within
+    ``accuracy`` of the true value relative to its size. Values at or below
+    `min_value` are counted as zero. If the number of buckets exceeds
+    `max_buckets`, the lowest buckets are collapsed, which only affects the
+    accuracy of the smallest quantiles.
+    """
+
+    def __init__(self, accuracy: float = 0.01, min_value: float = 1e-3, max_buckets: int = 2048):
+        if not 0 < accuracy < 1:
+            raise ValueError("accuracy must be between 0 and 1.")
+        self.accuracy = accuracy
+        self.gamma = (1 + accuracy) / (1 - accuracy)
+        self.min_value = min_value
+        self.max_buckets = max_buckets
+        self.zero_count = 0
+        self.buckets: Dict[int, int] = {}
+
+    @property
+    def count(self) -> int:
+        """The number of observations."""
+        return self.zero_count + sum(self.buckets.values())
+
+    def _key(self, value: float) -> int:
+        return math.ceil(math.log(value) / math.log(self.gamma))
+
+    def add(self, value: float):
+        """Adds a single observation."""
+        if value <= self.min_value:
+            self.zero_count += 1
+        else:
+            key = self._key(value)
+            self.buckets[key] = self.buckets.get(key, 0) + 1
+            self._collapse()
+
+    def add_array(self, values: np.ndarray):
+        """Adds a batch of observations."""
+        values = np.asarray(values, dtype=float)
+        positive = values[values > self.min_value]
+        self.zero_count += values.size - positive.size
+        if positive.size:
+            keys = np.ceil(np.log(positive) / math.log(self.gamma)).astype(np.int64)
+            unique, counts = np.unique(keys, return_counts=True)
+            for key, count in zip(unique.tolist(), counts.tolist()):
+                self.buckets[key] = self.buckets.get(key, 0) + count
+            self._collapse()
+
+    def merge(self, other: "QuantileSketch"):
+        """Merges another sketch with the same accuracy into this one."""
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge sketches with different accuracy.")
+        self.zero_count += other.zero_count
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        self._collapse()
+
+    def _collapse(self):
+        if len(self.buckets) <= self.max_buckets:
+            return
+        keys = sorted(self.buckets)
+        excess = keys[:len(keys) - self.max_buckets + 1]
+        merged = sum(self.buckets.pop(key) for key in excess)
+        self.buckets[excess[-1]] = merged
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimates the q-quantile (0 <= q <= 1).
+
+        :return: The estimate, or NaN if the sketch is empty.
+        """
+        total = self.count
+        if total == 0:
+            return math.nan
+        rank = q * (total - 1)
+        if rank < self.zero_count:
+            return 0.0
+        seen = self.zero_count
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if seen > rank:
+                return 2 * self.gamma ** key / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+class Histogram:
+    """
+    A fixed-bin histogram. Values below the first edge or above the last are
+    counted in the first and last bin respectively, so no value is lost.
+    Histograms are mergeable if their edges are identical.
+    """
+
+    def __init__(self, edges: Iterable[float] | None = None):
+        if edges is None:
+            # One minute to roughly one year, log-spaced
+            edges = np.geomspace(60.0, 60.0 * 60 * 24 * 365, 33)
+        self.edges = np.asarray(list(edges), dtype=float)
+        self.counts = np.zeros(len(self.edges) - 1, dtype=np.int64)
+
+    def add(self, value: float):
+        """Adds a single observation."""
+        self.add_array(np.array([value]))
+
+    def add_array(self, values: np.ndarray):
+        """Adds a batch of observations."""
+        bins = np.searchsorted(self.edges, np.asarray(values, dtype=float), side='right') - 1
+        np.clip(bins, 0, len(self.counts) - 1, out=bins)
+        self.counts += np.bincount(bins, minlength=len(self.counts))
+
+    def merge(self, other: "Histogram"):
+        """Merges another histogram with the same edges into this one."""
+        if not np.array_equal(self.edges, other.edges):
+            raise ValueError("Cannot merge histograms with different edges.")
+        self.counts += other.counts
+
+class DurationAccumulator:
+    """Running statistics, a quantile sketch and a histogram of durations."""
+
+    def __init__(self, accuracy: float = 0.01, edges: Iterable[float] | None = None):
+        self.stats = RunningStats()
+        self.sketch = QuantileSketch(accuracy)
+        self.histogram = Histogram(edges)
+
+    def add(self, value: float):
+        """Adds a single duration."""
+        self.stats.add(value)
+        self.sketch.add(value)
+        self.histogram.add(value)
+
+    def add_array(self, values: np.ndarray):
+        """Adds a batch of durations."""
+        self.stats.add_array(values)
+        self.sketch.add_array(values)
+        self.histogram.add_array(values)
+
+    def merge(self, other: "DurationAccumulator"):
+        """Merges another accumulator into this one."""
+        self.stats.merge(other.stats)
+        self.sketch.merge(other.sketch)
+        self.histogram.merge(other.histogram)
+
+    def summary(self) -> Dict[str, float]:
+        """Returns count, mean, std, min, max and approximate percentiles."""
+        return {
+            'count': self.stats.count,
+            'mean': self.stats.mean,
+            'std': self.stats.std,
+            'min': self.stats.min,
+            'median': self.sketch.quantile(0.5),
+            'p90': self.sketch.quantile(0.9),
+            'p95': self.sketch.quantile(0.95),
+            'max': self.stats.max,
+        }
+
+class PerformanceAccumulator:
+    """
+    Streams cycle times and waiting times per activity pair into
+    bounded-memory accumulators.
+
+    Memory grows with the number of distinct activity pairs, never with the
+    number of observed durations. Accumulators built by different workers
+    (with the same accuracy and histogram edges) can be merged.
+    """
+
+    def __init__(self, accuracy: float = 0.01, edges: Iterable[float] | None = None):
+        self.accuracy = accuracy
+        self.edges = None if edges is None else list(edges)
+        self.cycle_time = DurationAccumulator(accuracy, self.edges)
+        self.waiting_times: Dict[Tuple[str, str], DurationAccumulator] = {}
+
+    def _pair(self, pair: Tuple[str, str]) -> DurationAccumulator:
+        accumulator = self.waiting_times.get(pair)
+        if accumulator is None:
+            accumulator = DurationAccumulator(self.accuracy, self.edges)
+            self.waiting_times[pair] = accumulator
+        return accumulator
+
+    def update_trace(self, trace: Trace):
+        """Adds the cycle time and waiting times of a single trace."""
+        events = trace.events
+        if not events:
+            return
+        self.cycle_time.add((events[-1].timestamp - events[0].timestamp).total_seconds())
+        for source, target in zip(events, events[1:]):
+            self._pair((source.activity, target.activity)).add(
+                (target.timestamp - source.timestamp).total_seconds()
+            )
+
+    def update(self, chunk: EventLog | ColumnarLog):
+        """
+        Adds a chunk of cases. The chunk is processed with the vectorized
+        functions of the performance module and then discarded.
+        """
+        columnar = chunk if isinstance(chunk, ColumnarLog) else ColumnarLog.from_event_log(chunk)
+        self.cycle_time.add_array(get_cycle_time_array(columnar))
+
+        pair_codes, durations, names = get_waiting_time_arrays(columnar)
+        if not pair_codes.size:
+            return
+        n = len(names)
+        order = np.argsort(pair_codes, kind='stable')
+        codes, starts = np.unique(pair_codes[order], return_index=True)
+        for code, group in zip(codes.tolist(), np.split(durations[order], starts[1:])):
+            self._pair((names[code // n], names[code % n])).add_array(group)
+
+    def merge(self, other: "PerformanceAccumulator"):
+        """Merges another accumulator (e.g. from another worker) into this one."""
+        self.cycle_time.merge(other.cycle_time)
+        for pair, accumulator in other.waiting_times.items():
+            self._pair(pair).merge(accumulator)
+
+    def summary(self) -> Dict[str, pd.DataFrame]:
+        """
+        Summarizes the accumulated durations.
+
+        :return: A dictionary with a one-row 'cycle_time' table and a
+                 'waiting_time' table indexed by (source, target).
+        """
+        pairs = sorted(self.waiting_times)
+        waiting = pd.DataFrame(
+            [self.waiting_times[pair].summary() for pair in pairs],
+            index=pd.MultiIndex.from_tuples(pairs, names=['source', 'target'])
+            if pairs else None,
+        )
+        return {
+            'cycle_time': pd.DataFrame([self.cycle_time.summary()]),
+            'waiting_time': waiting,
+        }
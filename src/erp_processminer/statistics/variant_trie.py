@@ -0,0 +1,207 @@
+"""
+Provides a prefix-tree (trie) index over the process variants of a log.
+
+Every node of the trie is a prefix of at least one trace, labelled by an
+integer activity code and annotated with the number of cases passing through
+it and ending in it. Because variants share prefixes, the index is compact,
+is built in a single pass, and answers prefix, top-k and coverage queries
+without rescanning the log. The same trie serves as the prefix automaton of
+ETC precision (see :mod:`erp_processminer.conformance.precision`).
+"""
+
+import heapq
+from typing import List, Dict, Tuple, Iterable, Sequence
+
+from erp_processminer.eventlog.structures import EventLog
+from erp_processminer.eventlog.columnar import ColumnarLog
+
+class VariantTrie:
+    """
+    A trie of activity-code sequences with per-node case counts.
+
+    Node 0 is the root (empty prefix). For every node, ``counts`` holds the
+    number of cases whose trace starts with the node's prefix and ``ends``
+    the number of cases whose trace is exactly that prefix, i.e. the
+    frequency of the variant ending there. If built with
+    ``store_case_ids=True``, the case IDs of each variant are kept in
+    ``postings``.
+    """
+
+    def __init__(self, activity_names: Sequence[str] = (), store_case_ids: bool = False):
+        self.activity_names: List[str] = list(activity_names)
+        self._codes: Dict[str, int] = {a: i for i, a in enumerate(self.activity_names)}
+        self.parents: List[int] = [-1]
+        self.labels: List[int] = [-1]
+        self.counts: List[int] = [0]
+        self.ends: List[int] = [0]
+        self.children: List[Dict[int, int]] = [{}]
+        self.postings: Dict[int, List[str]] | None = {} if store_case_ids else None
+
+    @classmethod
+    def from_log(cls, log: EventLog | ColumnarLog, store_case_ids: bool = False) -> "VariantTrie":
+        """
+        Builds the trie of an event log in a single pass over its cases.
+
+        :param log: The event log, in object or columnar form.
+        :param store_case_ids: Whether to keep the case IDs of each variant.
+        :return: The variant trie.
+        """
+        if isinstance(log, ColumnarLog):
+            trie = cls(log.activity_names, store_case_ids)
+            codes = log.activities.tolist()
+            offsets = log.case_offsets.tolist()
+            for i, case_id in enumerate(log.case_ids.tolist()):
+                trie.add_codes(codes[offsets[i]:offsets[i + 1]], case_id)
+        else:
+            trie = cls(store_case_ids=store_case_ids)
+            for trace in log:
+                trie.add_codes(
+                    [trie.encode(event.activity) for event in trace], trace.case_id
+                )
+        return trie
+
+    def encode(self, activity: str) -> int:
+        """Returns the code of an activity, registering it if it is new."""
+        code = self._codes.get(activity)
+        if code is None:
+            code = len(self.activity_names)
+            self._codes[activity] = code
+            self.activity_names.append(activity)
+        return code
+
+    @classmethod
+    def from_variants(cls, variants: Dict[Tuple[str, ...], int]) -> "VariantTrie":
+        """
+        Builds the trie from a mapping of variants to their frequency, so
+        each distinct sequence is inserted only once.
+
+        :param variants: A dictionary mapping activity tuples to counts.
+        :return: The variant trie (without case IDs).
+        """
+        trie = cls()
+        for variant, count in variants.items():
+            trie.add_sequence(variant, count)
+        return trie
+
+    def add_sequence(self, activities: Iterable[str], weight: int = 1):
+        """Inserts `weight` cases given as a sequence of activity names."""
+        self.add_codes([self.encode(activity) for activity in activities], weight=weight)
+
+    def add_codes(self, codes: Iterable[int], case_id: str | None = None, weight: int = 1):
+        """
+        Inserts a case given as a sequence of activity codes, or `weight`
+        cases of the same variant.
+        """
+        node = 0
+        self.counts[0] += weight
+        for code in codes:
+            child = self.children[node].get(code)
+            if child is None:
+                child = len(self.parents)
+                self.parents.append(node)
+                self.labels.append(code)
+                self.counts.append(0)
+                self.ends.append(0)
+                self.children.append({})
+                self.children[node][code] = child
+            self.counts[child] += weight
+            node = child
+        self.ends[node] += weight
+        if self.postings is not None and case_id is not None:
+            self.postings.setdefault(node, []).append(case_id)
+
+    def find(self, prefix: Sequence[str]) -> int | None:
+        """Returns the node of a prefix of activity names, or None."""
+        node = 0
+        for activity in prefix:
+            code = self._codes.get(activity)
+            node = self.children[node].get(code) if code is not None else None
+            if node is None:
+                return None
+        return node
+
+    def variant(self, node: int) -> Tuple[str, ...]:
+        """Returns the activity sequence of a node."""
+        labels = []
+        while node > 0:
+            labels.append(self.activity_names[self.labels[node]])
+            node = self.parents[node]
+        return tuple(reversed(labels))
+
+    def _variant_nodes(self, root: int = 0) -> List[int]:
+        nodes, stack = [], [root]
+        while stack:
+            node = stack.pop()
+            if self.ends[node]:
+                nodes.append(node)
+            stack.extend(self.children[node].values())
+        return nodes
+
+    @property
+    def n_cases(self) -> int:
+        """The number of indexed cases."""
+        return self.counts[0]
+
+    @property
+    def n_variants(self) -> int:
+        """The number of distinct variants."""
+        return sum(1 for end in self.ends if end)
+
+    def count_with_prefix(self, prefix: Sequence[str]) -> int:
+        """Returns the number of cases whose trace starts with `prefix`."""
+        node = self.find(prefix)
+        return self.counts[node] if node is not None else 0
+
+    def variants_with_prefix(self, prefix: Sequence[str]) -> Dict[Tuple[str, ...], int]:
+        """
+        Returns all variants starting with `prefix` and their frequencies.
+
+        :param prefix: A sequence of activity names, e.g. ('Create PO', 'Approve').
+        :return: A dictionary mapping variants to case counts.
+        """
+        node = self.find(prefix)
+        if node is None:
+            return {}
+        return {self.variant(n): self.ends[n] for n in self._variant_nodes(node)}
+
+    def top_k(self, k: int) -> List[Tuple[Tuple[str, ...], int]]:
+        """
+        Returns the `k` most frequent variants with their frequencies.
+        """
+        nodes = heapq.nlargest(k, self._variant_nodes(), key=lambda n: self.ends[n])
+        return [(self.variant(n), self.ends[n]) for n in nodes]
+
+    def coverage(self, k: int) -> float:
+        """Returns the share of cases covered by the `k` most frequent variants."""
+        if self.n_cases == 0:
+            return 0.0
+        top = heapq.nlargest(k, (self.ends[n] for n in self._variant_nodes()))
+        return sum(top) / self.n_cases
+
+    def variants_for_coverage(self, fraction: float) -> int:
+        """
+        Returns the minimum number of most frequent variants needed to cover
+        at least `fraction` of the cases.
+        """
+        frequencies = sorted((self.ends[n] for n in self._variant_nodes()), reverse=True)
+        covered = 0
+        for i, frequency in enumerate(frequencies, start=1):
+            covered += frequency
+            if covered >= fraction * self.n_cases:
+                return i
+        return len(frequencies)
+
+    def case_ids(self, variant: Sequence[str]) -> List[str]:
+        """
+        Returns the case IDs of a variant. Requires ``store_case_ids=True``.
+        """
+        if self.postings is None:
+            raise ValueError("The trie was built without case IDs (store_case_ids=False).")
+        node = self.find(variant)
+        return list(self.postings.get(node, [])) if node is not None else []
+
+    def __len__(self) -> int:
+        return len(self.parents)
+
+    def __repr__(self) -> str:
+        return f"VariantTrie(nodes={len(self)}, variants={self.n_variants}, cases={self.n_cases})"
@@ -5,6 +5,7 @@ Provides functions for analyzing process variants in an event log.
 from typing import List, Dict, Tuple
 from collections import Counter
 from erp_processminer.eventlog.structures import EventLog, Trace
+from erp_processminer.cache import ResultCache
 
 def get_trace_variant(trace: Trace) -> Tuple[str, ...]:
     """
@@ -33,21 +34,29 @@ def get_variants(log: EventLog) -> Dict[Tuple[str, ...], List[Trace]]:
         variants[variant].append(trace)
     return variants
 
-def get_variant_performance(log: EventLog) -> Dict[Tuple[str, ...], Dict]:
+def get_variant_performance(
+    log: EventLog, cache: ResultCache | None = None
+) -> Dict[Tuple[str, ...], Dict]:
     """
     Calculates performance statistics for each process variant.
 
     :param log: The event log to analyze.
+    :param cache: An optional result cache.
     :return: A dictionary mapping each variant to its performance stats
              (e.g., frequency, average cycle time).
     """
-    from .performance import get_cycle_times
+    if cache is not None:
+        return cache.get_or_compute(
+            log, 'get_variant_performance', {}, lambda: get_variant_performance(log)
+        )
+
+    from .performance import calculate_cycle_time
     
     variants = get_variants(log)
     variant_performance = {}
     
     for variant, traces in variants.items():
-        cycle_times = get_cycle_times(EventLog(traces))
+        cycle_times = [ct for ct in map(calculate_cycle_time, traces) if ct is not None]
         
         avg_cycle_time = sum(cycle_times) / len(cycle_times) if cycle_times else 0
         
@@ -0,0 +1,83 @@
+"""
+Tests for bitmap attribute indexes.
+"""
+
+import numpy as np
+import pandas as pd
+from erp_processminer.eventlog.serialization import dataframe_to_log
+from erp_processminer.eventlog.columnar import ColumnarLog
+from erp_processminer.eventlog.bitmap_index import Bitmap, LogIndex
+from erp_processminer.filters.attribute_filters import filter_log_by_event_attribute
+
+def _log():
+    return dataframe_to_log(pd.DataFrame([
+        ['C-01', 'A', '2023-01-01 10:00:00', 'P1', 'V1'],
+        ['C-01', 'B', '2023-01-01 11:00:00', 'P2', 'V1'],
+        ['C-02', 'A', '2023-01-02 10:00:00', 'P1', 'V2'],
+        ['C-02', 'C', '2023-01-02 11:00:00', 'P3', 'V2'],
+        ['C-03', 'B', '2023-01-03 10:00:00', 'P2', 'V1'],
+    ], columns=['case_id', 'activity', 'timestamp', 'plant', 'vendor']))
+
+def test_bitmap_operations():
+    """Tests set operations across sparse and dense bitmaps."""
+    rng = np.random.default_rng(1)
+    a_mask = rng.random(1000) < 0.5
+    b_mask = np.zeros(1000, dtype=bool)
+    b_mask[[3, 500, 999]] = True
+    a, b = Bitmap.from_mask(a_mask), Bitmap.from_mask(b_mask)
+    assert not a.is_sparse and b.is_sparse
+
+    assert np.array_equal((a & b).to_mask(), a_mask & b_mask)
+    assert np.array_equal((a | b).to_mask(), a_mask | b_mask)
+    assert np.array_equal((a - b).to_mask(), a_mask & ~b_mask)
+    assert np.array_equal((~b).to_mask(), ~b_mask)
+    assert (b | b).count() == 3
+
+def test_log_index_select_and_persist(tmp_path):
+    """
+    Tests that indexed filtering matches the linear-scan filter and that the
+    index survives a save/load round trip.
+    """
+    log = _log()
+    index = LogIndex.build(log, event_keys=['plant'], case_keys=['vendor'])
+
+    selection = index.event('plant').isin({'P1', 'P2'})
+    expected = filter_log_by_event_attribute(log, 'plant', {'P1', 'P2'})
+    selected = index.select(log, events=selection)
+    assert [[e.activity for e in t] for t in selected] == \
+           [[e.activity for e in t] for t in expected]
+
+    path = tmp_path / "log.csv.idx.npz"
+    index.save(path)
+    loaded = LogIndex.load(path)
+    assert loaded.case('vendor').values() == ['V1', 'V2']
+
+    by_vendor = loaded.select(
+        ColumnarLog.from_event_log(log),
+        events=~loaded.event('plant').eq('P2'),
+        cases=loaded.case('vendor').eq('V1'),
+    )
+    assert by_vendor.case_ids.tolist() == ['C-01']
+    assert by_vendor.n_events == 1
+
+def test_typed_values_survive_save_and_load(tmp_path):
+    """Tests that timestamp and decimal values keep their type after reload."""
+    from decimal import Decimal
+    df = pd.DataFrame({
+        'case_id': ['C-01', 'C-01', 'C-02', 'C-02', 'C-03'],
+        'activity': ['A', 'B', 'A', 'C', 'B'],
+        'timestamp': pd.date_range('2023-01-01', periods=5, freq='h'),
+        'due': pd.Series([pd.Timestamp('2023-02-01'), pd.Timestamp('2023-02-01'),
+                          pd.Timestamp('2023-03-01 12:30:00.250'), 'open',
+                          Decimal('9.50')], dtype=object),
+    })
+    log = dataframe_to_log(df)
+    index = LogIndex.build(log, event_keys=['due'])
+
+    path = tmp_path / "typed.idx.npz"
+    index.save(path)
+    loaded = LogIndex.load(path)
+    assert loaded.event('due').eq(pd.Timestamp('2023-02-01')).count() == 2
+    assert loaded.event('due').eq(pd.Timestamp('2023-03-01 12:30:00.250')).count() == 1
+    assert loaded.event('due').eq(Decimal('9.50')).count() == 1
+    assert loaded.event('due').values() == index.event('due').values()
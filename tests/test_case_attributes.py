@@ -0,0 +1,56 @@
+"""
+Tests for trace-level attributes and shared event attribute dictionaries.
+"""
+
+import pandas as pd
+from erp_processminer.io_erp.mappings import apply_mapping
+from erp_processminer.eventlog.serialization import log_to_dataframe, dataframe_to_log
+from erp_processminer.eventlog.columnar import ColumnarLog
+from erp_processminer.eventlog.bitmap_index import LogIndex
+
+def _log():
+    po_df = pd.DataFrame({
+        "PO_NUMBER": ["PO-1", "PO-2"],
+        "VENDOR": ["V-1", "V-2"],
+        "PLANT": ["P100", "P100"],
+        "CREATION_DATE": pd.to_datetime(["2023-01-01", "2023-01-02"]),
+    })
+    gr_df = pd.DataFrame({
+        "PO_NUMBER": ["PO-1", "PO-1", "PO-2"],
+        "PLANT": ["P100", "P100", "P200"],
+        "RECEIPT_DATE": pd.to_datetime(["2023-01-03", "2023-01-04", "2023-01-05"]),
+    })
+    config = {
+        "case_id": "PO_NUMBER",
+        "case_attributes": ["VENDOR"],
+        "tables": {
+            "purchase_orders": {"entity_id": "PO_NUMBER", "activity": "'Create PO'",
+                                "timestamp": "CREATION_DATE"},
+            "goods_receipts": {"entity_id": "PO_NUMBER", "activity": "'Receive Goods'",
+                               "timestamp": "RECEIPT_DATE"},
+        },
+    }
+    return apply_mapping([po_df, gr_df], config)
+
+def test_case_attributes_are_stored_once_per_trace():
+    """Tests the case-attribute table and the shared event dictionaries."""
+    log = _log()
+    trace = log.get_trace("PO-1")
+    assert trace.attributes == {"VENDOR": "V-1"}
+    assert all("VENDOR" not in e.attributes for e in trace)
+    # Both goods receipts of PO-1 have equal attributes and share one dict
+    assert trace.events[1].attributes is trace.events[2].attributes
+
+def test_case_attributes_round_trip():
+    """Tests re-expansion in log_to_dataframe and the columnar and index paths."""
+    log = _log()
+    df = log_to_dataframe(log)
+    assert df.loc[df['case_id'] == 'PO-2', 'VENDOR'].tolist() == ['V-2', 'V-2']
+
+    again = dataframe_to_log(df, case_attributes=["VENDOR"])
+    assert again.get_trace("PO-2").attributes == {"VENDOR": "V-2"}
+
+    columnar = ColumnarLog.from_event_log(log)
+    assert columnar.select_cases([1]).to_event_log().traces[0].attributes == {"VENDOR": "V-2"}
+    index = LogIndex.build(log, case_keys=["VENDOR"])
+    assert index.case("VENDOR").eq("V-1").positions().tolist() == [0]
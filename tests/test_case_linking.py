@@ -0,0 +1,51 @@
+"""
+Tests for case-ID derivation from document-flow links.
+"""
+
+import numpy as np
+import pandas as pd
+from erp_processminer.io_erp.mappings import apply_mapping
+from erp_processminer.io_erp.linking import connected_components
+
+def test_connected_components_matches_chains():
+    """Tests the vectorized union-find on a long chain and isolated nodes."""
+    n = 1000
+    rng = np.random.default_rng(0)
+    order = rng.permutation(n - 2)
+    labels = connected_components(n, order[:-1], order[1:])
+    assert len(set(labels[order].tolist())) == 1
+    assert (labels[order] == order.min()).all()
+    assert labels[n - 2] == n - 2 and labels[n - 1] == n - 1
+
+def test_apply_mapping_derives_case_ids_through_links():
+    """Tests that invoices linked only to goods receipts join the PO's case."""
+    po_df = pd.DataFrame({"PO_NUMBER": ["PO-1", "PO-2"],
+                          "CREATION_DATE": pd.to_datetime(["2023-01-01", "2023-01-02"])})
+    gr_df = pd.DataFrame({"GR_NUMBER": ["GR-1", "GR-2", "GR-3"],
+                          "PO_NUMBER": ["PO-1", "PO-1", "PO-2"],
+                          "RECEIPT_DATE": pd.to_datetime(["2023-01-03", "2023-01-04", "2023-01-05"])})
+    inv_df = pd.DataFrame({"INVOICE_NUMBER": ["INV-1", "INV-2"],
+                           "GR_NUMBER": ["GR-2", "GR-9"],
+                           "INVOICE_DATE": pd.to_datetime(["2023-01-06", "2023-01-07"])})
+    config = {
+        "case_id": "PO_NUMBER",
+        "tables": {
+            "purchase_orders": {"entity_id": "PO_NUMBER", "activity": "'Create PO'",
+                                "timestamp": "CREATION_DATE"},
+            "goods_receipts": {"entity_id": "GR_NUMBER", "activity": "'Receive Goods'",
+                               "timestamp": "RECEIPT_DATE"},
+            "invoices": {"entity_id": "INVOICE_NUMBER", "activity": "'Receive Invoice'",
+                         "timestamp": "INVOICE_DATE"},
+        },
+        "links": [
+            {"left": "goods_receipts", "right": "purchase_orders", "on": "PO_NUMBER"},
+            {"left": "invoices", "right": "goods_receipts", "on": "GR_NUMBER"},
+        ],
+    }
+    log = apply_mapping([po_df, gr_df, inv_df], config)
+
+    assert [e.activity for e in log.get_trace("PO-1")] == \
+           ["Create PO", "Receive Goods", "Receive Goods", "Receive Invoice"]
+    assert len(log.get_trace("PO-2")) == 2
+    # The invoice for an unknown receipt forms its own case
+    assert len(log) == 3
@@ -0,0 +1,100 @@
+"""
+Tests for the command-line interface.
+"""
+
+import json
+import sys
+import pandas as pd
+import pytest
+from erp_processminer import cli
+from erp_processminer.eventlog.serialization import import_log_from_csv
+
+CONFIG = {
+    "case_id": "PO_NUMBER",
+    "tables": {
+        "goods_receipts": {
+            "entity_id": "GR_NUMBER",
+            "activity": "'Receive Goods'",
+            "timestamp": "RECEIPT_DATE",
+            "watermark": "CHANGE_NR",
+        }
+    },
+}
+
+def _run(monkeypatch, *argv):
+    monkeypatch.setattr(sys, 'argv', ['erp-processminer', *argv])
+    cli.main()
+
+def _inputs(tmp_path, rows):
+    config = tmp_path / "config.json"
+    config.write_text(json.dumps(CONFIG))
+    extract = tmp_path / "goods_receipts.csv"
+    pd.DataFrame(rows, columns=["GR_NUMBER", "PO_NUMBER", "RECEIPT_DATE", "CHANGE_NR"]) \
+        .to_csv(extract, index=False)
+    return str(config), str(extract)
+
+def test_fingerprints_require_an_appending_run(tmp_path, monkeypatch):
+    """Tests that saved fingerprints are rejected for a full export."""
+    config, extract = _inputs(tmp_path, [["G1", "PO-1", "2023-01-05", 1]])
+    with pytest.raises(SystemExit):
+        _run(monkeypatch, "erp-to-log", config, extract, "-o", str(tmp_path / "log.csv"),
+             "--dedup-keys", "case_id", "GR_NUMBER",
+             "--fingerprints", str(tmp_path / "fingerprints.npy"))
+    assert not (tmp_path / "fingerprints.npy").exists()
+
+def test_fingerprints_are_saved_after_the_output(tmp_path, monkeypatch):
+    """Tests that a failed append leaves the fingerprints and watermarks unsaved."""
+    config, extract = _inputs(tmp_path, [["G1", "PO-1", "2023-01-05", 1]])
+    output = tmp_path / "log.csv"
+    fingerprints = tmp_path / "fingerprints.npy"
+    options = ["-o", str(output), "--dedup-keys", "case_id", "GR_NUMBER",
+               "--fingerprints", str(fingerprints), "--watermarks", str(tmp_path / "wm.json")]
+
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+    monkeypatch.setattr(cli, 'append_log_to_csv', fail)
+    with pytest.raises(OSError):
+        _run(monkeypatch, "erp-to-log", config, extract, *options)
+    assert not fingerprints.exists()
+
+    monkeypatch.undo()
+    _run(monkeypatch, "erp-to-log", config, extract, *options)
+    assert fingerprints.exists()
+    assert [t.case_id for t in import_log_from_csv(output)] == ["PO-1"]
+
+def test_csv_append_with_new_columns_fails_without_rewriting(tmp_path):
+    """Tests that new attribute columns are reported instead of rewriting the file."""
+    from erp_processminer.eventlog.serialization import dataframe_to_log, export_log_to_csv
+    output = tmp_path / "log.csv"
+    export_log_to_csv(dataframe_to_log(pd.DataFrame(
+        [["PO-1", "Create PO", "2023-01-01"]], columns=["case_id", "activity", "timestamp"]
+    )), output)
+    before = output.read_text()
+
+    delta = dataframe_to_log(pd.DataFrame(
+        [["PO-1", "Approve", "2023-01-02", "U1"]],
+        columns=["case_id", "activity", "timestamp", "USER"],
+    ))
+    with pytest.raises(ValueError, match="USER"):
+        cli.append_log_to_csv(delta, output)
+    assert output.read_text() == before
+
+def test_incremental_run_appends_to_a_partitioned_dataset(tmp_path, monkeypatch):
+    """Tests that a partitioned dataset output is appended to, not overwritten."""
+    from erp_processminer.eventlog.partitioned import PartitionedLog
+    from erp_processminer.eventlog.serialization import dataframe_to_log
+    dataset = tmp_path / "dataset"
+    PartitionedLog.write(dataframe_to_log(pd.DataFrame(
+        [["PO-1", "Create PO", "2023-01-01"], ["PO-2", "Create PO", "2023-01-02"]],
+        columns=["case_id", "activity", "timestamp"],
+    )), dataset, n_partitions=4)
+
+    config, extract = _inputs(tmp_path, [["G1", "PO-1", "2023-01-05", 1],
+                                         ["G2", "PO-3", "2023-01-06", 2]])
+    _run(monkeypatch, "erp-to-log", config, extract, "-o", str(dataset),
+         "--watermarks", str(tmp_path / "wm.json"))
+
+    assert not (dataset / "meta.json").exists()
+    log = PartitionedLog.open(dataset).to_columnar().to_event_log()
+    assert sorted(t.case_id for t in log) == ["PO-1", "PO-2", "PO-3"]
+    assert [e.activity for e in log.get_trace("PO-1")] == ["Create PO", "Receive Goods"]
@@ -0,0 +1,83 @@
+"""
+Tests for Declare constraint checking and the columnar log it runs on.
+"""
+
+import pandas as pd
+from erp_processminer.eventlog.serialization import dataframe_to_log
+from erp_processminer.eventlog.structures import Event
+from erp_processminer.eventlog.columnar import ColumnarLog
+from erp_processminer.conformance.declare import DeclareConstraint, check_declare_constraints
+
+def _p2p_log():
+    return dataframe_to_log(pd.DataFrame([
+        ['PO-1', 'Create PO', '2023-01-01 09:00:00', 'U1'],
+        ['PO-1', 'Approve', '2023-01-01 10:00:00', 'U2'],
+        ['PO-1', 'Goods Receipt', '2023-01-02 10:00:00', 'U3'],
+        ['PO-1', 'Invoice', '2023-01-03 10:00:00', 'U4'],
+        ['PO-1', 'Pay', '2023-01-04 10:00:00', 'U4'],
+        ['PO-2', 'Create PO', '2023-01-01 09:00:00', 'U1'],
+        ['PO-2', 'Invoice', '2023-01-02 10:00:00', 'U4'],
+        ['PO-2', 'Goods Receipt', '2023-01-03 10:00:00', 'U3'],
+        ['PO-2', 'Pay', '2023-01-04 10:00:00', 'U4'],
+        ['PO-3', 'Create PO', '2023-01-01 09:00:00', 'U1'],
+        ['PO-3', 'Change PO', '2023-01-01 11:00:00', 'U1'],
+        ['PO-3', 'Change PO', '2023-01-01 12:00:00', 'U1'],
+    ], columns=['case_id', 'activity', 'timestamp', 'resource']))
+
+def test_columnar_log_roundtrip():
+    """Tests that the columnar encoding preserves cases, order and attributes."""
+    log = _p2p_log()
+    columnar = ColumnarLog.from_event_log(log)
+
+    assert columnar.n_cases == 3
+    assert columnar.n_events == 12
+    assert columnar.trace_lengths().tolist() == [5, 4, 3]
+
+    restored = columnar.to_event_log()
+    assert [e.activity for e in restored.get_trace('PO-2')] == \
+           ['Create PO', 'Invoice', 'Goods Receipt', 'Pay']
+    assert restored.get_trace('PO-1').events[1].attributes['resource'] == 'U2'
+
+    subset = columnar.select_cases([2])
+    assert subset.case_ids.tolist() == ['PO-3']
+    assert subset.trace_lengths().tolist() == [3]
+
+def test_columnar_log_treats_none_attributes_as_absent():
+    """Tests that None-valued attributes do not survive a columnar round trip."""
+    log = _p2p_log()
+    first = log.traces[0].events[0]
+    log.traces[0].events[0] = Event(first.case_id, first.activity, first.timestamp,
+                                    attributes={'resource': 'U1', 'approver': None})
+    log.traces[0].attributes = {'vendor': None, 'plant': 'P1'}
+
+    restored = ColumnarLog.from_event_log(log).to_event_log()
+    assert restored.traces[0].events[0].attributes == {'resource': 'U1'}
+    assert restored.traces[0].attributes == {'plant': 'P1'}
+    assert restored.traces[0].events[1].attributes == {'resource': 'U2'}
+
+def test_check_declare_constraints():
+    """Tests violation counts and case IDs for several templates at once."""
+    constraints = [
+        DeclareConstraint('precedence', ('Goods Receipt', 'Invoice')),
+        DeclareConstraint('precedence', ('Approve', 'Pay')),
+        DeclareConstraint('absence', ('Change PO',), n=2),
+        DeclareConstraint('existence', ('Create PO',)),
+        DeclareConstraint('response', ('Create PO', 'Pay')),
+        DeclareConstraint('chain_response', ('Create PO', 'Approve')),
+        DeclareConstraint('not_co_existence', ('Invoice', 'Change PO')),
+        DeclareConstraint('init', ('Create PO',)),
+        DeclareConstraint('alternate_response', ('Change PO', 'Approve')),
+    ]
+    results = check_declare_constraints(_p2p_log(), constraints)
+
+    violating = {str(c): r['case_ids'] for c, r in results.items()}
+    assert violating['precedence(Goods Receipt, Invoice)'] == ['PO-2']
+    assert violating['precedence(Approve, Pay)'] == ['PO-2']
+    assert violating['absence(Change PO, 2)'] == ['PO-3']
+    assert violating['existence(Create PO, 1)'] == []
+    assert violating['response(Create PO, Pay)'] == ['PO-3']
+    assert violating['chain_response(Create PO, Approve)'] == ['PO-2', 'PO-3']
+    assert violating['not_co_existence(Invoice, Change PO)'] == []
+    assert violating['init(Create PO)'] == []
+    assert violating['alternate_response(Change PO, Approve)'] == ['PO-3']
+    assert results[constraints[5]]['violations'] == 2
@@ -0,0 +1,59 @@
+"""
+Tests for footprint-based conformance checking.
+"""
+
+import pandas as pd
+from erp_processminer.eventlog.serialization import dataframe_to_log
+from erp_processminer.discovery.directly_follows import discover_dfg
+from erp_processminer.models.petri_net import PetriNet, Place, Transition, Arc
+from erp_processminer.conformance.footprints import (
+    footprint_from_log,
+    footprint_from_petri_net,
+    check_footprint_conformance,
+)
+
+def _sequence_net() -> PetriNet:
+    # start -> A -> p1 -> B -> p2 -> C -> end
+    places = [Place('start'), Place('p1'), Place('p2'), Place('end')]
+    t_a, t_b, t_c = Transition('A', 'A'), Transition('B', 'B'), Transition('C', 'C')
+    return PetriNet(
+        name='SequenceNet',
+        places=set(places),
+        transitions={t_a, t_b, t_c},
+        arcs={
+            Arc(places[0], t_a), Arc(t_a, places[1]),
+            Arc(places[1], t_b), Arc(t_b, places[2]),
+            Arc(places[2], t_c), Arc(t_c, places[3]),
+        }
+    )
+
+def test_footprint_conformance():
+    """
+    Tests that a conforming log matches the model footprint exactly and that
+    swapped activities are reported as a deviating pair.
+    """
+    net = _sequence_net()
+    model_fp = footprint_from_petri_net(net)
+    assert model_fp.relation('A', 'B') == '->'
+    assert model_fp.relation('B', 'A') == '<-'
+    assert model_fp.relation('A', 'C') == '#'
+
+    log = dataframe_to_log(pd.DataFrame([
+        ['C-01', 'A', '2023-01-01 10:00:00'],
+        ['C-01', 'B', '2023-01-01 11:00:00'],
+        ['C-01', 'C', '2023-01-01 12:00:00'],
+        ['C-02', 'A', '2023-01-02 10:00:00'],
+        ['C-02', 'C', '2023-01-02 11:00:00'],
+        ['C-02', 'B', '2023-01-02 12:00:00'],
+    ], columns=['case_id', 'activity', 'timestamp']))
+
+    score, deviations = check_footprint_conformance(log, net)
+    pairs = {(d['source'], d['target']) for d in deviations}
+    assert pairs == {('A', 'C'), ('B', 'C')}
+    assert 0.0 < score < 1.0
+
+    dfg, _, _ = discover_dfg(log)
+    assert check_footprint_conformance(dfg, dfg) == (1.0, [])
+
+    profile = footprint_from_log(log, mode='profile')
+    assert profile.relation('A', 'C') == '->'
@@ -0,0 +1,77 @@
+"""
+Tests for the ETC precision conformance metric.
+"""
+
+import pandas as pd
+from erp_processminer.eventlog.serialization import dataframe_to_log
+from erp_processminer.models.petri_net import PetriNet, Place, Transition, Arc
+from erp_processminer.conformance.precision import PrefixAutomaton, calculate_precision
+
+def _choice_net() -> PetriNet:
+    # start -> A -> p1 -> (B | C) -> end
+    p_start, p1, p_end = Place('start'), Place('p1'), Place('end')
+    t_a = Transition('A', label='A')
+    t_b = Transition('B', label='B')
+    t_c = Transition('C', label='C')
+    return PetriNet(
+        name='ChoiceNet',
+        places={p_start, p1, p_end},
+        transitions={t_a, t_b, t_c},
+        arcs={
+            Arc(p_start, t_a), Arc(t_a, p1),
+            Arc(p1, t_b), Arc(t_b, p_end),
+            Arc(p1, t_c), Arc(t_c, p_end),
+        }
+    )
+
+def test_precision_counts_escaping_edges():
+    """
+    Tests that unobserved model behaviour lowers precision, and that a log
+    exercising every choice is perfectly precise.
+    """
+    net = _choice_net()
+
+    narrow_log = dataframe_to_log(pd.DataFrame([
+        ['C-01', 'A', '2023-01-01 10:00:00'],
+        ['C-01', 'B', '2023-01-01 11:00:00'],
+        ['C-02', 'A', '2023-01-02 10:00:00'],
+        ['C-02', 'B', '2023-01-02 11:00:00'],
+    ], columns=['case_id', 'activity', 'timestamp']))
+
+    precision, details = calculate_precision(narrow_log, net)
+    # Root allows A (2 cases); after A the model allows B and C but only B
+    # is observed (2 cases): 1 - 2 / 6.
+    assert abs(precision - (1 - 2 / 6)) < 1e-9
+    assert details['escaping_edges'] == 2
+
+    full_log = dataframe_to_log(pd.DataFrame([
+        ['C-01', 'A', '2023-01-01 10:00:00'],
+        ['C-01', 'B', '2023-01-01 11:00:00'],
+        ['C-02', 'A', '2023-01-02 10:00:00'],
+        ['C-02', 'C', '2023-01-02 11:00:00'],
+    ], columns=['case_id', 'activity', 'timestamp']))
+
+    automaton = PrefixAutomaton.from_log(full_log)
+    assert len(automaton) == 4
+    assert automaton.counts[0] == 2
+
+    precision, _ = calculate_precision(automaton, net.compile())
+    assert precision == 1.0
+
+def test_precision_accepts_a_variant_trie():
+    """Tests that a variant trie built for statistics scores like the automaton."""
+    from erp_processminer.eventlog.columnar import ColumnarLog
+    from erp_processminer.statistics.variant_trie import VariantTrie
+    log = dataframe_to_log(pd.DataFrame([
+        ['C-01', 'A', '2023-01-01 10:00:00'],
+        ['C-01', 'B', '2023-01-01 11:00:00'],
+        ['C-02', 'A', '2023-01-02 10:00:00'],
+        ['C-02', 'B', '2023-01-02 11:00:00'],
+        ['C-03', 'B', '2023-01-03 10:00:00'],
+    ], columns=['case_id', 'activity', 'timestamp']))
+
+    trie = VariantTrie.from_log(ColumnarLog.from_event_log(log))
+    automaton = PrefixAutomaton.from_log(log)
+    assert (trie.counts, trie.ends) == (automaton.counts, automaton.ends)
+    assert calculate_precision(trie, _choice_net()) == calculate_precision(automaton, _choice_net())
+    assert calculate_precision(trie, _choice_net()) == calculate_precision(log, _choice_net())
@@ -0,0 +1,89 @@
+"""
+Tests for hash-based event deduplication during ERP mapping.
+"""
+
+import pandas as pd
+from erp_processminer.io_erp.mappings import apply_mapping
+from erp_processminer.io_erp.deduplication import EventDeduplicator
+
+CONFIG = {
+    "case_id": "PO_NUMBER",
+    "tables": {
+        "goods_receipts": {
+            "entity_id": "PO_NUMBER",
+            "activity": "'Receive Goods'",
+            "timestamp": "RECEIPT_DATE",
+        }
+    },
+}
+
+def _extract(rows):
+    df = pd.DataFrame(rows, columns=["GR_NUMBER", "PO_NUMBER", "RECEIPT_DATE"])
+    df["RECEIPT_DATE"] = pd.to_datetime(df["RECEIPT_DATE"])
+    return df
+
+def test_overlapping_extracts_are_deduplicated(tmp_path):
+    """Tests in-batch and cross-run deduplication with a saved fingerprint set."""
+    keys = ["case_id", "activity", "timestamp", "GR_NUMBER"]
+    day1 = _extract([
+        ["GR-1", "PO-1", "2023-01-05"],
+        ["GR-1", "PO-1", "2023-01-05"],
+        ["GR-2", "PO-1", "2023-01-05"],
+    ])
+    dedup = EventDeduplicator(keys)
+    log = apply_mapping([day1], CONFIG, deduplicator=dedup)
+    assert len(log.get_trace("PO-1")) == 2
+    assert dedup.report() == {'seen': 3, 'kept': 2, 'dropped': 1, 'fingerprints': 2}
+
+    path = tmp_path / "fingerprints.npy"
+    dedup.save(path)
+    day2 = _extract([
+        ["GR-2", "PO-1", "2023-01-05"],
+        ["GR-3", "PO-2", "2023-01-06"],
+    ])
+    dedup = EventDeduplicator.load(path, keys)
+    log = apply_mapping([day2], CONFIG, deduplicator=dedup)
+    assert [t.case_id for t in log] == ["PO-2"]
+    assert dedup.dropped == 1
+
+    # Without a deduplicator every row becomes an event, as before
+    assert len(apply_mapping([day1], CONFIG).get_trace("PO-1")) == 3
+
+def test_new_rows_keeps_first_occurrences_across_batches():
+    """Tests the sorted fingerprint array against in-batch and earlier duplicates."""
+    import numpy as np
+    dedup = EventDeduplicator(["case_id"], fingerprints=np.array([7, 3], dtype=np.uint64))
+    keep = dedup.new_rows(np.array([5, 3, 5, 9, 1, 9], dtype=np.uint64))
+    assert keep.tolist() == [True, False, False, True, True, False]
+    assert dedup.fingerprints.tolist() == [1, 3, 5, 7, 9]
+    assert dedup.new_rows(np.array([9, 2], dtype=np.uint64)).tolist() == [False, True]
+    assert dedup.report() == {'seen': 8, 'kept': 4, 'dropped': 4, 'fingerprints': 6}
+
+def test_unknown_key_columns_are_rejected():
+    """Tests that a misspelled key column raises instead of hashing as empty."""
+    import pytest
+    dedup = EventDeduplicator(["case_id", "activity", "timestamp", "GR_NUMBR"])
+    with pytest.raises(ValueError, match="GR_NUMBR"):
+        apply_mapping([_extract([["GR-1", "PO-1", "2023-01-05"]])], CONFIG, deduplicator=dedup)
+
+def test_mapped_entity_id_can_be_a_key_column():
+    """Tests that distinct receipts of one order on one day are both kept."""
+    config = {
+        "case_id": "PO_NUMBER",
+        "tables": {
+            "goods_receipts": {
+                "entity_id": "GR_NUMBER",
+                "activity": "'Receive Goods'",
+                "timestamp": "RECEIPT_DATE",
+            }
+        },
+    }
+    batch = _extract([
+        ["G1", "PO-1", "2023-01-05"],
+        ["G2", "PO-1", "2023-01-05"],
+        ["G2", "PO-1", "2023-01-05"],
+    ])
+    dedup = EventDeduplicator(["case_id", "activity", "timestamp", "GR_NUMBER"])
+    log = apply_mapping([batch], config, deduplicator=dedup)
+    assert len(log.get_trace("PO-1")) == 2
+    assert dedup.report()['dropped'] == 1
@@ -56,4 +56,63 @@ def test_event_log_all_events():
     
     log = EventLog(traces=[t1, t2])
     
-    assert len(log.all_events) == 3
\ No newline at end of file
+    assert len(log.all_events) == 3
+def test_slotted_events_share_empty_attributes():
+    """Tests that events are slotted and share a read-only empty dict."""
+    e1 = Event(case_id="C-01", activity="A", timestamp=datetime(2023, 1, 1))
+    e2 = Event(case_id="C-01", activity="B", timestamp=datetime(2023, 1, 2))
+
+    assert not hasattr(e1, "__dict__")
+    assert e1.attributes is e2.attributes
+    with pytest.raises(TypeError):
+        e1.attributes["resource"] = "User 1"
+
+def test_presorted_trace_keeps_event_list():
+    """Tests the trusted construction path for already sorted events."""
+    e1 = Event(case_id="C-01", activity="A", timestamp=datetime(2023, 1, 1))
+    e2 = Event(case_id="C-01", activity="B", timestamp=datetime(2023, 1, 2))
+    events = [e1, e2]
+
+    trace = Trace.presorted("C-01", events)
+
+    assert trace.events is events
+    assert trace.attributes == {}
+    assert trace == Trace(case_id="C-01", events=[e2, e1])
+
+def test_case_index_tracks_changes():
+    """Tests the case index through appends, in-place edits and bulk lookups."""
+    log = EventLog(traces=[Trace(case_id=f"C-{i:02d}", events=[]) for i in range(10)])
+
+    assert log.get_trace("C-05") is log.traces[5]
+    log.traces.append(Trace(case_id="C-10", events=[]))
+    assert log.get_trace("C-10") is log.traces[10]
+
+    log.traces[3] = Trace(case_id="C-99", events=[])
+    assert "C-99" in log
+    assert log.get_trace("C-99") is log.traces[3]
+    assert log.get_trace("C-03") is None
+
+    assert log.get_traces(["C-01", "C-42", "C-99"]) == [log.traces[1], None, log.traces[3]]
+    assert "C-01" in log and "C-42" not in log
+
+def test_shared_attributes_are_read_only():
+    """Tests that events sharing an attribute dictionary cannot modify it."""
+    import pickle
+    import pandas as pd
+    from erp_processminer.eventlog.serialization import dataframe_to_log
+    log = dataframe_to_log(pd.DataFrame({
+        'case_id': ['C1', 'C2'],
+        'activity': ['A', 'A'],
+        'timestamp': pd.to_datetime(['2023-01-01', '2023-01-02']),
+        'plant': ['P100', 'P100'],
+    }))
+    first, second = log.traces[0].events[0], log.traces[1].events[0]
+    assert first.attributes is second.attributes
+
+    with pytest.raises(TypeError):
+        first.attributes['plant'] = 'P200'
+    with pytest.raises(TypeError):
+        first.attributes.update(plant='P200')
+    assert second.attributes == {'plant': 'P100'}
+    assert pickle.loads(pickle.dumps(first.attributes)) == {'plant': 'P100'}
+    assert dict(first.attributes) == {'plant': 'P100'}
@@ -0,0 +1,73 @@
+"""
+Tests for incremental ingestion with per-table watermarks.
+"""
+
+import pandas as pd
+from erp_processminer.io_erp.mappings import apply_mapping
+from erp_processminer.io_erp.incremental import Watermarks, append_events
+from erp_processminer.eventlog.columnar import ColumnarLog
+
+CONFIG = {
+    "case_id": "PO_NUMBER",
+    "tables": {
+        "purchase_orders": {
+            "entity_id": "PO_NUMBER",
+            "activity": "'Create PO'",
+            "timestamp": "CREATION_DATE",
+        },
+        "goods_receipts": {
+            "entity_id": "PO_NUMBER",
+            "activity": "'Receive Goods'",
+            "timestamp": "RECEIPT_DATE",
+            "watermark": "CHANGE_NR",
+        },
+    },
+}
+
+def _tables(pos, grs):
+    po_df = pd.DataFrame(pos, columns=["PO_NUMBER", "CREATION_DATE"])
+    po_df["CREATION_DATE"] = pd.to_datetime(po_df["CREATION_DATE"])
+    gr_df = pd.DataFrame(grs, columns=["PO_NUMBER", "RECEIPT_DATE", "CHANGE_NR"])
+    gr_df["RECEIPT_DATE"] = pd.to_datetime(gr_df["RECEIPT_DATE"])
+    return [po_df, gr_df]
+
+def test_incremental_runs_map_only_the_delta(tmp_path):
+    """Tests that watermarks skip ingested rows and deltas append in place."""
+    state = tmp_path / "watermarks.json"
+    store = tmp_path / "log"
+
+    day1 = _tables([["PO-1", "2023-01-01"], ["PO-2", "2023-01-02"]],
+                   [["PO-1", "2023-01-05", 10]])
+    watermarks = Watermarks.load(state)
+    append_events(store, apply_mapping(day1, CONFIG, watermarks=watermarks))
+    watermarks.save(state)
+
+    # The day-2 dumps still contain the day-1 rows
+    day2 = _tables([["PO-1", "2023-01-01"], ["PO-2", "2023-01-02"], ["PO-3", "2023-01-03"]],
+                   [["PO-1", "2023-01-05", 10], ["PO-2", "2023-01-04", 11],
+                    ["PO-1", "2023-01-06", 12]])
+    watermarks = Watermarks.load(state)
+    delta = apply_mapping(day2, CONFIG, watermarks=watermarks)
+    assert sum(len(t) for t in delta) == 3
+    assert watermarks.values["goods_receipts"] == 12
+
+    log = append_events(store, delta)
+    reloaded = ColumnarLog.load(store).to_event_log()
+    assert [t.case_id for t in reloaded] == ["PO-1", "PO-2", "PO-3"]
+    assert [e.activity for e in reloaded.get_trace("PO-1")] == \
+           ["Create PO", "Receive Goods", "Receive Goods"]
+    assert [e.activity for e in reloaded.get_trace("PO-2")] == ["Create PO", "Receive Goods"]
+    assert log.n_events == 6
+
+def test_text_watermark_column_is_compared_as_timestamps():
+    """Tests that unpadded date strings are not compared lexicographically."""
+    import pytest
+    watermarks = Watermarks({"changes": "2023-01-09 00:00:00"})
+    df = pd.DataFrame({"CHANGED_AT": ["2023-1-10 00:00", "2023-1-8 00:00", "2023-1-9 12:00"]})
+    assert watermarks.new_rows("changes", df, "CHANGED_AT").index.tolist() == [0, 2]
+
+    watermarks.advance("changes", df, "CHANGED_AT")
+    assert watermarks.values["changes"] == pd.Timestamp("2023-01-10")
+
+    with pytest.raises(ValueError, match="must hold numbers or timestamps"):
+        watermarks.new_rows("changes", pd.DataFrame({"CHANGED_AT": ["soon"]}), "CHANGED_AT")
@@ -0,0 +1,46 @@
+"""
+Tests for incremental log fingerprints.
+"""
+
+from datetime import datetime, timedelta
+from erp_processminer.eventlog.structures import EventLog, Trace, Event
+from erp_processminer.eventlog.columnar import ColumnarLog
+from erp_processminer.eventlog.fingerprint import LogFingerprint
+
+def _trace(case_id, activities, plant='P1'):
+    start = datetime(2023, 1, 1)
+    return Trace(case_id, [Event(case_id, a, start + timedelta(hours=j), {'plant': plant})
+                           for j, a in enumerate(activities)])
+
+def _log():
+    return EventLog([_trace('C1', 'AB'), _trace('C2', 'ABC'), _trace('C3', '')])
+
+def test_fingerprint_is_order_independent_and_content_sensitive():
+    """Tests the digest against case order, log form and content changes."""
+    fingerprint = LogFingerprint.from_log(_log())
+    reversed_log = EventLog(list(reversed(_log().traces)))
+    assert LogFingerprint.from_log(reversed_log) == fingerprint
+    assert LogFingerprint.from_log(ColumnarLog.from_event_log(_log())) == fingerprint
+
+    swapped = EventLog([_trace('C1', 'BA'), _trace('C2', 'ABC'), _trace('C3', '')])
+    assert LogFingerprint.from_log(swapped) != fingerprint
+
+    # Attributes only count when selected
+    other_plant = EventLog([_trace('C1', 'AB', 'P2'), _trace('C2', 'ABC'), _trace('C3', '')])
+    assert LogFingerprint.from_log(other_plant) == fingerprint
+    with_plant = LogFingerprint.from_log(_log(), ['plant'])
+    assert LogFingerprint.from_log(other_plant, ['plant']) != with_plant
+
+def test_incremental_update_and_diff():
+    """Tests that updates match a full recomputation and diffs list the changes."""
+    old = LogFingerprint.from_log(_log())
+    new = LogFingerprint.from_log(_log())
+    new.update(EventLog([_trace('C2', 'ABCD'), _trace('C4', 'A')]))
+    new.remove(['C3'])
+
+    full = LogFingerprint.from_log(
+        EventLog([_trace('C1', 'AB'), _trace('C2', 'ABCD'), _trace('C4', 'A')])
+    )
+    assert new == full and new.hexdigest() == full.hexdigest()
+    assert old.diff(new) == {'added': ['C4'], 'removed': ['C3'], 'changed': ['C2']}
+    assert old.changed_cases(new) == ['C2', 'C3', 'C4']
@@ -0,0 +1,55 @@
+"""
+Tests for the lazy, fused log query builder.
+"""
+
+import pandas as pd
+from erp_processminer.eventlog.serialization import dataframe_to_log
+from erp_processminer.eventlog.columnar import ColumnarLog
+from erp_processminer.filters.attribute_filters import (
+    filter_log_by_activity,
+    filter_log_by_event_attribute,
+)
+from erp_processminer.filters.performance_filters import filter_log_by_cycle_time
+
+def _log():
+    return dataframe_to_log(pd.DataFrame([
+        ['C-01', 'A', '2023-01-01 10:00:00', 'P1'],
+        ['C-01', 'B', '2023-01-01 11:00:00', 'P1'],
+        ['C-01', 'C', '2023-01-01 15:00:00', 'P2'],
+        ['C-02', 'A', '2023-01-02 10:00:00', 'P1'],
+        ['C-02', 'C', '2023-01-02 10:30:00', 'P1'],
+        ['C-03', 'B', '2023-01-03 10:00:00', 'P2'],
+    ], columns=['case_id', 'activity', 'timestamp', 'plant']))
+
+def _variants(log):
+    return {t.case_id: [e.activity for e in t] for t in log}
+
+def test_query_matches_chained_filters():
+    """
+    Tests that a fused query gives the same result as chaining the filter
+    functions, in object and columnar mode, and reuses unchanged traces.
+    """
+    log = _log()
+    chained = filter_log_by_cycle_time(
+        filter_log_by_event_attribute(
+            filter_log_by_activity(log, {'A', 'C'}), 'plant', {'P1', 'P2'}
+        ),
+        max_duration=3 * 3600,
+    )
+
+    query = log.query().activities({'A', 'C'}).attribute('plant', {'P1', 'P2'}) \
+                       .cycle_time(max_duration=3 * 3600)
+    fused = query.collect()
+    assert _variants(fused) == _variants(chained) == {'C-02': ['A', 'C']}
+    assert fused.traces[0] is log.get_trace('C-02')
+    assert query.indices() == [(1, None)]
+    assert query.count() == 1
+
+    columnar = ColumnarLog.from_event_log(log)
+    columnar_query = columnar.query().activities({'A', 'C'}).attribute('plant', {'P1', 'P2'}) \
+                                     .cycle_time(max_duration=3 * 3600)
+    assert _variants(columnar_query.collect().to_event_log()) == {'C-02': ['A', 'C']}
+    assert columnar_query.count() == 1
+
+    partial = log.query().attribute('plant', {'P1'}).indices()
+    assert partial == [(0, [0, 1]), (1, None)]
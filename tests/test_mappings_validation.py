@@ -25,3 +25,59 @@ def test_apply_mapping_requires_case_id_column():
 
     with pytest.raises(ValueError):
         apply_mapping([df], config)
+
+
+def test_apply_mapping_with_reserved_source_column_names():
+    df = pd.DataFrame(
+        {
+            "PO_NUMBER": ["PO-1", "PO-1"],
+            "activity": ["Create PO", "Approve PO"],
+            "CHANGED_AT": pd.to_datetime(["2023-01-01", "2023-01-02"]),
+            "timestamp": ["stray", "stray"],
+            "PLANT": ["P100", "P100"],
+        }
+    )
+
+    config = {
+        "case_id": "PO_NUMBER",
+        "tables": {
+            "po_changes": {
+                "entity_id": "PO_NUMBER",
+                "activity": "activity",
+                "timestamp": "CHANGED_AT",
+            }
+        },
+    }
+
+    log = apply_mapping([df], config)
+    events = log.get_trace("PO-1").events
+    assert [e.activity for e in events] == ["Create PO", "Approve PO"]
+    assert events[0].timestamp == pd.Timestamp("2023-01-01")
+    assert "activity" not in events[0].attributes
+    assert "timestamp" not in events[0].attributes
+    assert events[0].attributes["PLANT"] == "P100"
+
+
+def test_apply_mapping_keeps_activity_source_column_as_attribute():
+    df = pd.DataFrame(
+        {
+            "PO_NUMBER": ["PO-1", "PO-1"],
+            "TCODE": ["ME21N", "ME29N"],
+            "CHANGED_AT": pd.to_datetime(["2023-01-01", "2023-01-02"]),
+        }
+    )
+
+    config = {
+        "case_id": "PO_NUMBER",
+        "tables": {
+            "po_changes": {
+                "entity_id": "PO_NUMBER",
+                "activity": "TCODE",
+                "timestamp": "CHANGED_AT",
+            }
+        },
+    }
+
+    events = apply_mapping([df], config).get_trace("PO-1").events
+    assert [e.activity for e in events] == ["ME21N", "ME29N"]
+    assert [e.attributes["TCODE"] for e in events] == ["ME21N", "ME29N"]
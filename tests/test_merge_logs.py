@@ -0,0 +1,63 @@
+"""
+Tests for the k-way merge of event logs and columnar logs.
+"""
+
+from datetime import datetime
+import numpy as np
+from erp_processminer.eventlog.structures import EventLog, Trace, Event
+from erp_processminer.eventlog.columnar import ColumnarLog
+from erp_processminer.eventlog.operations import (
+    merge_logs, merge_event_logs, merge_columnar_logs
+)
+
+def _event(case_id, activity, day, **attributes):
+    return Event(case_id, activity, datetime(2023, 1, day), attributes)
+
+def _logs():
+    log1 = EventLog([
+        Trace('C1', [_event('C1', 'Create PO', 1), _event('C1', 'Pay', 5)]),
+        Trace('C2', [_event('C2', 'Create PO', 2)]),
+    ])
+    log2 = EventLog([
+        Trace('C1', [_event('C1', 'Create PO', 1), _event('C1', 'Receive', 3)]),
+        Trace('C3', [_event('C3', 'Create PO', 4, plant='P100')]),
+    ])
+    log3 = EventLog([Trace('C2', [_event('C2', 'Approve', 3)])])
+    return log1, log2, log3
+
+def test_merge_event_logs_is_sorted_deduplicated_and_non_mutating():
+    """Tests the n-way merge of event logs."""
+    log1, log2, log3 = _logs()
+    merged = merge_event_logs([log1, log2, log3])
+
+    assert [t.case_id for t in merged] == ['C1', 'C2', 'C3']
+    assert [e.activity for e in merged.get_trace('C1')] == ['Create PO', 'Receive', 'Pay']
+    assert [e.activity for e in merged.get_trace('C2')] == ['Create PO', 'Approve']
+    # Inputs are untouched and unshared cases are reused
+    assert len(log1.get_trace('C1')) == 2
+    assert merged.get_trace('C3') is log2.get_trace('C3')
+    # The pairwise merge keeps duplicates, as before
+    assert len(merge_logs(log1, log2).get_trace('C1')) == 4
+    assert len(log1.get_trace('C1')) == 2
+
+def test_merge_columnar_logs_matches_object_merge(tmp_path):
+    """Tests merging in-memory and on-disk columnar logs."""
+    log1, log2, log3 = _logs()
+    log2_dir = tmp_path / 'log2'
+    ColumnarLog.from_event_log(log2).save(log2_dir)
+
+    merged = merge_columnar_logs(
+        [ColumnarLog.from_event_log(log1), log2_dir, ColumnarLog.from_event_log(log3)],
+        output=tmp_path / 'merged',
+    )
+    expected = merge_event_logs([log1, log2, log3])
+    assert merged.case_ids.tolist() == ['C1', 'C2', 'C3']
+    for trace in merged.to_event_log():
+        reference = expected.get_trace(trace.case_id)
+        assert [(e.activity, e.timestamp) for e in trace] == \
+               [(e.activity, e.timestamp) for e in reference]
+    assert merged.attributes['plant'].tolist() == [None] * 5 + ['P100']
+
+    reloaded = ColumnarLog.load(tmp_path / 'merged')
+    assert isinstance(reloaded.activities, np.memmap)
+    assert np.array_equal(reloaded.timestamps, merged.timestamps)
@@ -0,0 +1,64 @@
+"""
+Tests for the object-centric event log and OC-DFG discovery.
+"""
+
+import pandas as pd
+from erp_processminer.io_erp.mappings import apply_object_centric_mapping
+from erp_processminer.discovery.object_centric import discover_oc_dfg
+
+def _log():
+    po_df = pd.DataFrame({"PO_NUMBER": ["PO-1", "PO-2"],
+                          "CREATION_DATE": pd.to_datetime(["2023-01-01", "2023-01-02"])})
+    inv_df = pd.DataFrame({"INVOICE_NUMBER": ["INV-1", "INV-1"],
+                           "PO_NUMBER": ["PO-1", "PO-2"],
+                           "INVOICE_DATE": pd.to_datetime(["2023-01-05", "2023-01-05"])})
+    pay_df = pd.DataFrame({"INVOICE_NUMBER": ["INV-1"],
+                           "PAYMENT_DATE": pd.to_datetime(["2023-01-09"])})
+    config = {
+        "tables": {
+            "purchase_orders": {"activity": "'Create PO'", "timestamp": "CREATION_DATE",
+                                "objects": {"purchase_order": "PO_NUMBER"}},
+            "invoices": {"activity": "'Receive Invoice'", "timestamp": "INVOICE_DATE",
+                         "objects": {"invoice": "INVOICE_NUMBER", "purchase_order": "PO_NUMBER"}},
+            "payments": {"activity": "'Pay'", "timestamp": "PAYMENT_DATE",
+                         "objects": {"invoice": "INVOICE_NUMBER"}},
+        }
+    }
+    return apply_object_centric_mapping([po_df, inv_df, pay_df], config)
+
+def test_events_are_stored_once_with_csr_relations():
+    """Tests that an invoice covering two orders is one event related to both."""
+    log = _log()
+    assert log.n_events == 4
+    assert log.n_objects == 3
+    assert log.n_relations == 6
+    assert log.event_objects(2) == [('invoice', 'INV-1'), ('purchase_order', 'PO-1'),
+                                    ('purchase_order', 'PO-2')]
+
+def test_flattening_and_oc_dfg():
+    """Tests per-type flattening (cached) and the per-type DFGs."""
+    log = _log()
+    invoices = log.flatten('invoice')
+    assert invoices is log.flatten('invoice')
+    assert invoices.case_ids.tolist() == ['INV-1']
+    assert invoices.n_events == 2
+
+    dfgs = discover_oc_dfg(log)
+    edges = dfgs['purchase_order'].get_edges()
+    assert edges[('Create PO', 'Receive Invoice')]['frequency'] == 2
+    assert dfgs['purchase_order'].start_activities == {'Create PO': 2}
+    assert set(dfgs['invoice'].get_edges()) == {('Receive Invoice', 'Pay')}
+
+def test_reserved_source_column_names_are_not_attributes():
+    """Tests a table whose activity and a stray column use reserved names."""
+    changes = pd.DataFrame({"PO_NUMBER": ["PO-1", "PO-1"],
+                            "activity": ["Create PO", "Approve PO"],
+                            "CHANGED_AT": pd.to_datetime(["2023-01-01", "2023-01-02"]),
+                            "timestamp": ["stray", "stray"],
+                            "USER": ["u1", "u2"]})
+    config = {"tables": {"po_changes": {"activity": "activity", "timestamp": "CHANGED_AT",
+                                        "objects": {"purchase_order": "PO_NUMBER"}}}}
+    log = apply_object_centric_mapping([changes], config)
+    assert log.activity_names == ['Create PO', 'Approve PO']
+    assert set(log.attributes) == {'source_table', 'USER'}
+    assert log.flatten('purchase_order').n_events == 2
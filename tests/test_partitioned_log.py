@@ -0,0 +1,80 @@
+"""
+Tests for the partitioned log dataset and the map-reduce executor.
+"""
+
+from datetime import datetime, timedelta
+from erp_processminer.eventlog.structures import EventLog, Trace, Event
+from erp_processminer.eventlog.columnar import ColumnarLog
+from erp_processminer.eventlog.partitioned import PartitionedLog
+from erp_processminer.discovery.directly_follows import discover_dfg
+from erp_processminer.conformance.token_replay import calculate_conformance
+from erp_processminer.statistics.variants import get_variants
+from erp_processminer.statistics.streaming import PerformanceAccumulator
+from erp_processminer.models.petri_net import PetriNet, Place, Transition, Arc
+from erp_processminer import parallel
+
+def _log(n_cases=40, offset=0):
+    traces = []
+    for i in range(offset, offset + n_cases):
+        start = datetime(2023, 1, 1) + timedelta(days=i)
+        activities = ['A', 'B'] if i % 3 else ['A', 'C', 'B']
+        case_id = f'C{i}'
+        traces.append(Trace(case_id, [
+            Event(case_id, a, start + timedelta(hours=j * (i % 5 + 1)))
+            for j, a in enumerate(activities)
+        ]))
+    return EventLog(traces)
+
+def _net():
+    start, middle, end = Place('start'), Place('p1'), Place('end')
+    a, b = Transition('A', label='A'), Transition('B', label='B')
+    return PetriNet(name='AB', places={start, middle, end}, transitions={a, b},
+                    arcs={Arc(start, a), Arc(a, middle), Arc(middle, b), Arc(b, end)})
+
+def test_partitioned_dataset_manifest_pruning_and_append(tmp_path):
+    """Tests writing, pruning and appending to a partitioned dataset."""
+    log = _log()
+    dataset = PartitionedLog.write(log, tmp_path / 'ds', n_partitions=4)
+    reopened = PartitionedLog.open(tmp_path / 'ds')
+    assert reopened.n_cases == 40 and reopened.n_events == sum(len(t) for t in log)
+
+    # Every case lands in exactly one partition
+    case_ids = [c for part in reopened.iter_partitions() for c in part.case_ids.tolist()]
+    assert sorted(case_ids) == sorted(t.case_id for t in log)
+
+    assert reopened.select(activities=['X']) == []
+    assert reopened.select(start='2030-01-01') == []
+    assert reopened.select(activities=['C']) == [
+        i for i, e in enumerate(reopened.partitions) if 'C' in e['activities']
+    ]
+
+    late = Event('C0', 'Z', datetime(2024, 1, 1))
+    touched = dataset.append(EventLog([Trace('C0', [late]), *_log(2, offset=100)]))
+    assert len(touched) <= 3
+    merged = PartitionedLog.open(tmp_path / 'ds').to_columnar().to_event_log()
+    assert [e.activity for e in merged.get_trace('C0')] == ['A', 'C', 'B', 'Z']
+    assert len(merged) == 42
+
+def test_map_reduce_matches_in_memory_results(tmp_path):
+    """Tests that partition-wise results merge to the in-memory results."""
+    log = _log()
+    dataset = PartitionedLog.write(log, tmp_path / 'ds', n_partitions=3)
+
+    dfg, starts, ends = parallel.parallel_dfg(dataset, max_workers=2)
+    expected, expected_starts, expected_ends = discover_dfg(log)
+    assert dfg.get_edges() == expected.get_edges()
+    assert (starts, ends) == (expected_starts, expected_ends)
+    assert dfg.activity_frequencies == expected.activity_frequencies
+
+    variants = parallel.parallel_variants(dataset, max_workers=1)
+    assert variants == {v: len(t) for v, t in get_variants(log).items()}
+
+    accumulator = parallel.parallel_performance(dataset, max_workers=2)
+    expected_acc = PerformanceAccumulator()
+    expected_acc.update(log)
+    assert accumulator.cycle_time.stats.count == 40
+    assert abs(accumulator.cycle_time.stats.mean - expected_acc.cycle_time.stats.mean) < 1e-6
+
+    fitness, results = parallel.parallel_conformance(dataset, _net(), max_workers=2)
+    assert abs(fitness - calculate_conformance(log, _net())[0]) < 1e-9
+    assert results['C1']['fitness'] == 1.0 and results['C0']['fitness'] < 1.0
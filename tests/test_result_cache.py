@@ -0,0 +1,100 @@
+"""
+Tests for the content-addressed result cache.
+"""
+
+import os
+from datetime import datetime, timedelta
+from erp_processminer.eventlog.structures import EventLog, Trace, Event
+from erp_processminer.cache import ResultCache, log_fingerprint
+from erp_processminer.discovery.directly_follows import discover_dfg
+from erp_processminer.discovery.heuristics_miner import discover_petri_net_with_heuristics
+from erp_processminer.conformance.token_replay import calculate_conformance
+from erp_processminer.statistics.variants import get_variant_performance
+
+def _log(activities=('A', 'B', 'C')):
+    start = datetime(2023, 1, 1)
+    return EventLog([
+        Trace(f'C{i}', [Event(f'C{i}', a, start + timedelta(hours=i + j))
+                        for j, a in enumerate(activities)])
+        for i in range(5)
+    ])
+
+def test_cache_hits_misses_and_keys(tmp_path):
+    """Tests that results are reused only for the same log and parameters."""
+    cache = ResultCache(tmp_path / 'cache')
+    log = _log()
+    dfg, _, _ = discover_dfg(log, cache=cache)
+    assert discover_dfg(_log(), cache=cache)[0] is dfg
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # A changed log or changed parameters miss
+    discover_dfg(_log(('A', 'C')), cache=cache)
+    net = discover_petri_net_with_heuristics(log, cache=cache)
+    discover_petri_net_with_heuristics(log, min_freq=2, cache=cache)
+    assert cache.misses == 4
+    assert log_fingerprint(log) != log_fingerprint(_log(('A', 'C')))
+
+    fitness, _ = calculate_conformance(log, net, cache=cache)
+    assert calculate_conformance(log, net, cache=cache)[0] == fitness
+    performance = get_variant_performance(log, cache=cache)
+    assert get_variant_performance(log, cache=cache) is performance
+    assert cache.hits == 3
+
+    # A new cache on the same directory reads the results from disk
+    reloaded = ResultCache(tmp_path / 'cache')
+    cached, _, _ = reloaded.get_or_compute(log, 'discover_dfg', {}, lambda: None)
+    assert cached.get_edges() == dfg.get_edges()
+    assert reloaded.hits == 1
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    """Tests the size bound of the disk store and of the memo."""
+    cache = ResultCache(tmp_path, max_bytes=3200, memo_size=2)
+    for i in range(5):
+        cache.put(f'k{i}', b'x' * 1000)
+        os.utime(tmp_path / f'k{i}.pkl', (i, i))
+    cache.put('k5', b'x' * 1000)
+    assert sorted(p.stem for p in tmp_path.glob('*.pkl')) == ['k3', 'k4', 'k5']
+    assert list(cache._memo) == ['k4', 'k5']
+    assert cache.get('k0') is None
+
+def test_cached_conformance_follows_trace_order():
+    """Tests that a reordered log gets its per-trace results in its own order."""
+    start = datetime(2023, 1, 1)
+    traces = {
+        'C1': Trace('C1', [Event('C1', 'A', start), Event('C1', 'B', start + timedelta(hours=1))]),
+        'C2': Trace('C2', [Event('C2', 'B', start)]),
+        'C3': Trace('C3', [Event('C3', 'A', start), Event('C3', 'B', start + timedelta(hours=2))]),
+    }
+    log = EventLog([traces['C1'], traces['C2'], traces['C3']])
+    net = discover_petri_net_with_heuristics(log)
+    cache = ResultCache()
+    expected = [r['fitness'] for r in calculate_conformance(log, net, cache=cache)[1]]
+
+    reordered = EventLog([traces['C2'], traces['C1'], traces['C3']])
+    _, results = calculate_conformance(reordered, net, cache=cache)
+    assert cache.hits == 1
+    assert [r['fitness'] for r in results] == [expected[1], expected[0], expected[2]]
+    assert expected[0] != expected[1]
+
+def test_cache_hit_does_not_rehash_the_log(monkeypatch):
+    """Tests that the log fingerprint is memoized until the log changes."""
+    from erp_processminer.eventlog import fingerprint
+    calls = []
+    case_hashes = fingerprint.case_hashes
+    monkeypatch.setattr(fingerprint, 'case_hashes',
+                        lambda *args: calls.append(1) or case_hashes(*args))
+    cache = ResultCache()
+    log = _log()
+    dfg, _, _ = discover_dfg(log, cache=cache)
+    assert discover_dfg(log, cache=cache)[0] is dfg
+    assert len(calls) == 1
+
+    # Appending an event is noticed; replacing one in place needs invalidation
+    trace = log.traces[0]
+    trace.events.append(Event(trace.case_id, 'D', trace.events[-1].timestamp + timedelta(hours=1)))
+    assert discover_dfg(log, cache=cache)[0] is not dfg
+    assert len(calls) == 2
+    trace.events[-1] = Event(trace.case_id, 'E', trace.events[-1].timestamp)
+    log.invalidate_index()
+    assert ('C', 'E') in discover_dfg(log, cache=cache)[0].graph.edges
+    assert len(calls) == 3
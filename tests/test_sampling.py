@@ -0,0 +1,63 @@
+"""
+Tests for case sampling with error estimates.
+"""
+
+from datetime import datetime, timedelta
+import numpy as np
+from erp_processminer.eventlog.structures import EventLog, Trace, Event
+from erp_processminer.discovery.directly_follows import discover_dfg
+from erp_processminer.statistics.performance import get_cycle_times
+from erp_processminer.statistics.sampling import (
+    uniform_sample, stratified_sample, ReservoirSampler, estimate_dfg, estimate_cycle_time
+)
+
+def _log(n_cases=400):
+    rng = np.random.default_rng(7)
+    traces = []
+    for i in range(n_cases):
+        activities = ['A', 'B', 'C'] if i % 10 else ['A', 'C', 'B', 'D']
+        if i == 3:
+            activities = ['A', 'E']
+        start = datetime(2023, 1, 1) + timedelta(days=i)
+        hours = np.cumsum(rng.exponential(5, len(activities)))
+        traces.append(Trace(f'C{i}', [
+            Event(f'C{i}', a, start + timedelta(hours=float(h))) for a, h in zip(activities, hours)
+        ]))
+    return EventLog(traces)
+
+def test_samplers():
+    """Tests sample sizes, variant coverage and the reservoir bound."""
+    log = _log()
+    uniform = uniform_sample(log, fraction=0.1, seed=1)
+    assert len(uniform) == 40 and uniform.population == 400
+    assert np.allclose(uniform.weights, 10)
+
+    stratified = stratified_sample(log, fraction=0.1, seed=1)
+    variants = {tuple(e.activity for e in t) for t in stratified.log}
+    assert ('A', 'E') in variants and len(variants) == 3
+    assert stratified.population == 400
+
+    reservoir = ReservoirSampler(25, seed=1)
+    reservoir.extend(log)
+    sample = reservoir.sample()
+    assert len(sample) == 25 and sample.population == 400
+    assert len({t.case_id for t in sample.log}) == 25
+
+def test_estimates_cover_the_full_log():
+    """Tests that confidence bounds cover the exact values, and collapse for a census."""
+    log = _log()
+    dfg, _, _ = discover_dfg(log)
+    exact = dfg.get_edges()
+
+    estimates = estimate_dfg(stratified_sample(log, fraction=0.25, seed=3))
+    for (u, v), row in estimates.iterrows():
+        assert row['frequency_low'] <= exact[(u, v)]['frequency'] <= row['frequency_high']
+    ab = estimates.loc[('A', 'B')]
+    assert ab['duration_low'] <= exact[('A', 'B')]['avg_duration'] <= ab['duration_high']
+
+    census = estimate_dfg(uniform_sample(log, fraction=1.0))
+    assert (census['frequency_low'] == census['frequency_high']).all()
+    assert census.loc[('A', 'B'), 'frequency'] == exact[('A', 'B')]['frequency']
+
+    cycle = estimate_cycle_time(uniform_sample(log, size=100, seed=5))
+    assert cycle['low'] <= np.mean(get_cycle_times(log)) <= cycle['high']
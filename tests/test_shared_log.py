@@ -0,0 +1,56 @@
+"""
+Tests for sharing columnar logs with worker processes through shared memory.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+import numpy as np
+import pytest
+from erp_processminer.eventlog.structures import EventLog, Trace, Event
+from erp_processminer.eventlog.columnar import ColumnarLog
+from erp_processminer.eventlog.shared import SharedLog, attach, detach
+from erp_processminer.discovery.directly_follows import discover_dfg
+from erp_processminer import parallel
+
+def _log(n_cases=30):
+    traces = []
+    for i in range(n_cases):
+        start = datetime(2023, 1, 1) + timedelta(days=i)
+        activities = ['A', 'B', 'C'][:i % 3 + 1]
+        traces.append(Trace(f'C{i}', [
+            Event(f'C{i}', a, start + timedelta(hours=j + i % 4)) for j, a in enumerate(activities)
+        ]))
+    return EventLog(traces)
+
+def _summary(handle):
+    log = attach(handle)
+    return log.n_cases, int(log.activities.sum()), log.case_ids[-1]
+
+def test_publish_and_attach():
+    """Tests that attached arrays equal the published ones, in and across processes."""
+    log = ColumnarLog.from_event_log(_log())
+    with SharedLog(log) as shared:
+        attached = attach(shared.handle)
+        assert np.array_equal(attached.case_ids, log.case_ids)
+        assert np.array_equal(attached.timestamps, log.timestamps)
+        assert attached.attributes == {}
+        with pytest.raises(ValueError):
+            attached.activities[0] = 1
+        del attached
+        detach(shared.handle)
+
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            results = list(executor.map(_summary, [shared.handle] * 2))
+    assert results == [(30, int(log.activities.sum()), 'C29')] * 2
+
+def test_case_range_and_parallel_dfg():
+    """Tests zero-copy case ranges and parallel discovery over shared memory."""
+    log = ColumnarLog.from_event_log(_log())
+    part = log.case_range(10, 20)
+    assert part.case_ids.tolist() == [f'C{i}' for i in range(10, 20)]
+    assert np.shares_memory(part.activities, log.activities)
+
+    dfg, starts, ends = parallel.parallel_dfg(_log(), max_workers=2, n_chunks=3)
+    expected, expected_starts, expected_ends = discover_dfg(_log())
+    assert dfg.get_edges() == expected.get_edges()
+    assert (starts, ends) == (expected_starts, expected_ends)
@@ -0,0 +1,57 @@
+"""
+Tests for the array-based performance statistics.
+"""
+
+import numpy as np
+import pandas as pd
+from erp_processminer.eventlog.serialization import dataframe_to_log
+from erp_processminer.statistics.performance import (
+    get_cycle_times,
+    get_all_waiting_times,
+    get_cycle_time_array,
+    get_performance_summary,
+)
+
+def test_performance_summary_matches_list_api():
+    """
+    Tests that the vectorized statistics agree with the per-trace functions.
+    """
+    log = dataframe_to_log(pd.DataFrame([
+        ['C-01', 'A', '2023-01-01 10:00:00'],
+        ['C-01', 'B', '2023-01-01 11:00:00'],
+        ['C-01', 'C', '2023-01-01 13:00:00'],
+        ['C-02', 'A', '2023-01-02 10:00:00'],
+        ['C-02', 'B', '2023-01-02 10:30:00'],
+        ['C-03', 'A', '2023-01-03 10:00:00'],
+        ['C-03', 'B', '2023-01-03 14:00:00'],
+    ], columns=['case_id', 'activity', 'timestamp']))
+
+    assert get_cycle_time_array(log).tolist() == get_cycle_times(log)
+
+    summary = get_performance_summary(log)
+    waiting = summary['waiting_time']
+    expected = get_all_waiting_times(log)
+
+    assert set(waiting.index) == set(expected)
+    ab = np.array(expected[('A', 'B')])
+    assert waiting.loc[('A', 'B'), 'count'] == 3
+    assert waiting.loc[('A', 'B'), 'mean'] == ab.mean()
+    assert waiting.loc[('A', 'B'), 'median'] == np.median(ab)
+    assert waiting.loc[('A', 'B'), 'p90'] == np.percentile(ab, 90)
+    assert waiting.loc[('B', 'C'), 'max'] == 7200.0
+
+    cycle = summary['cycle_time'].iloc[0]
+    assert cycle['count'] == 3
+    assert cycle['max'] == 4 * 3600.0
+
+def test_summarize_durations_with_sparse_group_codes():
+    """Tests that group boundaries come from the sorted codes, not their range."""
+    from erp_processminer.statistics.performance import summarize_durations
+    groups = np.array([10 ** 12, 5, 5, 10 ** 12, 5])
+    durations = np.array([4.0, 3.0, 1.0, 2.0, 2.0])
+    summary = summarize_durations(groups, durations)
+    assert summary.index.tolist() == [5, 10 ** 12]
+    assert summary['count'].tolist() == [3, 2]
+    assert summary['median'].tolist() == [2.0, 3.0]
+    assert summary['max'].tolist() == [3.0, 4.0]
+    assert summarize_durations(groups[:0], durations[:0]).empty
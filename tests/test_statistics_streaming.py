@@ -0,0 +1,63 @@
+"""
+Tests for the streaming performance accumulators.
+"""
+
+import numpy as np
+import pandas as pd
+from erp_processminer.eventlog.serialization import dataframe_to_log
+from erp_processminer.eventlog.structures import EventLog
+from erp_processminer.statistics.streaming import (
+    RunningStats,
+    QuantileSketch,
+    PerformanceAccumulator,
+)
+
+def test_running_stats_and_sketch_merge():
+    """Tests that merged accumulators match statistics over all values."""
+    rng = np.random.default_rng(0)
+    values = rng.exponential(3600.0, size=5000)
+
+    left, right = RunningStats(), RunningStats()
+    left.add_array(values[:1234])
+    for v in values[1234:]:
+        right.add(v)
+    left.merge(right)
+    assert left.count == 5000
+    assert np.isclose(left.mean, values.mean())
+    assert np.isclose(left.variance, values.var(ddof=1))
+
+    sketch_a, sketch_b = QuantileSketch(0.01), QuantileSketch(0.01)
+    sketch_a.add_array(values[:2500])
+    sketch_b.add_array(values[2500:])
+    sketch_a.merge(sketch_b)
+    for q in (0.5, 0.9, 0.99):
+        exact = np.quantile(values, q)
+        assert abs(sketch_a.quantile(q) - exact) / exact < 0.03
+
+def test_performance_accumulator_chunks_and_traces():
+    """
+    Tests that feeding traces one by one and feeding chunks give the same
+    counts and means.
+    """
+    log = dataframe_to_log(pd.DataFrame([
+        ['C-01', 'A', '2023-01-01 10:00:00'],
+        ['C-01', 'B', '2023-01-01 11:00:00'],
+        ['C-02', 'A', '2023-01-02 10:00:00'],
+        ['C-02', 'B', '2023-01-02 13:00:00'],
+        ['C-02', 'C', '2023-01-02 14:00:00'],
+    ], columns=['case_id', 'activity', 'timestamp']))
+
+    by_trace = PerformanceAccumulator()
+    for trace in log:
+        by_trace.update_trace(trace)
+
+    first, second = PerformanceAccumulator(), PerformanceAccumulator()
+    first.update(EventLog(log.traces[:1]))
+    second.update(EventLog(log.traces[1:]))
+    first.merge(second)
+
+    for accumulator in (by_trace, first):
+        summary = accumulator.summary()
+        assert summary['waiting_time'].loc[('A', 'B'), 'count'] == 2
+        assert summary['waiting_time'].loc[('A', 'B'), 'mean'] == 7200.0
+        assert summary['cycle_time'].loc[0, 'max'] == 4 * 3600.0
@@ -0,0 +1,70 @@
+"""
+Tests for the approximate streaming DFG and the file-tail event reader.
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta
+from erp_processminer.eventlog.structures import EventLog, Trace, Event
+from erp_processminer.discovery.directly_follows import discover_dfg
+from erp_processminer.discovery.streaming import StreamingDFG
+from erp_processminer.io_erp.loaders import tail_events
+
+def _events(n_cases=50):
+    start = datetime(2023, 1, 1)
+    events = []
+    for i in range(n_cases):
+        activities = ['A', 'B', 'C'] if i % 5 else ['A', 'C']
+        events += [Event(f'C{i}', a, start + timedelta(hours=i + 2 * j))
+                   for j, a in enumerate(activities)]
+    return sorted(events, key=lambda e: e.timestamp)
+
+def test_streaming_dfg_matches_exact_dfg_when_state_fits():
+    """Tests that the snapshot equals the exact DFG when nothing is evicted."""
+    stream = StreamingDFG(ttl=None)
+    stream.extend(_events())
+    by_case = {}
+    for event in _events():
+        by_case.setdefault(event.case_id, []).append(event)
+    exact, starts, _ = discover_dfg(EventLog([Trace(c, e) for c, e in by_case.items()]))
+
+    snapshot = stream.to_dfg()
+    for edge, data in exact.get_edges().items():
+        assert snapshot.get_edges()[edge]['frequency'] == data['frequency']
+        assert abs(snapshot.get_edges()[edge]['avg_duration'] - data['avg_duration']) < 1e-6
+    assert snapshot.start_activities == starts
+    assert stream.active_cases == 50
+
+def test_streaming_dfg_bounds_memory():
+    """Tests TTL eviction, the case cap and the space-saving edge bound."""
+    stream = StreamingDFG(max_cases=10, max_edges=2, ttl=timedelta(hours=3))
+    stream.extend(_events())
+    assert stream.active_cases <= 10
+    assert stream.evicted > 0 and sum(stream.end_activities.values()) == stream.evicted
+    estimates = stream.edge_estimates()
+    assert len(estimates) == 2
+    # The dominant edges survive and overestimate by at most their error
+    assert ('A', 'B') in estimates or ('B', 'C') in estimates
+    for (u, v), estimate in estimates.items():
+        assert estimate['frequency'] - estimate['error'] <= 40
+
+def test_tail_events_follows_appended_lines(tmp_path):
+    """Tests reading a growing CSV file as an event stream."""
+    path = tmp_path / 'events.csv'
+    path.write_text('case_id,activity,timestamp,plant\nC1,A,2023-01-01 08:00,P1\n')
+
+    def append():
+        time.sleep(0.1)
+        with open(path, 'a') as f:
+            f.write('C1,B,2023-01-01 ')
+            f.flush()
+            time.sleep(0.1)
+            f.write('09:30,P1\n')
+
+    writer = threading.Thread(target=append)
+    writer.start()
+    events = list(tail_events(path, follow=True, poll_interval=0.02, idle_timeout=0.5))
+    writer.join()
+    assert [(e.activity, e.timestamp.hour, e.attributes['plant']) for e in events] == [
+        ('A', 8, 'P1'), ('B', 9, 'P1')
+    ]
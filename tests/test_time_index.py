@@ -0,0 +1,66 @@
+"""
+Tests for the time index and its window queries.
+"""
+
+import numpy as np
+import pandas as pd
+from erp_processminer.eventlog.serialization import dataframe_to_log
+from erp_processminer.eventlog.operations import filter_log_by_timestamp
+from erp_processminer.eventlog.time_index import TimeIndex, IntervalTree
+
+def _random_log(n_cases=200, seed=7):
+    rng = np.random.default_rng(seed)
+    rows = []
+    base = pd.Timestamp('2023-01-01')
+    for i in range(n_cases):
+        start = base + pd.Timedelta(hours=int(rng.integers(0, 24 * 90)))
+        for j in range(int(rng.integers(1, 5))):
+            stamp = start + pd.Timedelta(hours=int(rng.integers(0, 24 * 20)))
+            rows.append([f'C-{i:03d}', f'A{j}', stamp])
+    return dataframe_to_log(pd.DataFrame(rows, columns=['case_id', 'activity', 'timestamp']))
+
+def test_case_window_queries_match_brute_force():
+    """Tests every case-level window query against a linear scan."""
+    log = _random_log()
+    index = TimeIndex(log)
+    lo, hi = pd.Timestamp('2023-02-01'), pd.Timestamp('2023-02-20')
+
+    starts = [t.events[0].timestamp for t in log]
+    ends = [t.events[-1].timestamp for t in log]
+    expected = {
+        'started': [i for i, s in enumerate(starts) if lo <= s <= hi],
+        'completed': [i for i, e in enumerate(ends) if lo <= e <= hi],
+        'contained': [i for i, (s, e) in enumerate(zip(starts, ends)) if lo <= s and e <= hi],
+        'intersecting': [i for i, (s, e) in enumerate(zip(starts, ends)) if s <= hi and e >= lo],
+    }
+    assert index.cases_started_in(lo, hi).tolist() == expected['started']
+    assert index.cases_completed_in(lo, hi).tolist() == expected['completed']
+    assert index.cases_contained_in(lo, hi).tolist() == expected['contained']
+    assert index.cases_intersecting(lo, hi).tolist() == expected['intersecting']
+
+    filtered = index.filter(log, lo, hi, mode='intersecting')
+    assert [t.case_id for t in filtered] == [log.traces[i].case_id for i in expected['intersecting']]
+
+def test_event_window_matches_timestamp_filter():
+    """Tests that event-level filtering matches filter_log_by_timestamp."""
+    log = _random_log(50)
+    lo, hi = pd.Timestamp('2023-01-15'), pd.Timestamp('2023-03-01')
+    expected = filter_log_by_timestamp(log, lo, hi)
+    filtered = TimeIndex(log).filter(log, lo, hi)
+    assert [(t.case_id, len(t)) for t in filtered] == [(t.case_id, len(t)) for t in expected]
+
+def test_interval_tree_with_sub_second_timestamps():
+    """Tests the interval tree on nanosecond values that float64 cannot represent."""
+    single = pd.Timestamp('2023-01-01 10:00:00.001').value
+    tree = IntervalTree(np.array([single]), np.array([single]))
+    assert tree.stab(single).tolist() == [0]
+    assert tree.stab(single + 1).size == 0
+
+    rng = np.random.default_rng(1)
+    base = pd.Timestamp('2023-01-01').value
+    starts = base + rng.integers(0, 10**9, 300) * 1_000 + rng.integers(0, 1_000, 300)
+    ends = starts + rng.integers(0, 5 * 10**6, 300)
+    tree = IntervalTree(starts, ends)
+    for point in np.concatenate([starts[:50], ends[:50], starts[:50] + 1]).tolist():
+        expected = np.flatnonzero((starts <= point) & (ends >= point))
+        assert sorted(tree.stab(point).tolist()) == expected.tolist()
@@ -0,0 +1,67 @@
+"""
+Tests for the variant-compressed log and the algorithms consuming it.
+"""
+
+import pandas as pd
+from erp_processminer.eventlog.serialization import dataframe_to_log
+from erp_processminer.eventlog.compressed import VariantLog
+from erp_processminer.discovery.directly_follows import discover_dfg
+from erp_processminer.discovery.heuristics_miner import discover_petri_net_with_heuristics
+from erp_processminer.conformance.token_replay import calculate_conformance
+from erp_processminer.filters.attribute_filters import (
+    filter_log_by_activity,
+    filter_variants_by_frequency,
+)
+from erp_processminer.filters.performance_filters import filter_log_by_cycle_time
+
+def _log():
+    return dataframe_to_log(pd.DataFrame([
+        ['C-01', 'A', '2023-01-01 10:00:00'],
+        ['C-01', 'B', '2023-01-01 11:00:00'],
+        ['C-01', 'C', '2023-01-01 13:00:00'],
+        ['C-02', 'A', '2023-01-02 10:00:00'],
+        ['C-02', 'B', '2023-01-02 10:30:00'],
+        ['C-02', 'C', '2023-01-02 11:00:00'],
+        ['C-03', 'A', '2023-01-03 10:00:00'],
+        ['C-03', 'C', '2023-01-03 14:00:00'],
+    ], columns=['case_id', 'activity', 'timestamp']))
+
+def test_variant_log_matches_event_log_algorithms():
+    """
+    Tests that discovery and replay on the compressed log give the same
+    results as on the original log.
+    """
+    log = _log()
+    compressed = VariantLog.from_event_log(log)
+    assert compressed.n_variants == 2
+    assert compressed.multiplicities.tolist() == [2, 1]
+
+    dfg, starts, ends = discover_dfg(log)
+    c_dfg, c_starts, c_ends = discover_dfg(compressed)
+    assert (starts, ends) == (c_starts, c_ends)
+    assert dfg.get_edges() == c_dfg.get_edges()
+
+    net = discover_petri_net_with_heuristics(compressed, dependency_thresh=0.1)
+    fitness, results = calculate_conformance(log, net)
+    c_fitness, c_results = calculate_conformance(compressed, net)
+    assert abs(fitness - c_fitness) < 1e-9
+    assert len(c_results) == 3
+
+    restored = compressed.to_event_log()
+    assert [e.timestamp for e in restored.get_trace('C-03')] == \
+           [e.timestamp for e in log.get_trace('C-03')]
+
+def test_filters_on_variant_log():
+    """Tests the activity, variant-frequency and cycle-time filters."""
+    compressed = VariantLog.from_event_log(_log())
+
+    projected = filter_log_by_activity(compressed, {'A', 'C'})
+    assert projected.n_variants == 1
+    assert projected.multiplicities.tolist() == [3]
+    assert projected.cycle_times().tolist() == [3 * 3600.0, 3600.0, 4 * 3600.0]
+
+    frequent = filter_variants_by_frequency(compressed, 2)
+    assert frequent.case_ids.tolist() == ['C-01', 'C-02']
+
+    fast = filter_log_by_cycle_time(compressed, max_duration=3600.0)
+    assert fast.case_ids.tolist() == ['C-02']
@@ -0,0 +1,35 @@
+"""
+Tests for the variant trie index.
+"""
+
+import pandas as pd
+from erp_processminer.eventlog.serialization import dataframe_to_log
+from erp_processminer.eventlog.columnar import ColumnarLog
+from erp_processminer.statistics.variants import get_variants
+from erp_processminer.statistics.variant_trie import VariantTrie
+
+def test_variant_trie_queries():
+    """Tests prefix, top-k and coverage queries against get_variants."""
+    rows = []
+    sequences = {'C-1': 'ABC', 'C-2': 'ABC', 'C-3': 'ABD', 'C-4': 'AC', 'C-5': 'ABC'}
+    for case_id, sequence in sequences.items():
+        for i, activity in enumerate(sequence):
+            rows.append([case_id, activity, f'2023-01-01 1{i}:00:00'])
+    log = dataframe_to_log(pd.DataFrame(rows, columns=['case_id', 'activity', 'timestamp']))
+
+    for source in (log, ColumnarLog.from_event_log(log)):
+        trie = VariantTrie.from_log(source, store_case_ids=True)
+
+        expected = {v: len(t) for v, t in get_variants(log).items()}
+        assert trie.variants_with_prefix(()) == expected
+        assert trie.n_variants == 3
+        assert trie.n_cases == 5
+
+        assert trie.count_with_prefix(('A', 'B')) == 4
+        assert trie.variants_with_prefix(('A', 'B')) == {('A', 'B', 'C'): 3, ('A', 'B', 'D'): 1}
+        assert trie.variants_with_prefix(('X',)) == {}
+
+        assert trie.top_k(1) == [(('A', 'B', 'C'), 3)]
+        assert trie.coverage(2) == 0.8
+        assert trie.variants_for_coverage(0.6) == 1
+        assert sorted(trie.case_ids(('A', 'B', 'D'))) == ['C-3']
@@ -0,0 +1,49 @@
+"""
+Tests for activity and attribute vocabularies.
+"""
+
+import pandas as pd
+from erp_processminer.eventlog.vocabulary import Vocabulary
+from erp_processminer.eventlog.serialization import dataframe_to_log
+from erp_processminer.eventlog.operations import filter_log_by_activities
+
+def test_vocabulary_codes_are_stable():
+    """Tests encoding, decoding and missing values."""
+    vocabulary = Vocabulary(['Create PO'])
+    codes = vocabulary.encode_array(['Pay', 'Create PO', None, 'Pay'])
+    assert codes.tolist() == [1, 0, -1, 1]
+    assert vocabulary.decode_array(codes).tolist() == ['Pay', 'Create PO', None, 'Pay']
+    assert vocabulary.code('Approve') is None and len(vocabulary) == 2
+
+def test_ingest_interns_strings_and_exposes_codes():
+    """Tests that equal strings are shared and codes follow the vocabulary."""
+    df = pd.DataFrame({
+        'case_id': ['C1', 'C1', 'C2'],
+        'activity': ['Create ' + 'PO', 'Pay', ''.join(['Create', ' PO'])],
+        'timestamp': pd.to_datetime(['2023-01-01', '2023-01-02', '2023-01-03']),
+        'plant': ['P' + '100', 'P100', ''.join(['P', '100'])],
+    })
+    log = dataframe_to_log(df)
+    first, third = log.traces[0].events[0], log.traces[1].events[0]
+    assert first.activity is third.activity
+    assert first.attributes['plant'] is third.attributes['plant']
+
+    assert log.activity_codes() == [[0, 1], [0]]
+    filtered = filter_log_by_activities(log, ['Pay'])
+    assert filtered.vocabulary is log.vocabulary
+    assert filtered.vocabulary.activities.decode(filtered.activity_codes()[0][0]) == 'Pay'
+
+def test_analyses_do_not_attach_a_vocabulary():
+    """Tests that discovery and replay leave a hand-built log unchanged."""
+    from datetime import datetime
+    from erp_processminer.eventlog.structures import EventLog, Trace, Event
+    from erp_processminer.discovery.directly_follows import discover_dfg
+    from erp_processminer.discovery.heuristics_miner import discover_petri_net_with_heuristics
+    from erp_processminer.conformance.token_replay import calculate_conformance
+    log = EventLog([Trace('C1', [Event('C1', 'A', datetime(2023, 1, 1)),
+                                 Event('C1', 'B', datetime(2023, 1, 2))])])
+    dfg, _, _ = discover_dfg(log)
+    assert ('A', 'B') in dfg.graph.edges
+    calculate_conformance(log, discover_petri_net_with_heuristics(log))
+    assert log.vocabulary is None
+    assert log.get_vocabulary() is not log.get_vocabulary()